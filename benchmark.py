@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+"""
+Runs the benchmark suite and writes the results as JSON.
+"""
+import argparse
+
+from bjgame import bench
+
+
+def main():
+    """Parse arguments, run the suite and compare against a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "names", nargs="*", help="benchmarks to run (default: all)"
+    )
+    parser.add_argument("-o", "--output", help="write results to this file")
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    parser.add_argument("-w", "--warmup", type=int, default=3)
+    parser.add_argument("-c", "--compare", help="baseline results file")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown that counts as a regression",
+    )
+    parser.add_argument("-l", "--list", action="store_true")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(bench.BENCHMARKS))
+        return 0
+
+    unknown = set(args.names) - set(bench.BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    report = bench.run_suite(args.names, args.repeat, args.warmup)
+    for name, stats in report["benchmarks"].items():
+        print(
+            f"{name:>26}: {bench.format_ns(stats['median_ns']):>10}"
+            f" +- {bench.format_ns(stats['stdev_ns'])}"
+        )
+    if args.output:
+        bench.save_report(report, args.output)
+
+    if args.compare:
+        rows, regressions = bench.compare(
+            report, bench.load_report(args.compare), args.threshold
+        )
+        for name, before, after, change in rows:
+            print(
+                f"{name:>26}: {bench.format_ns(before):>10} ->"
+                f" {bench.format_ns(after):>10} ({change:+.1%})"
+            )
+        if regressions:
+            print(f"regressions: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
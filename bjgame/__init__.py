@@ -1 +1,26 @@
-__all__ = ["card", "game", "player"]
+__all__ = [
+    "bankroll",
+    "batch",
+    "bench",
+    "card",
+    "checkpoint",
+    "counting",
+    "engine",
+    "events",
+    "farm",
+    "game",
+    "history",
+    "ledger",
+    "metrics",
+    "player",
+    "probability",
+    "replay",
+    "rules",
+    "server",
+    "shared",
+    "shoepool",
+    "solver",
+    "stats",
+    "store",
+    "strategy",
+]
@@ -0,0 +1,207 @@
+"""Vectorized bankroll paths and risk of ruin for betting ramps"""
+
+from collections import namedtuple
+
+import numpy as np
+
+BankrollReport = namedtuple(
+    "BankrollReport",
+    [
+        "paths",
+        "rounds",
+        "risk_of_ruin",
+        "quantiles",
+        "drawdowns",
+        "doubled",
+        "median_rounds_to_double",
+        "mean_final",
+    ],
+)
+
+
+class OutcomeModel:
+    """Distribution of a round's net result per unit bet, by true count
+
+    values holds every possible net per unit bet and weights[i][j] how
+    often values[j] happened at true count counts[i].  Each row's total
+    sets how often that count comes up, so weights can be raw tallies.
+
+    Counts within a shoe drift together, so drawing a fresh count every
+    round makes a ramp's ruin and drawdowns look milder than they are.
+    shoes, as estimate_model records it, holds the sequence of count
+    indices of every shoe played; sample_shoes replays whole shoes of
+    them, and sample is only suitable for a model without them.
+    """
+
+    def __init__(self, values, counts, weights, shoes=None):
+        """Initialize the model from tallies of outcomes by count."""
+        self.values = np.asarray(values, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        totals = weights.sum(axis=1)
+        self.count_cdf = np.cumsum(totals) / totals.sum()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.cdf = np.cumsum(weights, axis=1) / totals[:, None]
+        self.cdf = np.nan_to_num(self.cdf, nan=1.0)
+        # row i of the cdf shifted up by i, flattened, so one searchsorted
+        # picks outcomes for every count at once
+        rows = np.arange(len(self.counts))[:, None]
+        self._offset_cdf = (self.cdf + rows).ravel()
+
+        # every shoe's count indices back to back, with where each starts
+        self.shoe_rows = None
+        if shoes:
+            lengths = np.array([len(shoe) for shoe in shoes], dtype=np.int64)
+            self.shoe_rows = np.concatenate(
+                [np.asarray(shoe, dtype=np.int64) for shoe in shoes]
+            )
+            self.shoe_starts = np.cumsum(lengths) - lengths
+            self.shoe_ends = np.cumsum(lengths)
+
+    @classmethod
+    def flat(cls, values, probabilities):
+        """Build a model whose outcomes do not depend on the count."""
+        return cls(values, [0], [probabilities])
+
+    def outcomes(self, rng, rows):
+        """Draw a net per unit for each count index in rows."""
+        u = rng.random(len(rows))
+        picks = self._offset_cdf.searchsorted(rows + u, side="right")
+        picks -= rows * len(self.values)
+        picks = np.minimum(picks, len(self.values) - 1)
+        return self.values[picks]
+
+    def sample(self, rng, size):
+        """Draw size (count index, net per unit) pairs independently."""
+        u = rng.random(size)
+        rows = self.count_cdf.searchsorted(u, side="right")
+        rows = np.minimum(rows, len(self.counts) - 1)
+        return rows, self.outcomes(rng, rows)
+
+    def sample_shoes(self, rng, positions, ends):
+        """Draw the next (count index, net per unit) pair of every path.
+
+        positions and ends index shoe_rows and are advanced in place; a
+        path at the end of its shoe starts a recorded shoe at random.
+        """
+        done = positions >= ends
+        if done.any():
+            picks = rng.integers(len(self.shoe_starts), size=done.sum())
+            positions[done] = self.shoe_starts[picks]
+            ends[done] = self.shoe_ends[picks]
+        rows = self.shoe_rows[positions]
+        positions += 1
+        return rows, self.outcomes(rng, rows)
+
+
+def estimate_model(engine, rounds, low=-6, high=6):
+    """Tally an engine's results by true count into an OutcomeModel.
+
+    The engine's shoe must have a counter attached, and its seats should
+    bet one unit so every net is a per-unit outcome.  True counts are
+    read before each round, as a count-based bettor would, and clipped
+    to [low, high].  The counts of each shoe are kept in order, so the
+    model samples whole shoes.
+    """
+    shoe = engine.shoe
+    counts = list(range(low, high + 1))
+    tallies = {}
+    shoes = []
+    for _ in range(rounds):
+        if shoe.rebuild or not shoes:
+            shoes.append([])
+        count = min(max(int(shoe.true_count()), low), high)
+        shoes[-1].append(count - low)
+        for net in engine.play_round():
+            if net is not None:
+                key = (count, net)
+                tallies[key] = tallies.get(key, 0) + 1
+
+    values = sorted({net for _, net in tallies})
+    weights = np.zeros((len(counts), len(values)))
+    for (count, net), tally in tallies.items():
+        weights[count - low, values.index(net)] = tally
+    return OutcomeModel(values, counts, weights, shoes)
+
+
+class BankrollSimulator:
+    """Plays many bankroll paths at once, one array element per path
+
+    Every round each path takes a true count and draws an outcome from
+    the model, and bets the ramp's units for that count.  A model with
+    recorded shoes deals each path whole shoes of counts in order;
+    otherwise counts are drawn independently every round.  Like
+    ``CountBetStrategy``, ramp maps whole true counts to units, counts
+    above the highest key use its units and any other missing count bets
+    one unit.  A bet never exceeds the path's balance, and a path is
+    ruined, and stops betting, once its balance is below one unit.
+    """
+
+    def __init__(
+        self, model, bankroll, unit=1, ramp=None, paths=10000, seed=None
+    ):
+        """Initialize every path with the same starting bankroll."""
+        self.model = model
+        self.bankroll = bankroll
+        self.unit = unit
+        ramp = dict(ramp) if ramp else {}
+        top = max(ramp) if ramp else 0
+        self.units = np.array(
+            [ramp.get(min(count, top), 1) for count in model.counts],
+            dtype=np.float64,
+        )
+        self.paths = paths
+        self.rng = np.random.default_rng(seed)
+        self.rounds = 0
+
+        self.balances = np.full(paths, bankroll, dtype=np.float64)
+        self.peaks = self.balances.copy()
+        self.drawdowns = np.zeros(paths)
+        self.ruined_at = np.zeros(paths, dtype=np.int64)
+        self.doubled_at = np.zeros(paths, dtype=np.int64)
+        # each path's place in the model's recorded shoes
+        self.positions = np.zeros(paths, dtype=np.int64)
+        self.ends = np.zeros(paths, dtype=np.int64)
+
+    def play_round(self):
+        """Play one round on every path."""
+        self.rounds += 1
+        balances = self.balances
+        model = self.model
+        if model.shoe_rows is not None:
+            rows, nets = model.sample_shoes(
+                self.rng, self.positions, self.ends
+            )
+        else:
+            rows, nets = model.sample(self.rng, self.paths)
+        bets = np.minimum(self.units[rows] * self.unit, balances)
+        bets[self.ruined_at > 0] = 0
+        balances += bets * nets
+        np.maximum(balances, 0, out=balances)
+
+        ruined = (self.ruined_at == 0) & (balances < self.unit)
+        self.ruined_at[ruined] = self.rounds
+        doubled = (self.doubled_at == 0) & (balances >= 2 * self.bankroll)
+        self.doubled_at[doubled] = self.rounds
+        np.maximum(self.peaks, balances, out=self.peaks)
+        np.maximum(self.drawdowns, self.peaks - balances, out=self.drawdowns)
+
+    def run(self, rounds, quantiles=(0.5, 0.9, 0.95, 0.99)):
+        """Play rounds on every path and return a BankrollReport.
+
+        drawdowns holds the quantiles of each path's largest fall from
+        its peak, and rounds to double counts only paths that doubled.
+        """
+        for _ in range(rounds):
+            self.play_round()
+        doubled = self.doubled_at[self.doubled_at > 0]
+        return BankrollReport(
+            self.paths,
+            self.rounds,
+            float(np.count_nonzero(self.ruined_at)) / self.paths,
+            tuple(quantiles),
+            tuple(np.quantile(self.drawdowns, quantiles).tolist()),
+            len(doubled) / self.paths,
+            float(np.median(doubled)) if len(doubled) else float("nan"),
+            float(self.balances.mean()),
+        )
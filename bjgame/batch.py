@@ -0,0 +1,213 @@
+"""Vectorized simulator playing many independent tables in lockstep"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .card import CODE_RANKS, NUM_CODES
+
+# blackjack value of each card code
+RANKS = np.array(CODE_RANKS, dtype=np.int8)
+
+BatchResult = namedtuple(
+    "BatchResult", ["hands", "wins", "losses", "pushes", "net", "net_sq"]
+)
+
+
+class BatchHands:
+    """Hard totals and ace counts for one hand at every table"""
+
+    def __init__(self, num_tables):
+        """Initialize empty hands for each table."""
+        self.hard = np.zeros(num_tables, dtype=np.int16)
+        self.aces = np.zeros(num_tables, dtype=np.int16)
+
+    def clear(self):
+        """Empty every hand."""
+        self.hard[:] = 0
+        self.aces[:] = 0
+
+    def add(self, rows, ranks):
+        """Add one card of the given ranks to the hands at rows."""
+        self.hard[rows] += ranks
+        self.aces[rows] += ranks == 1
+
+    @property
+    def soft(self):
+        """Mask of hands holding an Ace counted as 11."""
+        return (self.aces > 0) & (self.hard <= 11)
+
+    @property
+    def value(self):
+        """Best total of every hand."""
+        return self.hard + 10 * self.soft
+
+
+class BatchSimulator:
+    """Plays one seat against the dealer at many tables with NumPy
+
+    Every table has its own shoe, stored as one row of a 2-D array of card
+    codes with a per-table cursor.  Each phase of the round runs as array
+    operations across all tables, following the same rules as
+    ``BlackJackEngine``: the dealer hits soft 17 on the first two cards and
+    stops on any 17 or more after drawing, and every bet pays 1:1.
+
+    The player's decisions come from ``hit(values, soft, up_ranks)``,
+    which returns a boolean mask; by default the player hits below
+    ``stand_on``.  Given a BatchStrategy, its ``hit_batch`` decides
+    instead and its ``wager_batch`` sizes every table's bet from its
+    balance each round.  A table whose seat sits out is still dealt, so
+    the tables stay in lockstep, but its result is 0.
+    """
+
+    def __init__(
+        self,
+        num_tables,
+        num_decks=8,
+        bet=1,
+        stand_on=17,
+        hit=None,
+        seed=None,
+        strategy=None,
+        bankroll=np.inf,
+    ):
+        """Initialize the tables and their shoes."""
+        self.num_tables = num_tables
+        self.num_decks = num_decks
+        self.bet = bet
+        self.stand_on = stand_on
+        self.strategy = strategy
+        if strategy is not None:
+            self.hit = strategy.hit_batch
+        else:
+            self.hit = hit if hit is not None else self._hit_below
+        self.bets = bet
+        self.balances = np.full(num_tables, bankroll, dtype=np.float64)
+        self.rng = np.random.default_rng(seed)
+
+        size = NUM_CODES * num_decks
+        deck = np.arange(NUM_CODES, dtype=np.int8)
+        self.shoes = np.tile(np.tile(deck, num_decks), (num_tables, 1))
+        self.cursor = np.full(num_tables, size, dtype=np.int64)
+        self.cut_index = np.zeros(num_tables, dtype=np.int64)
+        self.rebuild = np.ones(num_tables, dtype=bool)
+
+        self.rows = np.arange(num_tables)
+        self.player = BatchHands(num_tables)
+        self.dealer = BatchHands(num_tables)
+
+    def _hit_below(self, values, soft, up_ranks):
+        """Hit while the total is below stand_on."""
+        return values < self.stand_on
+
+    def _build_shoes(self):
+        """Reshuffle the shoes of every table flagged for a rebuild."""
+        rows = np.flatnonzero(self.rebuild)
+        if not len(rows):
+            return
+        size = self.shoes.shape[1]
+        order = self.rng.random((len(rows), size)).argsort(axis=1)
+        self.shoes[rows] = np.take_along_axis(self.shoes[rows], order, axis=1)
+        self.cursor[rows] = 0
+        self.cut_index[rows] = size - self.rng.integers(60, 80, len(rows))
+        self.rebuild[rows] = False
+
+    def _deal(self, rows):
+        """Deal one card at each of the given tables and return its rank."""
+        ranks = RANKS[self.shoes[rows, self.cursor[rows]]]
+        self.cursor[rows] += 1
+        return ranks
+
+    def _check_cut_card(self):
+        """Flag tables whose cursor has passed the cut card."""
+        self.rebuild |= self.cursor > self.cut_index
+
+    def deal_initial_cards(self):
+        """Deal two cards to the player and the dealer at every table."""
+        self._build_shoes()
+        rows = self.rows
+        self.player.clear()
+        self.dealer.clear()
+        self.player.add(rows, self._deal(rows))
+        up_ranks = self._deal(rows)
+        self.dealer.add(rows, up_ranks)
+        self.player.add(rows, self._deal(rows))
+        self.dealer.add(rows, self._deal(rows))
+        self._check_cut_card()
+        return up_ranks
+
+    def player_turn(self, up_ranks):
+        """Let the player hit at every table until all have finished."""
+        player = self.player
+        active = player.value < 21
+        while True:
+            rows = np.flatnonzero(
+                active
+                & self.hit(player.value, player.soft, up_ranks)
+            )
+            if not len(rows):
+                break
+            player.add(rows, self._deal(rows))
+            active[:] = False
+            active[rows] = player.value[rows] < 21
+        self._check_cut_card()
+
+    def dealer_turn(self):
+        """Draw for the dealer at every table where the player stands."""
+        dealer = self.dealer
+        value = dealer.value
+        drawing = (self.player.value <= 21) & (
+            (value < 17) | ((value == 17) & dealer.soft)
+        )
+        rows = np.flatnonzero(drawing)
+        while len(rows):
+            dealer.add(rows, self._deal(rows))
+            rows = rows[dealer.value[rows] < 17]
+        self._check_cut_card()
+
+    def determine_winners(self):
+        """Settle the bet at every table and return the net results."""
+        player_value = self.player.value
+        dealer_value = self.dealer.value
+        player_busted = player_value > 21
+        wins = ~player_busted & (
+            (dealer_value > 21) | (player_value > dealer_value)
+        )
+        losses = player_busted | (
+            (dealer_value <= 21) & (player_value < dealer_value)
+        )
+        return self.bets * (wins.astype(np.int64) - losses)
+
+    def place_bets(self):
+        """Ask the strategy for every table's bet."""
+        if self.strategy is not None:
+            self.bets = self.strategy.wager_batch(self.balances)
+
+    def play_round(self):
+        """Play one round at every table and return the net results."""
+        self.place_bets()
+        up_ranks = self.deal_initial_cards()
+        self.player_turn(up_ranks)
+        self.dealer_turn()
+        results = self.determine_winners()
+        if self.strategy is not None:
+            self.balances += results
+        return results
+
+    def run(self, rounds):
+        """Play rounds at every table and return the aggregate results."""
+        hands = wins = losses = 0
+        net = net_sq = 0.0
+        for _ in range(rounds):
+            results = self.play_round()
+            if self.strategy is None:
+                hands += self.num_tables
+            else:
+                hands += int(np.count_nonzero(self.bets > 0))
+            wins += int(np.count_nonzero(results > 0))
+            losses += int(np.count_nonzero(results < 0))
+            net += float(results.sum())
+            net_sq += float(np.square(results, dtype=np.float64).sum())
+        return BatchResult(
+            hands, wins, losses, hands - wins - losses, net, net_sq
+        )
@@ -0,0 +1,276 @@
+"""Benchmark suite for the card, shoe, hand and round hot paths"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from random import Random
+
+from .card import Blackjackhand, Deck, Hand
+from .engine import BlackJackEngine
+from .metrics import RoundMetrics
+from .player import BlkJckPlayer
+from .shoe import Shoe
+from .strategy import FlatBetStrategy
+
+BENCHMARKS = {}
+
+
+def benchmark(name, number):
+    """Register a benchmark that calls its setup's result number times.
+
+    The decorated function builds whatever state the benchmark needs and
+    returns the zero-argument callable to time.
+    """
+
+    def register(setup):
+        BENCHMARKS[name] = (setup, number)
+        return setup
+
+    return register
+
+
+class RecomputedHand(Hand):
+    """Reference hand that rescans its cards on every query"""
+
+    def has_ace(self):
+        """Check if the hand contains an Ace."""
+        return any(card.is_Ace() for card in self.cards)
+
+    @property
+    def value(self):
+        """Sum cards in current hand"""
+        value = sum(map(int, self.cards))
+        if self.has_ace():
+            if (value + 10) <= 21:
+                value += 10
+        return value
+
+    def is_soft(self):
+        """Check if the hand is soft (contains an Ace counted as 11)"""
+        if not self.has_ace():
+            return False
+        value = sum(map(int, self.cards))
+        return (value + 10) <= 21
+
+
+def _dealer_draws(hand, add, cards):
+    """Play dealer hands off a card list the way dealer_turn does."""
+    i = 0
+    end = len(cards) - 12
+    while i < end:
+        hand.clear()
+        add(cards[i])
+        add(cards[i + 1])
+        i += 2
+        while hand.value < 17 or (hand.value == 17 and hand.is_soft()):
+            add(cards[i])
+            i += 1
+            if hand.value >= 17:
+                break
+
+
+def _shuffled_cards():
+    """Return the cards of an 8-deck shoe in a fixed shuffled order."""
+    cards = []
+    for _ in range(8):
+        cards.extend(Deck().cards)
+    Random(1).shuffle(cards)
+    return cards
+
+
+@benchmark("deck_construction", 1000)
+def _deck_construction():
+    """Build a fresh 52-card Deck."""
+    return Deck
+
+
+@benchmark("deck_shuffle", 1000)
+def _deck_shuffle():
+    """Shuffle one Deck."""
+    return Deck().shuffle
+
+
+@benchmark("deck_cut", 10000)
+def _deck_cut():
+    """Cut one Deck at halfway."""
+    return Deck().cut
+
+
+@benchmark("deck_deal_52", 1000)
+def _deck_deal():
+    """Deal a Deck one card at a time, then restore it."""
+    deck = Deck()
+
+    def deal():
+        dealt = [deck.deal()[0] for _ in range(52)]
+        deck.cards.extend(dealt)
+
+    return deal
+
+
+@benchmark("shoe_build", 100)
+def _shoe_build():
+    """Rebuild an 8-deck Shoe."""
+    shoe = Shoe(num_decks=8)
+
+    def build():
+        shoe.rebuild = True
+        shoe._build_shoe()
+
+    return build
+
+
+@benchmark("shoe_draw_416", 100)
+def _shoe_draw():
+    """Draw every card of an 8-deck Shoe."""
+    shoe = Shoe(num_decks=8)
+    shoe._build_shoe()
+    draw = shoe.draw
+
+    def draw_all():
+        shoe.cursor = 0
+        for _ in range(416):
+            draw()
+
+    return draw_all
+
+
+@benchmark("hand_value", 100000)
+def _hand_value():
+    """Read the total of a three-card hand."""
+    hand = Blackjackhand()
+    for code in (0, 4, 9):
+        hand.add_code(code)
+    return lambda: hand.value
+
+
+@benchmark("hand_is_soft", 100000)
+def _hand_is_soft():
+    """Check whether a two-card hand is soft."""
+    hand = Blackjackhand()
+    for code in (0, 4):
+        hand.add_code(code)
+    return hand.is_soft
+
+
+@benchmark("dealer_draws_incremental", 10)
+def _dealer_draws_incremental():
+    """Play dealer hands through a shoe of codes."""
+    hand = Blackjackhand()
+    codes = [card.code for card in _shuffled_cards()]
+    return lambda: _dealer_draws(hand, hand.add_code, codes)
+
+
+@benchmark("dealer_draws_recomputed", 10)
+def _dealer_draws_recomputed():
+    """Play dealer hands with the rescanning hand."""
+    hand = RecomputedHand()
+    cards = _shuffled_cards()
+    return lambda: _dealer_draws(hand, hand.cards.append, cards)
+
+
+def _headless_engine():
+    """Return an engine with three flat-betting seats."""
+    engine = BlackJackEngine(Shoe(num_decks=8, rng=Random(1)))
+    for seat in range(3):
+        engine.add_player(
+            BlkJckPlayer(f"Seat {seat + 1}", 10**12), FlatBetStrategy()
+        )
+    return engine
+
+
+@benchmark("headless_round_3_seats", 1000)
+def _headless_round():
+    """Play a headless round with three flat-betting seats."""
+    return _headless_engine().play_round
+
+
+@benchmark("headless_round_metrics", 1000)
+def _headless_round_metrics():
+    """Play a headless round with per-phase metrics enabled."""
+    engine = _headless_engine()
+    engine.metrics = RoundMetrics()
+    return engine.play_round
+
+
+def run_benchmark(name, repeat=20, warmup=3):
+    """Time one benchmark and return per-call statistics in nanoseconds."""
+    setup, number = BENCHMARKS[name]
+    func = setup()
+    for _ in range(warmup):
+        for _ in range(number):
+            func()
+
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        start = clock()
+        for _ in range(number):
+            func()
+        samples.append((clock() - start) / number)
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_ns": min(samples),
+        "median_ns": statistics.median(samples),
+        "mean_ns": statistics.fmean(samples),
+        "stdev_ns": statistics.stdev(samples) if repeat > 1 else 0.0,
+    }
+
+
+def run_suite(names=None, repeat=20, warmup=3):
+    """Run the selected benchmarks and return a JSON-ready report."""
+    names = names or list(BENCHMARKS)
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": {
+            name: run_benchmark(name, repeat, warmup) for name in names
+        },
+    }
+
+
+def compare(report, baseline, threshold=0.10):
+    """Compare medians against a baseline report.
+
+    Returns (name, baseline median, current median, relative change)
+    for every benchmark in both reports, and the names that slowed down
+    by more than threshold.
+    """
+    rows = []
+    regressions = []
+    for name, current in report["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            continue
+        change = current["median_ns"] / previous["median_ns"] - 1
+        before = previous["median_ns"]
+        rows.append((name, before, current["median_ns"], change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def format_ns(ns):
+    """Format a duration in nanoseconds with a readable unit."""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def save_report(report, path):
+    """Write a report as JSON."""
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path):
+    """Read a report written by save_report."""
+    with open(path) as f:
+        return json.load(f)
@@ -1,5 +1,6 @@
 """A suited card class"""
 
+from array import array
 from collections import namedtuple
 from random import shuffle
 
@@ -37,6 +38,30 @@ class Card(_Card):
         """Return the integer value of the card."""
         return self.rank_dict[self.value]
 
+    @property
+    def code(self):
+        """Return the compact integer code of the card."""
+        return CARD_CODES[self]
+
+    @classmethod
+    def from_code(cls, code):
+        """Return the shared card view for a compact code."""
+        return CARD_VIEWS[code]
+
+
+# Compact card codes: code = suit index * 13 + value index, in Deck order.
+# Hot paths carry these small ints and read card properties from the
+# tables below; Card instances are only needed for display.
+NUM_CODES = 52
+CARD_VIEWS = tuple(
+    Card(value, suit) for suit in Card.suits for value in Card.values
+)
+CARD_CODES = {card: code for code, card in enumerate(CARD_VIEWS)}
+CODE_RANKS = tuple(Card.ranks[code % 13] for code in range(NUM_CODES))
+CODE_RANK_INDEX = tuple(rank - 1 for rank in CODE_RANKS)
+CODE_IS_ACE = tuple(code % 13 == 0 for code in range(NUM_CODES))
+CODE_IS_TEN = tuple(rank == 10 for rank in CODE_RANKS)
+
 
 class Hand:
     """A class representing a hand of playing cards."""
@@ -84,14 +109,13 @@ class Deck(Hand):
 
     def __init__(self):
         """Initialize the deck with 52 cards."""
-        self.cards = [
-            Card(value, suit) for suit in Card.suits for value in Card.values
-        ]
+        self.cards = list(CARD_VIEWS)
 
-    def shuffle(self, n=1):
-        """Shuffle the deck of cards."""
+    def shuffle(self, n=1, rng=None):
+        """Shuffle the deck of cards, optionally with a given Random."""
+        shuffler = rng.shuffle if rng is not None else shuffle
         for _ in range(n):
-            shuffle(self.cards)
+            shuffler(self.cards)
 
     def cut(self):
         """cut the deck at halfway"""
@@ -115,40 +139,101 @@ class Deck(Hand):
 
 
 class Blackjackhand(Hand):
-    """A class representing a blackjack hand."""
+    """A class representing a blackjack hand.
+
+    Cards are held as compact codes in an ``array('b')``.  The hard total,
+    ace count and best total are kept up to date as cards are added, so
+    every query is a constant-time attribute read.
+    """
+
+    def __init__(self):
+        """Initialize an empty hand with zeroed totals."""
+        self.codes = array("b")
+        super().__init__()
+
+    @property
+    def cards(self):
+        """Return the cards in the hand as a read-only tuple of Card views.
+
+        The tuple is built from the codes on every access, so add cards
+        with add_card or add_code and remove them with clear.
+        """
+        return tuple([CARD_VIEWS[code] for code in self.codes])
+
+    @cards.setter
+    def cards(self, new_cards):
+        """Replace the cards in the hand."""
+        self.clear()
+        self.add_cards(new_cards)
+
+    def add_code(self, code):
+        """Add a single card, given by its compact code, to the hand."""
+        self.codes.append(code)
+        self._hard += CODE_RANKS[code]
+        if CODE_IS_ACE[code]:
+            self._aces += 1
+        if self._aces and self._hard <= 11:
+            self._value = self._hard + 10
+            self._soft = True
+        else:
+            self._value = self._hard
+            self._soft = False
+
+    def add_card(self, card):
+        """Add a single Card view to the hand.
+
+        Each Card is looked up in CARD_CODES; code that has the compact
+        code already should call add_code.
+        """
+        self.add_code(CARD_CODES[card])
+
+    def add_cards(self, new_cards):
+        """Add Card views to the hand, looking each one up like add_card."""
+        add_code = self.add_code
+        for code in map(CARD_CODES.__getitem__, new_cards):
+            add_code(code)
+
+    def clear(self):
+        """Clear the hand of all cards."""
+        del self.codes[:]
+        self._hard = 0
+        self._aces = 0
+        self._value = 0
+        self._soft = False
+
+    def __len__(self):
+        """Return the number of cards in the hand."""
+        return len(self.codes)
+
+    def __is_empty__(self):
+        """Check if the hand is empty."""
+        return not self.codes
 
     def has_ace(self):
         """Check if the hand contains an Ace."""
-        return any(card.is_Ace() for card in self.cards)
+        return self._aces > 0
 
     @property
     def value(self):
         """Sum cards in current hand"""
-        value = sum(map(int, self.cards))
-        if self.has_ace():
-            if (value + 10) <= 21:
-                value += 10
-        return value
+        return self._value
 
     def int(self):
         """Return the integer value of the hand."""
-        return self.value
+        return self._value
 
     def is_natblackjack(self):
         """Check if the hand is a blackjack."""
-        return len(self.cards) == 2 and self.value == 21
+        return len(self.codes) == 2 and self._value == 21
 
     def is_bust(self):
         """Check if the hand is bust."""
-        return self.value > 21
+        return self._value > 21
 
     def is_blackjack(self):
         """check if the hand is blackjack and not natural blackjack"""
-        return self.value == 21
+        return self._value == 21
 
     def is_soft(self):
         """Check if the hand is soft (contains an Ace counted as 11)"""
-        if not self.has_ace():
-            return False
-        value = sum(map(int, self.cards))
-        return (value + 10) <= 21
+        return self._soft
@@ -0,0 +1,204 @@
+"""Compact checkpoints for resuming long simulations exactly"""
+
+import os
+import pickle
+import time
+from array import array
+
+from .ledger import Ledger
+from .shoe import ContinuousShoe
+from .stats import RoundStats, RunningStats
+
+CHECKPOINT_VERSION = 3
+
+
+def _stats_state(stats):
+    """Return a RoundStats as a tuple of plain values."""
+    streams = [stats.overall] + stats.by_up_card + stats.by_start
+    return stats.rounds, [(s.count, s.total, s.mean, s.m2) for s in streams]
+
+
+def _restore_stats(state):
+    """Rebuild a RoundStats from _stats_state output."""
+    stats = RoundStats()
+    rounds, streams = state
+    stats.rounds = rounds
+    restored = []
+    for count, total, mean, m2 in streams:
+        running = RunningStats()
+        running.count, running.total = count, total
+        running.mean, running.m2 = mean, m2
+        restored.append(running)
+    stats.overall = restored[0]
+    stats.by_up_card = restored[1:12]
+    stats.by_start = restored[12:]
+    return stats
+
+
+def _ledger_state(ledger, players):
+    """Return a Ledger as plain values, its seats' accounts by seat."""
+    ids = [player.player_id for player in players]
+    others = {
+        key: account
+        for key, account in ledger.accounts.items()
+        if key not in ids
+    }
+    return {
+        "batch_ids": ledger.batch_ids.tobytes(),
+        "account_ids": ledger.account_ids.tobytes(),
+        "kinds": ledger.kinds.tobytes(),
+        "amounts": ledger.amounts.tobytes(),
+        "batches": ledger.batches,
+        "names": list(ledger.names),
+        "balances": list(ledger.balances),
+        "seats": [ledger.accounts.get(key) for key in ids],
+        "others": others,
+    }
+
+
+def _restore_ledger(state, players):
+    """Rebuild a Ledger from _ledger_state output for the given seats."""
+    ledger = Ledger()
+    for column in ("batch_ids", "account_ids", "kinds", "amounts"):
+        getattr(ledger, column).frombytes(state[column])
+    ledger.batches = state["batches"]
+    ledger.names = list(state["names"])
+    ledger.balances = list(state["balances"])
+    ledger.accounts = dict(state["others"])
+    for player, account in zip(players, state["seats"]):
+        if account is not None:
+            ledger.accounts[player.player_id] = account
+    return ledger
+
+
+def engine_state(engine, rounds=0):
+    """Capture everything a headless run needs to continue, between rounds.
+
+    The snapshot holds the shoe's order, cursor and cut card, its
+    Random's state, any card counter's running count, each seat's
+    balance and bets, the engine's RoundStats and its Ledger's journal,
+    all as plain values.  Seats' ledger accounts are stored by seat, so
+    they follow the seats into an engine whose players have new ids.
+    Strategies are assumed to keep no state of their own.  A hand
+    history cannot be rewound to the snapshot, so an engine writing one
+    is refused with ValueError, as is a shoe fed by a ShoePool.
+    """
+    shoe = engine.shoe
+    if getattr(shoe, "pool", None) is not None:
+        raise ValueError("a shoe fed by a ShoePool cannot be resumed exactly.")
+    if engine.history is not None:
+        raise ValueError(
+            "an engine writing hand histories cannot be resumed exactly."
+        )
+    if isinstance(shoe, ContinuousShoe):
+        cards = list(shoe.tree)
+    else:
+        cards = shoe.cards.tobytes()
+    return {
+        "version": CHECKPOINT_VERSION,
+        "rounds": rounds,
+        "shoe": {
+            "num_decks": shoe.num_decks,
+            "cards": cards,
+            "cursor": shoe.cursor,
+            "cut_card_position": shoe.cut_card_position,
+            "cut_index": shoe.cut_index,
+            "rebuild": shoe.rebuild,
+            "rng": shoe.rng.getstate(),
+            "running": shoe.counter.running if shoe.counter else None,
+        },
+        "players": [
+            (
+                player._name,
+                str(player.player_id),
+                player._balance,
+                player.current_bet,
+                player.last_bet,
+            )
+            for player in engine.players
+        ],
+        "stats": _stats_state(engine.stats) if engine.stats else None,
+        "ledger": (
+            _ledger_state(engine.ledger, engine.players)
+            if engine.ledger is not None
+            else None
+        ),
+    }
+
+
+def restore_engine(engine, state):
+    """Load a snapshot into an engine seated as the original was.
+
+    Returns the round count stored with the snapshot.
+    """
+    if state["version"] != CHECKPOINT_VERSION:
+        raise ValueError("unsupported checkpoint version.")
+    players = state["players"]
+    if [player._name for player in engine.players] != [
+        seat[0] for seat in players
+    ]:
+        raise ValueError("the checkpoint was taken with different seats.")
+
+    shoe = engine.shoe
+    saved = state["shoe"]
+    if saved["num_decks"] != shoe.num_decks:
+        raise ValueError("the checkpoint was taken with a different shoe.")
+    if isinstance(shoe, ContinuousShoe):
+        shoe.tree = list(saved["cards"])
+    else:
+        shoe.cards = array("b")
+        shoe.cards.frombytes(saved["cards"])
+    shoe.cursor = saved["cursor"]
+    shoe.cut_card_position = saved["cut_card_position"]
+    shoe.cut_index = saved["cut_index"]
+    shoe.rebuild = saved["rebuild"]
+    shoe.rng.setstate(saved["rng"])
+    if saved["running"] is not None and shoe.counter is not None:
+        shoe.counter.running = saved["running"]
+
+    for player, seat in zip(engine.players, players):
+        player._balance, player.current_bet, player.last_bet = seat[2:]
+    if state["stats"] is not None:
+        engine.stats = _restore_stats(state["stats"])
+    if state["ledger"] is not None:
+        engine.ledger = _restore_ledger(state["ledger"], engine.players)
+    return state["rounds"]
+
+
+def save_checkpoint(path, engine, rounds=0):
+    """Write a snapshot of the engine to path atomically."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(engine_state(engine, rounds), f, pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path, engine):
+    """Restore the engine from path and return the rounds already played."""
+    with open(path, "rb") as f:
+        return restore_engine(engine, pickle.load(f))
+
+
+def run_resumable(engine, rounds, path, interval=5.0):
+    """Play rounds with a checkpoint at path at most every interval seconds.
+
+    If path holds a checkpoint the run picks up from it, so a run that
+    was killed and restarted ends in the same state as one that never
+    stopped.  Returns the engine's RoundStats.
+    """
+    if engine.stats is None:
+        engine.stats = RoundStats()
+    played = load_checkpoint(path, engine) if os.path.exists(path) else 0
+    play_round = engine.play_round
+    clock = time.monotonic
+    next_save = clock() + interval
+    while played < rounds:
+        play_round()
+        played += 1
+        if clock() >= next_save:
+            save_checkpoint(path, engine, played)
+            next_save = clock() + interval
+    save_checkpoint(path, engine, played)
+    return engine.stats
@@ -0,0 +1,94 @@
+"""Incremental card counting attached to a Shoe"""
+
+from .card import CODE_RANK_INDEX, NUM_CODES
+from .strategy import FlatBetStrategy
+
+# tags by rank index: Ace, 2 through 9, ten-valued cards
+HI_LO = (-1, 1, 1, 1, 1, 1, 0, 0, 0, -1)
+KO = (-1, 1, 1, 1, 1, 1, 1, 0, 0, -1)
+OMEGA_II = (0, 1, 1, 2, 2, 2, 1, 0, -1, -2)
+
+SYSTEMS = {
+    "hi-lo": HI_LO,
+    "ko": KO,
+    "omega-ii": OMEGA_II,
+}
+
+
+class CardCounter:
+    """Keeps a running count as cards leave the shoe
+
+    Each card costs one tuple lookup and one addition.  Unbalanced
+    systems such as KO start from an initial running count so that the
+    pivot sits at zero.
+    """
+
+    def __init__(self, system="hi-lo"):
+        """Initialize the counter with a system name or a tag tuple."""
+        tags = SYSTEMS[system] if isinstance(system, str) else tuple(system)
+        if len(tags) != len(HI_LO):
+            raise ValueError("a counting system needs one tag per rank.")
+        self.tags = tags
+        self.code_tags = tuple(
+            tags[CODE_RANK_INDEX[code]] for code in range(NUM_CODES)
+        )
+        self.running = 0
+
+    @property
+    def deck_total(self):
+        """Return the count of one full deck."""
+        return sum(self.code_tags)
+
+    @property
+    def is_balanced(self):
+        """Check whether a full deck counts to zero."""
+        return self.deck_total == 0
+
+    def initial_count(self, num_decks):
+        """Return the running count at the start of a fresh shoe."""
+        return -self.deck_total * (num_decks - 1)
+
+    def reset(self, num_decks):
+        """Reset the running count for a freshly shuffled shoe."""
+        self.running = self.initial_count(num_decks)
+
+    def count(self, code):
+        """Count one card leaving the shoe."""
+        self.running += self.code_tags[code]
+
+    def true_count(self, cards_remaining):
+        """Return the running count per deck remaining."""
+        if cards_remaining <= 0:
+            return float(self.running)
+        return self.running * NUM_CODES / cards_remaining
+
+
+class CountBetStrategy(FlatBetStrategy):
+    """Sizes bets from the shoe's true count and hits below a total
+
+    ramp maps whole true counts to bet units of ``bet`` dollars.  Counts
+    above the highest key use its units; any other count missing from
+    the ramp bets one unit.
+    """
+
+    def __init__(self, shoe, ramp, bet=1, stand_on=17, rebuy=True):
+        """Initialize with the counted shoe and the bet ramp."""
+        super().__init__(bet, stand_on, rebuy)
+        self.shoe = shoe
+        self.ramp = dict(ramp)
+        self.top = max(self.ramp)
+
+    def _stake(self):
+        """Return the ramp's bet for the current true count."""
+        true_count = int(self.shoe.true_count())
+        if true_count > self.top:
+            true_count = self.top
+        return self.ramp.get(true_count, 1) * self.bet
+
+    def wager(self, player):
+        """Bet according to the current true count."""
+        return min(self._stake(), player._balance)
+
+    def wager_batch(self, balances):
+        """Bet the current true count's stake at every seat."""
+        return balances.clip(max=self._stake())
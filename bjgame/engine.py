@@ -0,0 +1,351 @@
+"""Headless round engine implementing the Blackjack rules without console I/O"""
+
+from math import isfinite
+
+from .player import Dealer
+from .shoe import Shoe
+
+# settlement outcomes reported for each seat
+BUST = "bust"
+WIN = "win"
+LOSE = "lose"
+PUSH = "push"
+
+DONATION = 100.00
+
+
+def _no_lap():
+    """Stand in for RoundMetrics.lap when a round is not being timed."""
+
+
+class BlackJackEngine:
+    """Plays rounds of blackjack with decisions supplied by strategies
+
+    The engine never reads from or writes to the console.  Front ends
+    override the ``on_*`` hooks to render what happens; they are no-ops
+    here so simulations pay nothing for them.
+    """
+
+    def __init__(self, shoe=None):
+        """Initialize the engine with an optional shoe.
+
+        Set history to a HandHistoryWriter to log every round played,
+        metrics to a RoundMetrics to time each phase of every round,
+        stats to a RoundStats to stream the results, and ledger to a
+        Ledger to settle balances in integer cents through its journal.
+        Any other object with a record(engine, results) method can be
+        appended to recorders to see every settled round as well.
+        """
+        self.shoe = shoe if shoe is not None else Shoe(num_decks=8)
+        self.players = []
+        self.strategies = []
+        self.dealer = Dealer()
+        self.history = None
+        self.metrics = None
+        self.stats = None
+        self.ledger = None
+        self.recorders = []
+
+    def add_player(self, player, strategy):
+        """Seat a player whose decisions come from the given strategy."""
+        self.players.append(player)
+        self.strategies.append(strategy)
+
+    def _deal(self, hand):
+        """Move one card from the shoe into a hand and return its code."""
+        code = self.shoe.draw()
+        hand.add_code(code)
+        return code
+
+    def _check_cut_card(self):
+        """Flag the shoe for a rebuild once the cut card is reached."""
+        if self.shoe.cursor > self.shoe.cut_index:
+            self.shoe.rebuild = True
+
+    def place_bets(self):
+        """Collect a bet from every seat"""
+        self.on_betting()
+        for player, strategy in zip(self.players, self.strategies):
+            if player._balance <= 0:
+                self.on_broke(player)
+                if not self.donate(player, strategy.accept_donation(player)):
+                    continue
+            self.place_bet(player, strategy.wager(player))
+
+    def donate(self, player, accepted):
+        """Apply a broke player's answer to the bailout offer.
+
+        Returns True if the player can bet this round.
+        """
+        if accepted:
+            if self.ledger is not None:
+                self.ledger.donate(player, DONATION)
+            else:
+                player._balance = DONATION
+            self.on_donation(player)
+            return True
+        self.on_sit_out(player)
+        return False
+
+    def place_bet(self, player, gamble):
+        """Record a player's bet; a bet of 0 or less sits the round out."""
+        if not isfinite(gamble):
+            raise ValueError(f"{player._name} cannot bet {gamble}.")
+        if gamble <= 0:
+            return
+        if self.ledger is not None:
+            self.ledger.check_cents(gamble)
+        if gamble > player._balance:
+            raise ValueError(
+                f"{player._name} cannot bet {gamble} with a balance "
+                f"of {player._balance}."
+            )
+        player.bet = gamble
+        player.prev_bet = gamble
+
+    def deal_initial_cards(self):
+        """Deal initial two cards to each player and dealer"""
+        self.on_dealing()
+
+        if self.shoe.rebuild:
+            self.shoe._build_shoe()
+
+        dealer_hand = self.dealer.hand
+        for player in self.players:
+            if player.current_bet > 0:
+                self.on_card(player, self._deal(player.hand))
+        self.on_card(self.dealer, self._deal(dealer_hand))
+
+        for player in self.players:
+            if player.current_bet > 0:
+                self.on_card(player, self._deal(player.hand))
+        self.on_hole_card(self._deal(dealer_hand))
+
+        self._check_cut_card()
+
+    def player_turn(self, player, strategy):
+        """Execute a single player's turn"""
+        if not self.begin_turn(player):
+            return
+
+        up_card = self.dealer.hand.codes[0]
+        while strategy.hit(player, up_card):
+            if not self.hit(player):
+                break
+        else:
+            self.stand(player)
+
+        self._check_cut_card()
+
+    def begin_turn(self, player):
+        """Start a player's turn; return False if there is nothing to decide.
+
+        Front ends that collect decisions themselves call begin_turn, then
+        hit or stand, then end_turn.
+        """
+        if player.current_bet <= 0:
+            return False
+        self.on_turn(player)
+        if player.hand.value == 21:
+            self.on_blackjack(player)
+            return False
+        return True
+
+    def hit(self, player):
+        """Deal the player a card; return False once the turn is over."""
+        hand = player.hand
+        self.on_hit(player, self._deal(hand))
+        if hand.value > 21:
+            self.on_bust(player)
+            return False
+        elif hand.value == 21:
+            self.on_twenty_one(player)
+            return False
+        return True
+
+    def stand(self, player):
+        """End a player's turn at their current total."""
+        self.on_stand(player)
+
+    def end_turn(self):
+        """Finish a turn played through begin_turn, hit and stand."""
+        self._check_cut_card()
+
+    def dealer_turn(self):
+        """Execute the dealer's turn
+
+        The dealer hits soft 17 on the first two cards; once drawing, the
+        dealer stops on any total of 17 or more.
+        """
+        dealer = self.dealer
+        hand = dealer.hand
+
+        for player in self.players:
+            if player.current_bet > 0 and player.hand.value <= 21:
+                break
+        else:
+            self.on_dealer_turn(False)
+            return
+
+        self.on_dealer_turn(True)
+        while dealer.spite_Hit():
+            self.on_hit(dealer, self._deal(hand))
+            if hand.value > 21:
+                self.on_bust(dealer)
+                break
+            elif hand.value >= 17:
+                self.on_stand(dealer)
+                break
+
+        self._check_cut_card()
+
+    def determine_winners(self):
+        """Settle every bet against the dealer and return each seat's net"""
+        self.on_results()
+
+        dealer_value = self.dealer.hand.value
+        dealer_busted = dealer_value > 21
+
+        results = []
+        outcomes = []
+        for player in self.players:
+            bet = player.current_bet
+            if bet <= 0:
+                results.append(None)
+                continue
+
+            player_value = player.hand.value
+            if player_value > 21:
+                outcome, net = BUST, -bet
+            elif dealer_busted or player_value > dealer_value:
+                outcome, net = WIN, bet
+            elif player_value < dealer_value:
+                outcome, net = LOSE, -bet
+            else:
+                outcome, net = PUSH, 0
+            results.append(net)
+            outcomes.append((player, outcome))
+
+        # post the round as one batch before anyone sees a balance
+        if self.ledger is not None:
+            self.ledger.post_round(self.players, results)
+        else:
+            for player, net in zip(self.players, results):
+                if net:
+                    player._balance += net
+        for player, outcome in outcomes:
+            self.on_settle(player, outcome, dealer_value)
+        return results
+
+    def clear_hands(self):
+        """Clear all hands for next round"""
+        discard = self.shoe.discard
+        for player in self.players:
+            discard(player.hand.codes)
+            player.hand.clear()
+            player.current_bet = 0
+        discard(self.dealer.hand.codes)
+        self.dealer.hand.clear()
+
+    def play_round(self):
+        """Play a single round and return each seat's net result
+
+        With metrics set, each phase of the round is timed into it;
+        otherwise the laps are no-ops.
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.start_round()
+            lap = metrics.lap
+        else:
+            lap = _no_lap
+
+        self.place_bets()
+        lap()
+        # rebuild here rather than in the deal so the shuffle is timed alone
+        shoe = self.shoe
+        if shoe.rebuild:
+            shoe._build_shoe()
+            if metrics is not None:
+                metrics.shoe_rebuilds += 1
+        lap()
+        self.deal_initial_cards()
+        lap()
+        for player, strategy in zip(self.players, self.strategies):
+            self.player_turn(player, strategy)
+        lap()
+        self.dealer_turn()
+        lap()
+        results = self.determine_winners()
+        if self.history is not None:
+            self.history.record(self, results)
+        if self.stats is not None:
+            self.stats.record(self, results)
+        for recorder in self.recorders:
+            recorder.record(self, results)
+        if metrics is not None:
+            metrics.count_round(self, results)
+        lap()
+        self.clear_hands()
+        lap()
+        return results
+
+    def play_rounds(self, rounds):
+        """Play several rounds and return the total net result per seat"""
+        totals = [0] * len(self.players)
+        for _ in range(rounds):
+            for i, net in enumerate(self.play_round()):
+                if net:
+                    totals[i] += net
+        return totals
+
+    # Front-end hooks.  Each one is called at the point in the round where
+    # the interactive game used to print; the engine itself ignores them.
+
+    def on_betting(self):
+        """Called before bets are collected."""
+
+    def on_broke(self, player):
+        """Called when a player has no money left."""
+
+    def on_donation(self, player):
+        """Called after a broke player accepts the bailout."""
+
+    def on_sit_out(self, player):
+        """Called when a broke player declines the bailout."""
+
+    def on_dealing(self):
+        """Called before the initial cards are dealt."""
+
+    def on_card(self, player, code):
+        """Called for each face-up card of the initial deal."""
+
+    def on_hole_card(self, code):
+        """Called when the dealer's face-down card is dealt."""
+
+    def on_turn(self, player):
+        """Called when a player's turn begins."""
+
+    def on_blackjack(self, player):
+        """Called when a player's first two cards total 21."""
+
+    def on_hit(self, player, code):
+        """Called after a player or the dealer draws a card."""
+
+    def on_bust(self, player):
+        """Called when a player or the dealer busts."""
+
+    def on_twenty_one(self, player):
+        """Called when a player draws to exactly 21."""
+
+    def on_stand(self, player):
+        """Called when a player or the dealer stands."""
+
+    def on_dealer_turn(self, active):
+        """Called before the dealer plays; active is False if all busted."""
+
+    def on_results(self):
+        """Called before bets are settled."""
+
+    def on_settle(self, player, outcome, dealer_value):
+        """Called after a player's bet is settled."""
@@ -0,0 +1,388 @@
+"""Structured round events and the sinks that consume them
+
+``EventEngine`` turns every engine hook into an ``Event`` holding plain
+values: names, card codes, totals and amounts, copied when the event
+happens.  Sinks queue events as they arrive and only format them when
+flushed, so a sink that never renders never pays for formatting, and
+output leaves in one write per batch.
+"""
+
+import json
+import sys
+from collections import namedtuple
+
+from .card import CARD_VIEWS
+from .engine import BUST, LOSE, WIN, BlackJackEngine
+
+BETTING = "betting"
+BROKE = "broke"
+DONATION = "donation"
+SIT_OUT = "sit_out"
+DEALING = "dealing"
+CARD = "card"
+HOLE_CARD = "hole_card"
+TURN = "turn"
+BLACKJACK = "blackjack"
+HIT = "hit"
+DEALER_HIT = "dealer_hit"
+BUST_EVENT = "bust"
+TWENTY_ONE = "twenty_one"
+STAND = "stand"
+DEALER_TURN = "dealer_turn"
+DEALER_SKIPS = "dealer_skips"
+RESULTS = "results"
+SETTLE = "settle"
+
+Event = namedtuple(
+    "Event",
+    [
+        "kind",
+        "name",
+        "code",
+        "codes",
+        "value",
+        "dealer_value",
+        "amount",
+        "balance",
+        "outcome",
+    ],
+    defaults=(None,) * 8,
+)
+
+
+class EventEngine(BlackJackEngine):
+    """Round engine that reports everything that happens to a sink"""
+
+    def __init__(self, shoe=None, sink=None):
+        """Initialize the engine with an optional shoe and event sink."""
+        super().__init__(shoe)
+        self.sink = sink if sink is not None else NullSink()
+
+    def on_betting(self):
+        """Emit the start of betting."""
+        self.sink.emit(Event(BETTING))
+
+    def on_broke(self, player):
+        """Emit a broke player."""
+        self.sink.emit(Event(BROKE, player._name))
+
+    def on_donation(self, player):
+        """Emit a donor bailout."""
+        self.sink.emit(Event(DONATION, player._name, amount=player._balance))
+
+    def on_sit_out(self, player):
+        """Emit a broke player sitting out."""
+        self.sink.emit(Event(SIT_OUT, player._name))
+
+    def on_dealing(self):
+        """Emit the start of the deal."""
+        self.sink.emit(Event(DEALING))
+
+    def on_card(self, player, code):
+        """Emit a face-up card."""
+        self.sink.emit(Event(CARD, player._name, code))
+
+    def on_hole_card(self, code):
+        """Emit the dealer's hidden card without its code."""
+        self.sink.emit(Event(HOLE_CARD, self.dealer._name))
+
+    def on_turn(self, player):
+        """Emit the start of a player's turn."""
+        hand = player.hand
+        self.sink.emit(
+            Event(
+                TURN,
+                player._name,
+                self.dealer.hand.codes[0],
+                tuple(hand.codes),
+                hand.value,
+                amount=player.current_bet,
+            )
+        )
+
+    def on_blackjack(self, player):
+        """Emit a blackjack."""
+        self.sink.emit(Event(BLACKJACK, player._name))
+
+    def on_hit(self, player, code):
+        """Emit a drawn card and the hand it made."""
+        hand = player.hand
+        kind = DEALER_HIT if player is self.dealer else HIT
+        self.sink.emit(
+            Event(kind, player._name, code, tuple(hand.codes), hand.value)
+        )
+
+    def on_bust(self, player):
+        """Emit a bust."""
+        self.sink.emit(Event(BUST_EVENT, player._name))
+
+    def on_twenty_one(self, player):
+        """Emit a player drawing to 21."""
+        self.sink.emit(Event(TWENTY_ONE, player._name))
+
+    def on_stand(self, player):
+        """Emit a stand."""
+        self.sink.emit(Event(STAND, player._name, value=player.hand.value))
+
+    def on_dealer_turn(self, active):
+        """Emit the reveal of the dealer's hand."""
+        hand = self.dealer.hand
+        self.sink.emit(
+            Event(
+                DEALER_TURN if active else DEALER_SKIPS,
+                self.dealer._name,
+                hand.codes[1],
+                tuple(hand.codes),
+                hand.value,
+            )
+        )
+
+    def on_results(self):
+        """Emit the start of settlement."""
+        self.sink.emit(Event(RESULTS))
+
+    def on_settle(self, player, outcome, dealer_value):
+        """Emit how a bet was settled."""
+        self.sink.emit(
+            Event(
+                SETTLE,
+                player._name,
+                value=player.hand.value,
+                dealer_value=dealer_value,
+                amount=player.current_bet,
+                balance=player._balance,
+                outcome=outcome,
+            )
+        )
+
+
+class NullSink:
+    """Discards every event"""
+
+    def emit(self, event):
+        """Ignore an event."""
+
+    def flush(self):
+        """Nothing to write."""
+
+    def close(self):
+        """Nothing to close."""
+
+
+class EventBus:
+    """Passes every event to several sinks"""
+
+    def __init__(self, *sinks):
+        """Initialize the bus with the sinks to feed."""
+        self.sinks = list(sinks)
+
+    def emit(self, event):
+        """Hand an event to every sink."""
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def flush(self):
+        """Flush every sink."""
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        """Close every sink."""
+        for sink in self.sinks:
+            sink.close()
+
+
+class BufferedSink:
+    """Queues events and writes them out a batch at a time
+
+    Subclasses turn a batch of events into text with render.  The queue
+    is written when flush is called or once it holds batch_size events.
+    """
+
+    def __init__(self, stream, batch_size=256):
+        """Initialize the sink writing to an open text stream."""
+        self.stream = stream
+        self.batch_size = batch_size
+        self.pending = []
+
+    def emit(self, event):
+        """Queue an event, writing the batch once it is full."""
+        self.pending.append(event)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Render and write every queued event in a single write."""
+        if self.pending:
+            text = self.render(self.pending)
+            self.pending = []
+            self.stream.write(text)
+        self.stream.flush()
+
+    def render(self, events):
+        """Return the text for a batch of events."""
+        raise NotImplementedError
+
+    def close(self):
+        """Flush the remaining events."""
+        self.flush()
+
+
+def _hand_text(codes):
+    """Format card codes the way a Hand prints."""
+    return ", ".join(str(CARD_VIEWS[code]) for code in codes)
+
+
+class ConsoleRenderer(BufferedSink):
+    """Renders events as the console game's table narration"""
+
+    def __init__(self, stream=None, batch_size=256):
+        """Initialize the renderer, writing to stdout by default."""
+        stream = stream if stream is not None else sys.stdout
+        super().__init__(stream, batch_size)
+
+    def render(self, events):
+        """Return the narration for a batch of events."""
+        lines = []
+        for event in events:
+            getattr(self, "_" + event.kind)(event, lines)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _banner(title, lines, rule="="):
+        """Add a section heading."""
+        lines += ["\n" + rule * 50, title, rule * 50]
+
+    def _betting(self, event, lines):
+        """Head the betting phase."""
+        self._banner("PLACING BETS", lines)
+
+    def _broke(self, event, lines):
+        """Tell a player they are out of money."""
+        lines.append(f"\n{event.name} is broke!")
+
+    def _donation(self, event, lines):
+        """Announce a donor bailout."""
+        lines.append(f"{event.name} received ${event.amount:.2f}!")
+
+    def _sit_out(self, event, lines):
+        """Announce that a broke player sits out."""
+        lines.append(f"{event.name} cannot play this round.")
+
+    def _dealing(self, event, lines):
+        """Head the initial deal."""
+        self._banner("DEALING CARDS", lines)
+
+    def _card(self, event, lines):
+        """Show a dealt card."""
+        lines.append(f"{event.name} receives: {CARD_VIEWS[event.code]}")
+
+    def _hole_card(self, event, lines):
+        """Keep the dealer's second card hidden."""
+        lines.append(f"{event.name} receives: [HIDDEN CARD]")
+
+    def _turn(self, event, lines):
+        """Show the table at the start of a player's turn."""
+        self._banner(f"{event.name}'S TURN", lines, "-")
+        lines += [
+            f"Dealer showing: {CARD_VIEWS[event.code]}",
+            f"{event.name} has {_hand_text(event.codes)} for a total of "
+            f"{event.value}.",
+            f"Current bet: ${event.amount:.2f}",
+        ]
+
+    def _blackjack(self, event, lines):
+        """Announce a blackjack."""
+        lines.append(f"{event.name} has BLACKJACK!")
+
+    def _hit(self, event, lines):
+        """Show a drawn card and the new total."""
+        lines += [
+            f"{event.name} receives: {CARD_VIEWS[event.code]}",
+            f"{event.name} has {_hand_text(event.codes)} for a total of "
+            f"{event.value}.",
+        ]
+
+    def _dealer_hit(self, event, lines):
+        """Show a card the dealer drew and the dealer's total."""
+        lines += [
+            f"{event.name} receives: {CARD_VIEWS[event.code]}",
+            f"The dealer has {_hand_text(event.codes)} for a total of "
+            f"{event.value}.",
+        ]
+
+    def _bust(self, event, lines):
+        """Announce a bust."""
+        lines.append(f"{event.name} BUSTED!")
+
+    def _twenty_one(self, event, lines):
+        """Announce a player drawing to 21."""
+        lines.append(f"{event.name} reached 21!")
+
+    def _stand(self, event, lines):
+        """Announce a stand."""
+        lines.append(f"{event.name} stands with {event.value}")
+
+    def _dealer_turn(self, event, lines):
+        """Reveal the dealer's hidden card."""
+        self._banner("DEALER'S TURN", lines)
+        lines += [
+            f"Dealer reveals hidden card: {CARD_VIEWS[event.code]}",
+            f"The dealer has {_hand_text(event.codes)} for a total of "
+            f"{event.value}.",
+        ]
+
+    def _dealer_skips(self, event, lines):
+        """Reveal the dealer's hand when every player busted."""
+        self._banner("DEALER'S TURN", lines)
+        lines += [
+            "All players busted. Dealer stands.",
+            f"Dealer's hidden card: {CARD_VIEWS[event.code]}",
+            f"The dealer has {_hand_text(event.codes)} for a total of "
+            f"{event.value}.",
+        ]
+
+    def _results(self, event, lines):
+        """Head the settlement."""
+        self._banner("RESULTS", lines)
+
+    def _settle(self, event, lines):
+        """Show how a player's bet was settled."""
+        name = event.name
+        bet = event.amount
+        lines.append(f"\n{name}: {event.value} | Dealer: {event.dealer_value}")
+        if event.outcome == BUST:
+            lines.append(f"{name} BUSTED and loses ${bet:.2f}")
+        elif event.outcome == WIN:
+            lines.append(f"{name} WINS ${bet:.2f}!")
+        elif event.outcome == LOSE:
+            lines.append(f"{name} LOSES ${bet:.2f}")
+        else:
+            lines.append(f"{name} PUSHES (tie)")
+        lines.append(f"{name}'s new balance: ${event.balance:.2f}")
+
+
+class JsonLinesSink(BufferedSink):
+    """Writes each event as one JSON object per line"""
+
+    def __init__(self, path, batch_size=1024):
+        """Open path for appending events."""
+        super().__init__(open(path, "a"), batch_size)
+
+    def render(self, events):
+        """Return a batch of events as JSON lines."""
+        fields = Event._fields
+        lines = []
+        for event in events:
+            record = {
+                field: value
+                for field, value in zip(fields, event)
+                if value is not None
+            }
+            lines.append(json.dumps(record))
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        """Flush the remaining events and close the file."""
+        self.flush()
+        self.stream.close()
@@ -0,0 +1,188 @@
+"""Simulation farm sharding headless rounds across a process pool"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from os import cpu_count
+from random import Random
+
+from .engine import BlackJackEngine
+from .player import BlkJckPlayer
+from .shoe import Shoe
+from .stats import Z_95, RoundStats
+from .strategy import FlatBetStrategy
+
+ShardResult = namedtuple(
+    "ShardResult", ["rounds", "wins", "losses", "pushes", "stats"]
+)
+
+SimulationReport = namedtuple(
+    "SimulationReport",
+    [
+        "rounds",
+        "hands",
+        "wins",
+        "losses",
+        "pushes",
+        "net",
+        "ev",
+        "stdev",
+        "ci_low",
+        "ci_high",
+        "stats",
+    ],
+)
+
+
+def worker_rng(seed, worker):
+    """Return the independent, reproducible Random for one worker."""
+    # string seeds are hashed with SHA-512, so neighbouring workers get
+    # unrelated streams
+    return Random(f"{seed}:{worker}")
+
+
+def shard_engine(seed, worker, num_decks=8, seats=1, strategy=None):
+    """Return the engine one worker plays its shard on."""
+    strategy = strategy if strategy is not None else FlatBetStrategy()
+    engine = BlackJackEngine(Shoe(num_decks, rng=worker_rng(seed, worker)))
+    for seat in range(seats):
+        engine.add_player(BlkJckPlayer(f"Seat {seat + 1}", 10**12), strategy)
+    return engine
+
+
+def play_shard(seed, worker, rounds, num_decks=8, seats=1, strategy=None):
+    """Play one worker's share of rounds and return its totals."""
+    engine = shard_engine(seed, worker, num_decks, seats, strategy)
+    engine.stats = RoundStats()
+
+    wins = losses = pushes = 0
+    for _ in range(rounds):
+        for result in engine.play_round():
+            if result is None:
+                continue
+            if result > 0:
+                wins += 1
+            elif result < 0:
+                losses += 1
+            else:
+                pushes += 1
+    return ShardResult(rounds, wins, losses, pushes, engine.stats)
+
+
+def _play_shard(args):
+    """Unpack pool arguments for play_shard."""
+    return play_shard(*args)
+
+
+def merge_shards(shards):
+    """Combine shard totals, in order, into one report.
+
+    The shards' RoundStats are merged with the parallel Welford update,
+    and the EV, its sample standard deviation and its confidence
+    interval all come from the merged stream.
+    """
+    rounds = wins = losses = pushes = 0
+    stats = RoundStats()
+    for shard in shards:
+        rounds += shard.rounds
+        wins += shard.wins
+        losses += shard.losses
+        pushes += shard.pushes
+        stats.merge(shard.stats)
+
+    overall = stats.overall
+    ci_low, ci_high = overall.interval() if overall.count else (0.0, 0.0)
+    return SimulationReport(
+        rounds,
+        overall.count,
+        wins,
+        losses,
+        pushes,
+        overall.total,
+        overall.mean,
+        overall.stdev,
+        ci_low,
+        ci_high,
+        stats,
+    )
+
+
+def shard_rounds(rounds, workers):
+    """Split a round count as evenly as possible across workers."""
+    base, extra = divmod(rounds, workers)
+    return [base + (worker < extra) for worker in range(workers)]
+
+
+def wave_size(stats, target_width, seats, floor):
+    """Return how many rounds the next wave should play.
+
+    The rounds still needed to reach target_width are projected from the
+    standard deviation seen so far, or from a one-unit guess before any
+    results, and the wave plays half of them, so the run overshoots the
+    target by at most a few percent.  A wave is never shorter than floor.
+    """
+    overall = stats.overall
+    stdev = overall.stdev if overall.count > 1 else 1.0
+    hands = (2 * Z_95 * stdev / target_width) ** 2 - overall.count
+    per_round = overall.count / stats.rounds if stats.rounds else seats
+    return max(ceil(hands / max(per_round, 1e-9) / 2), floor)
+
+
+def run_simulation(
+    rounds,
+    workers=None,
+    seed=0,
+    num_decks=8,
+    seats=1,
+    strategy=None,
+    target_width=None,
+    wave_rounds=None,
+):
+    """Play rounds across a process pool and return the merged report.
+
+    The same seed and worker count always produce identical results.  The
+    strategy must be picklable to reach the workers.
+
+    With a target_width, rounds is only a budget: the pool plays waves
+    and stops once the EV's confidence interval is no wider than
+    target_width.  Waves are sized by wave_size from the results so far,
+    or hold wave_rounds each if it is given.  Each wave seeds its workers
+    afresh from the seed and the wave number, so early-stopped runs are
+    reproducible too.
+    """
+    workers = workers or cpu_count() or 1
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    shards = []
+    report = merge_shards(shards)
+    try:
+        wave = played = 0
+        while played < rounds:
+            if target_width is None:
+                wave_seed, count = seed, rounds
+            else:
+                wave_seed = f"{seed}:{wave}"
+                count = wave_rounds or wave_size(
+                    report.stats, target_width, seats, 100 * workers
+                )
+                count = min(count, rounds - played)
+            jobs = [
+                (wave_seed, worker, share, num_decks, seats, strategy)
+                for worker, share in enumerate(shard_rounds(count, workers))
+            ]
+            if pool is None:
+                shards.extend(map(_play_shard, jobs))
+            else:
+                shards.extend(pool.map(_play_shard, jobs))
+            report = merge_shards(shards)
+            played += count
+            wave += 1
+            if target_width is not None and report.stats.converged(
+                target_width
+            ):
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return report
@@ -1,49 +1,45 @@
 """Main game logic for Blackjack game"""
 
-from .player import BlkJckPlayer, Dealer
-from .card import Deck
+from .player import BlkJckPlayer
 from .shoe import Shoe
 from .mulitplayer import Multiplayer
-import pickle
-import os
+from .events import ConsoleRenderer, EventEngine
+from .strategy import ConsoleStrategy, FlatBetStrategy
+from .store import PlayerStore
 
 
-class BlackJackGame:
-    """Main Blackjack game class that manages game flow and rules"""
+class BlackJackGame(EventEngine):
+    """Interactive console front end on top of the round engine
+
+    The table narration comes from the engine's events, rendered in
+    batches; the renderer is flushed before every prompt.
+    """
 
     def __init__(self):
         """Initialize the blackjack game"""
-        self.shoe = Shoe(num_decks=8)
-        self.players = []
-        self.dealer = Dealer()
+        super().__init__(Shoe(num_decks=8), ConsoleRenderer())
         self.multiplayer = None
-        self.save_file = "player_data.pkl"
-
-    def load_player_data(self):
-        """Load player data from pickle file"""
-        if os.path.exists(self.save_file):
-            try:
-                with open(self.save_file, "rb") as f:
-                    return pickle.load(f)
-            except (pickle.UnpicklingError, EOFError):
-                return {}
-        return {}
+        self.save_file = "player_data.db"
+        self.legacy_save_file = "player_data.pkl"
+        self.store = None
+        # flat bet of the seats the computer plays
+        self.bot_bet = 10
+
+    def open_store(self):
+        """Open the player store, importing an old pickle save once"""
+        if self.store is None:
+            self.store = PlayerStore(self.save_file)
+            if not len(self.store):
+                self.store.import_pickle(self.legacy_save_file)
+        return self.store
 
     def save_player_data(self):
-        """Save player data to pickle file"""
-        player_data = {}
-        for player in self.players:
-            player_data[str(player.player_id)] = {
-                "name": player._name,
-                "balance": player._balance,
-                "player_id": player.player_id,
-            }
-        with open(self.save_file, "wb") as f:
-            pickle.dump(player_data, f)
+        """Write the balances of the players at the table to the store"""
+        self.open_store().save_all(self.players)
 
     def setup_players(self):
         """Set up players for the game"""
-        player_data = self.load_player_data()
+        store = self.open_store()
 
         while True:
             try:
@@ -60,11 +56,7 @@ class BlackJackGame:
             name = input(f"Enter name for player {i + 1}: ")
 
             # Check if player exists in saved data
-            existing_player = None
-            for player_id, data in player_data.items():
-                if data["name"] == name:
-                    existing_player = data
-                    break
+            existing_player = store.find_by_name(name)
 
             if existing_player:
                 player = BlkJckPlayer(name, existing_player["balance"])
@@ -77,224 +69,15 @@ class BlackJackGame:
                 player = BlkJckPlayer(name, 100.00)
                 print(f"Welcome, {name}! Starting balance: $100.00")
 
-            self.players.append(player)
-
-        self.multiplayer = Multiplayer(self.players)
-
-    def place_bets(self):
-        """Have all players place their bets"""
-        print("\n" + "=" * 50)
-        print("PLACING BETS")
-        print("=" * 50)
-        for player in self.players:
-            if player._balance <= 0:
-                print(f"\n{player._name} is broke!")
-                answer = input(
-                    f"Would you like $100 from an anonymous donor? (y/n): "
-                ).lower()
-                if answer == "y":
-                    player._balance = 100.00
-                    print(f"{player._name} received $100.00!")
-                else:
-                    print(f"{player._name} cannot play this round.")
-                    continue
-
-            player.wager()
-
-    def deal_initial_cards(self):
-        """Deal initial two cards to each player and dealer"""
-        print("\n" + "=" * 50)
-        print("DEALING CARDS")
-        print("=" * 50)
-
-        # Build shoe if needed
-        if self.shoe.rebuild:
-            self.shoe._build_shoe()
-
-        # First card to each player
-        for player in self.players:
-            if player.current_bet > 0:
-                card = self.shoe.shoe.deal(1)[0]
-                player.hand.add_cards([card])
-                print(f"{player._name} receives: {card}")
-
-        # First card to dealer (face up)
-        card = self.shoe.shoe.deal(1)[0]
-        self.dealer.hand.add_cards([card])
-        print(f"Dealer receives: {card}")
-
-        # Second card to each player
-        for player in self.players:
-            if player.current_bet > 0:
-                card = self.shoe.shoe.deal(1)[0]
-                player.hand.add_cards([card])
-                print(f"{player._name} receives: {card}")
-
-        # Second card to dealer (face down)
-        card = self.shoe.shoe.deal(1)[0]
-        self.dealer.hand.add_cards([card])
-        print("Dealer receives: [HIDDEN CARD]")
-
-        # Check if we've hit the cut card
-        if self.shoe.cut_card_position > len(self.shoe.shoe.cards):
-            self.shoe.rebuild = True
-
-    def player_turn(self, player):
-        """Execute a single player's turn"""
-        if player.current_bet <= 0:
-            return
-
-        print("\n" + "-" * 50)
-        print(f"{player._name}'S TURN")
-        print("-" * 50)
-        print(f"Dealer showing: {self.dealer.hand.cards[0]}")
-        print(player.return_status())
-        print(f"Current bet: ${player.current_bet:.2f}")
-
-        # Check for immediate blackjack
-        if player.hand.value == 21:
-            print(f"{player._name} has BLACKJACK!")
-            return
-
-        # Player hits or stands
-        while player.hand.value < 21:
-
-            answer = input("Do you want to hit? (y/n): ").lower()
-            while answer not in ["y", "n"]:
-                print("Invalid input. Please enter 'y' or 'n'.")
-                answer = input("Do you want to hit? (y/n): ").lower()
-
-            if answer == "y":
-                card = self.shoe.shoe.deal(1)[0]
-                player.hand.add_cards([card])
-                print(f"{player._name} receives: {card}")
-                print(player.return_status())
-
-                if player.hand.value > 21:
-                    print(f"{player._name} BUSTED!")
-                    break
-                elif player.hand.value == 21:
-                    print(f"{player._name} reached 21!")
-                    break
-            else:
-                print(f"{player._name} stands with {player.hand.value}")
-
-                break
-
-        # Check if we've hit the cut card
-        if self.shoe.cut_card_position > len(self.shoe.shoe.cards):
-            self.shoe.rebuild = True
-
-    def dealer_turn(self):
-        """Execute the dealer's turn"""
-        print("\n" + "=" * 50)
-        print("DEALER'S TURN")
-        print("=" * 50)
-
-        # Check if any players are still in play (not busted)
-        active_players = [
-            p for p in self.players if p.current_bet > 0 and p.hand.value <= 21
-        ]
-
-        if not active_players:
-            print("All players busted. Dealer stands.")
-            print(f"Dealer's hidden card: {self.dealer.hand.cards[1]}")
-            print(self.dealer.status())
-
-            return
-
-        # Reveal hidden card
-        print(f"Dealer reveals hidden card: {self.dealer.hand.cards[1]}")
-        print(self.dealer.status())
-
-        # Dealer hits according to rules
-        while self.dealer.spite_Hit():
-
-            card = self.shoe.shoe.deal(1)[0]
-            self.dealer.hand.add_cards([card])
-            print(f"Dealer receives: {card}")
-            print(self.dealer.status())
-
-            if self.dealer.hand.value > 21:
-                print("Dealer BUSTED!")
-
-                break
-            elif self.dealer.hand.value >= 17:
-                print(f"Dealer stands with {self.dealer.hand.value}")
-
-                break
-
-        # Check if we've hit the cut card
-        if self.shoe.cut_card_position > len(self.shoe.shoe.cards):
-            self.shoe.rebuild = True
-
-    def determine_winners(self):
-        """Determine winners and update balances"""
-        print("\n" + "=" * 50)
-        print("RESULTS")
-        print("=" * 50)
-
-        dealer_value = self.dealer.hand.value
-        dealer_busted = dealer_value > 21
-
-        for player in self.players:
-            if player.current_bet <= 0:
-                continue
-
-            player_value = player.hand.value
-            player_busted = player_value > 21
-
-            print(f"\n{player._name}: {player_value} | Dealer: {dealer_value}")
-
-            if player_busted:
-                # Player busted - loses bet
-                player._balance -= player.current_bet
-                print(
-                    f"{player._name} BUSTED and loses ${player.current_bet:.2f}"
-                )
-            elif dealer_busted:
-                # Dealer busted - player wins 2-to-1
-                # Player wins amount equal to their bet (net gain = bet)
-                player._balance += player.current_bet
-                print(f"{player._name} WINS ${player.current_bet:.2f}!")
-            elif player_value > dealer_value:
-                # Player has higher value - wins 2-to-1
-                player._balance += player.current_bet
-                print(f"{player._name} WINS ${player.current_bet:.2f}!")
-            elif player_value < dealer_value:
-                # Dealer has higher value - player loses
-                player._balance -= player.current_bet
-                print(f"{player._name} LOSES ${player.current_bet:.2f}")
+            answer = input(f"Should the computer play for {name}? (y/n): ")
+            if answer.lower() == "y":
+                strategy = FlatBetStrategy(bet=self.bot_bet)
             else:
-                # Push - tie, no change
-                print(f"{player._name} PUSHES (tie)")
+                strategy = ConsoleStrategy(self.sink)
+            self.add_player(player, strategy)
 
-            print(f"{player._name}'s new balance: ${player._balance:.2f}")
-
-    def clear_hands(self):
-        """Clear all hands for next round"""
-        for player in self.players:
-            player.hand.clear()
-            player.current_bet = 0
-        self.dealer.hand.clear()
-
-    def play_round(self):
-        """Play a single round of blackjack"""
-        self.place_bets()
-        self.deal_initial_cards()
-
-        # Each player takes their turn
-        for player in self.players:
-            self.player_turn(player)
-
-        # Dealer takes turn
-        self.dealer_turn()
-
-        # Determine winners and update balances
-        self.determine_winners()
-
-        # Clear hands for next round
-        self.clear_hands()
+        self.save_player_data()
+        self.multiplayer = Multiplayer(self.players)
 
     def play(self):
         """Main game loop"""
@@ -306,6 +89,8 @@ class BlackJackGame:
 
         while True:
             self.play_round()
+            self.save_player_data()
+            self.sink.flush()
 
             # Ask if players want to continue
             print("\n" + "=" * 50)
@@ -323,6 +108,10 @@ class BlackJackGame:
 
         # Save player data before exiting
         self.save_player_data()
+        self.store.close()
+        self.store = None
+        if self.metrics is not None and self.metrics.path is not None:
+            self.metrics.dump()
         print("\n" + "=" * 50)
         print("Thanks for playing! Game data saved.")
         print("=" * 50)
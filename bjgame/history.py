@@ -0,0 +1,187 @@
+"""Fixed-width binary hand-history log and memory-mapped reader"""
+
+import os
+from struct import Struct
+
+import numpy as np
+
+MAGIC = b"BJHH"
+VERSION = 3
+HEADER_SIZE = 16
+MAX_SEATS = 4
+# the longest hand possible: ten Aces, a two, eight more Aces and the
+# card that reaches 21 or busts
+MAX_CARDS = 20
+NO_CARD = -1
+
+# seat outcomes; NO_BET marks an empty or sitting-out seat
+NO_BET = 0
+OUTCOME_WIN = 1
+OUTCOME_LOSE = 2
+OUTCOME_PUSH = 3
+OUTCOME_BUST = 4
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("round", "<u8"),
+        ("seats", "u1"),
+        ("dealer_count", "u1"),
+        ("dealer_cards", "i1", (MAX_CARDS,)),
+        ("card_count", "u1", (MAX_SEATS,)),
+        ("cards", "i1", (MAX_SEATS, MAX_CARDS)),
+        ("hits", "u1", (MAX_SEATS,)),
+        ("stood", "?", (MAX_SEATS,)),
+        ("outcome", "u1", (MAX_SEATS,)),
+        ("bet", "<f8", (MAX_SEATS,)),
+        ("net", "<f8", (MAX_SEATS,)),
+        ("balance", "<f8", (MAX_SEATS,)),
+    ]
+)
+
+
+# byte offsets of each field, so records are filled without NumPy scalars
+OFFSETS = {name: RECORD_DTYPE.fields[name][1] for name in RECORD_DTYPE.names}
+_ROUND = Struct("<QBB")
+_FLOAT = Struct("<d")
+
+
+def _header():
+    """Return the file header identifying the record layout."""
+    return (
+        MAGIC
+        + VERSION.to_bytes(2, "little")
+        + RECORD_DTYPE.itemsize.to_bytes(2, "little")
+        + bytes(HEADER_SIZE - 8)
+    )
+
+
+class HandHistoryWriter:
+    """Appends one fixed-width record per round to a binary log
+
+    Each record holds every card dealt to the seats and the dealer in
+    deal order, the number of hits each player took and whether they
+    stood, and the settlement with the balance it left.  A player's
+    decisions are fully determined by those fields: every card after the
+    second is a hit, and a player who stood below 21 chose to.
+    """
+
+    def __init__(self, path, buffer_size=1 << 20):
+        """Open the log at path for appending, writing a header if new."""
+        self.path = path
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if new:
+            self.rounds = 0
+        else:
+            self.rounds = len(read_history(path))
+            # drop a record left half-written by an interrupted run
+            os.truncate(
+                path, HEADER_SIZE + self.rounds * RECORD_DTYPE.itemsize
+            )
+        self.file = open(path, "ab", buffering=buffer_size)
+        if new:
+            self.file.write(_header())
+
+        blank = np.zeros(1, dtype=RECORD_DTYPE)
+        blank["dealer_cards"] = NO_CARD
+        blank["cards"] = NO_CARD
+        self._blank = blank.tobytes()
+        self._buffer = bytearray(self._blank)
+
+    def __enter__(self):
+        """Return the writer for use in a with block."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the log at the end of a with block."""
+        self.close()
+
+    def record(self, engine, results):
+        """Append the round the engine just settled."""
+        players = engine.players
+        if len(players) > MAX_SEATS:
+            raise ValueError(
+                f"the hand history holds at most {MAX_SEATS} seats."
+            )
+
+        buf = self._buffer
+        buf[:] = self._blank
+        dealer_codes = engine.dealer.hand.codes
+        if len(dealer_codes) > MAX_CARDS:
+            raise ValueError(
+                f"the hand history holds at most {MAX_CARDS} cards a hand."
+            )
+        _ROUND.pack_into(buf, 0, self.rounds, len(players), len(dealer_codes))
+        offset = OFFSETS["dealer_cards"]
+        buf[offset : offset + len(dealer_codes)] = dealer_codes
+
+        for seat, (player, net) in enumerate(zip(players, results)):
+            if net is None:
+                continue
+            hand = player.hand
+            codes = hand.codes
+            count = len(codes)
+            if count > MAX_CARDS:
+                raise ValueError(
+                    f"the hand history holds at most {MAX_CARDS} cards a hand."
+                )
+            offset = OFFSETS["cards"] + seat * MAX_CARDS
+            buf[offset : offset + count] = codes
+            buf[OFFSETS["card_count"] + seat] = count
+            buf[OFFSETS["hits"] + seat] = count - 2
+            buf[OFFSETS["stood"] + seat] = hand.value < 21
+            if hand.value > 21:
+                outcome = OUTCOME_BUST
+            elif net > 0:
+                outcome = OUTCOME_WIN
+            elif net < 0:
+                outcome = OUTCOME_LOSE
+            else:
+                outcome = OUTCOME_PUSH
+            buf[OFFSETS["outcome"] + seat] = outcome
+            bet = player.current_bet
+            _FLOAT.pack_into(buf, OFFSETS["bet"] + 8 * seat, bet)
+            _FLOAT.pack_into(buf, OFFSETS["net"] + 8 * seat, net)
+            _FLOAT.pack_into(
+                buf, OFFSETS["balance"] + 8 * seat, player._balance
+            )
+
+        self.file.write(buf)
+        self.rounds += 1
+
+    def flush(self):
+        """Push buffered records to the operating system."""
+        self.file.flush()
+
+    def close(self):
+        """Flush and close the log."""
+        self.file.close()
+
+
+def check_header(path):
+    """Raise ValueError unless path starts with a compatible header."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if header[:4] != MAGIC:
+        raise ValueError(f"{path} is not a hand history log.")
+    version = int.from_bytes(header[4:6], "little")
+    itemsize = int.from_bytes(header[6:8], "little")
+    if version != VERSION or itemsize != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} uses an unsupported record layout.")
+
+
+def read_history(path):
+    """Memory-map a hand history log as a structured NumPy array.
+
+    A partially written record at the end of the file is ignored.
+    """
+    check_header(path)
+    count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if not count:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(
+        path,
+        dtype=RECORD_DTYPE,
+        mode="r",
+        offset=HEADER_SIZE,
+        shape=(count,),
+    )
@@ -0,0 +1,217 @@
+"""Integer-cents settlement ledger with array-backed journals
+
+Every movement of money is a journal entry of whole cents against an
+account, kept in typed arrays, one per column, so a ledger holds
+millions of entries without a Python object for each.  Entries
+are posted in batches that sum to zero: a round's settlements post as
+one batch, with the house taking the other side.  Account balances are
+a cache of the journal that rebuild recomputes from scratch, and
+compact folds the journal into carried balances so a long-running
+ledger stays bounded.
+"""
+
+from array import array
+
+import numpy as np
+
+# entry kinds
+OPEN = 0
+SETTLE = 1
+DONATE = 2
+CLOSE = 3
+CARRY = 4
+KINDS = ("open", "settle", "donate", "close", "carry")
+
+# system accounts; players' opening balances come from the cashier and
+# closing balances go back to it
+HOUSE = 0
+CASHIER = 1
+SYSTEM_ACCOUNTS = 2
+
+JOURNAL_DTYPE = np.dtype(
+    [
+        ("batch", "<i8"),
+        ("account", "<i8"),
+        ("kind", "i1"),
+        ("amount", "<i8"),
+    ]
+)
+
+
+def to_cents(amount):
+    """Convert an amount of dollars to whole cents."""
+    return round(amount * 100)
+
+
+class Ledger:
+    """Double-entry journal of every balance change, in integer cents
+
+    Set an engine's ledger attribute to an instance to settle its rounds
+    through the journal; the seats' balances are then read back from
+    their accounts after each posting, so they never drift.  One ledger
+    can serve every table of a server.
+    """
+
+    def __init__(self):
+        """Initialize a ledger holding only the system accounts."""
+        self.batch_ids = array("q")
+        self.account_ids = array("q")
+        self.kinds = array("b")
+        self.amounts = array("q")
+        self.batches = 0
+        self.names = ["house", "cashier"]
+        self.balances = [0, 0]
+        self.accounts = {}
+
+    def __len__(self):
+        """Return the number of entries posted."""
+        return len(self.amounts)
+
+    def entries(self):
+        """Return a copy of the journal as a structured NumPy array."""
+        entries = np.empty(len(self.amounts), dtype=JOURNAL_DTYPE)
+        entries["batch"] = self.batch_ids
+        entries["account"] = self.account_ids
+        entries["kind"] = self.kinds
+        entries["amount"] = self.amounts
+        return entries
+
+    def open_account(self, name, cents=0):
+        """Open an account funded from the cashier and return its index."""
+        account = len(self.names)
+        self.names.append(name)
+        self.balances.append(0)
+        if cents:
+            self.post(OPEN, [(account, cents), (CASHIER, -cents)])
+        return account
+
+    def account(self, player):
+        """Return the player's account, opening it at their balance."""
+        account = self.accounts.get(player.player_id)
+        if account is None:
+            cents = to_cents(player._balance)
+            account = self.open_account(player._name, cents)
+            self.accounts[player.player_id] = account
+        return account
+
+    def close_account(self, player):
+        """Pay a player's balance back to the cashier and forget them.
+
+        The account's entries stay in the journal until the next compact.
+        """
+        account = self.accounts.pop(player.player_id, None)
+        if account is None:
+            return
+        cents = self.balances[account]
+        if cents:
+            self.post(CLOSE, [(account, -cents), (CASHIER, cents)])
+
+    def check_cents(self, amount):
+        """Raise ValueError unless amount is a whole number of cents."""
+        if to_cents(amount) / 100 != amount:
+            raise ValueError(f"{amount} is not a whole number of cents.")
+
+    def balance(self, account):
+        """Return an account's balance in cents."""
+        return self.balances[account]
+
+    def post(self, kind, entries):
+        """Append one batch of (account, cents) entries and return its id.
+
+        Raises ValueError unless the batch sums to zero.
+        """
+        accounts = [account for account, _ in entries]
+        amounts = [cents for _, cents in entries]
+        if sum(amounts) != 0:
+            raise ValueError("a ledger batch must sum to zero.")
+        batch = self.batches
+        count = len(amounts)
+        self.batch_ids.extend([batch] * count)
+        self.account_ids.extend(accounts)
+        self.kinds.extend([kind] * count)
+        self.amounts.extend(amounts)
+        balances = self.balances
+        for account, cents in entries:
+            balances[account] += cents
+        self.batches += 1
+        return batch
+
+    def post_round(self, players, results):
+        """Post a round's settlements as one batch and update the seats.
+
+        results holds each seat's net in dollars, or None for a seat that
+        did not bet, as determine_winners returns them.
+        """
+        settled = []
+        entries = []
+        house = 0
+        for player, net in zip(players, results):
+            if net is None:
+                continue
+            account = self.account(player)
+            cents = to_cents(net)
+            settled.append((player, account))
+            entries.append((account, cents))
+            house -= cents
+        if not entries:
+            return None
+        entries.append((HOUSE, house))
+        batch = self.post(SETTLE, entries)
+        balances = self.balances
+        for player, account in settled:
+            player._balance = balances[account] / 100
+        return batch
+
+    def donate(self, player, amount):
+        """Top a player's account up to amount dollars from the house."""
+        account = self.account(player)
+        cents = to_cents(amount) - self.balances[account]
+        self.post(DONATE, [(account, cents), (HOUSE, -cents)])
+        player._balance = self.balances[account] / 100
+
+    def compact(self):
+        """Fold the journal into one batch of carried balances.
+
+        Closed accounts are dropped and the open ones renumbered, so
+        account indices held outside the ledger are stale afterwards;
+        look players up again with account.
+        """
+        keep = list(range(SYSTEM_ACCOUNTS)) + sorted(self.accounts.values())
+        renumber = {old: new for new, old in enumerate(keep)}
+        self.accounts = {
+            key: renumber[account] for key, account in self.accounts.items()
+        }
+        carried = [self.balances[account] for account in keep]
+        self.names = [self.names[account] for account in keep]
+        self.balances = [0] * len(keep)
+        for column in (
+            self.batch_ids,
+            self.account_ids,
+            self.kinds,
+            self.amounts,
+        ):
+            del column[:]
+        entries = [
+            (account, cents) for account, cents in enumerate(carried) if cents
+        ]
+        if entries:
+            self.post(CARRY, entries)
+
+    def rebuild(self):
+        """Recompute every balance from the journal and return them."""
+        balances = np.zeros(len(self.names), dtype=np.int64)
+        np.add.at(
+            balances,
+            np.frombuffer(self.account_ids, dtype=np.int64),
+            np.frombuffer(self.amounts, dtype=np.int64),
+        )
+        self.balances = balances.tolist()
+        return self.balances
+
+    def check(self):
+        """Raise ValueError unless the balances match the journal."""
+        cached = list(self.balances)
+        if self.rebuild() != cached:
+            raise ValueError("the balances disagree with the journal.")
+        if sum(cached) != 0:
+            raise ValueError("the ledger's balances do not sum to zero.")
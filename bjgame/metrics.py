@@ -0,0 +1,123 @@
+"""Per-phase round timings and counters for profiling the engine"""
+
+import json
+import os
+import time
+
+# round phases in the order the engine plays them; "shuffle" is the shoe
+# rebuild that the deal would otherwise do, timed on its own, and
+# "settlement" includes recording and counting the round
+PHASES = (
+    "betting",
+    "shuffle",
+    "deal",
+    "player_turns",
+    "dealer_turn",
+    "settlement",
+    "clear",
+)
+
+
+class RoundMetrics:
+    """Accumulates phase timings and counters over many rounds
+
+    Attach an instance to an engine's metrics attribute to enable it.
+    The engine calls start_round, then lap as each phase ends; timings
+    are perf_counter_ns deltas summed per phase alongside the slowest
+    single occurrence.  When a path is given, a JSON snapshot is
+    written there at most once every interval seconds.
+    """
+
+    def __init__(self, path=None, interval=10.0):
+        """Initialize empty metrics with an optional periodic dump file."""
+        self.path = path
+        self.interval = interval
+        self.reset()
+        self._next_dump = time.monotonic() + interval
+
+    def reset(self):
+        """Zero every timing and counter."""
+        self.rounds = 0
+        self.phase_ns = [0] * len(PHASES)
+        self.phase_max_ns = [0] * len(PHASES)
+        self.cards_dealt = 0
+        self.shoe_rebuilds = 0
+        self.hands = 0
+        self.busts = 0
+        self.pushes = 0
+        self.dealer_busts = 0
+        self._marks = []
+
+    def start_round(self):
+        """Mark the start of a round's first phase."""
+        self._marks = [time.perf_counter_ns()]
+
+    def lap(self):
+        """Mark the end of a phase, adding the round once all have ended."""
+        marks = self._marks
+        marks.append(time.perf_counter_ns())
+        if len(marks) > len(PHASES):
+            self.add_phases([b - a for a, b in zip(marks, marks[1:])])
+
+    def add_phases(self, timings):
+        """Add one round's phase durations, given in PHASES order."""
+        self.rounds += 1
+        totals = self.phase_ns
+        peaks = self.phase_max_ns
+        for i, ns in enumerate(timings):
+            totals[i] += ns
+            if ns > peaks[i]:
+                peaks[i] = ns
+        if self.path is not None and time.monotonic() >= self._next_dump:
+            self.dump()
+
+    def count_round(self, engine, results):
+        """Count the cards and outcomes of a settled round."""
+        dealer_hand = engine.dealer.hand
+        cards = len(dealer_hand.codes)
+        for player, net in zip(engine.players, results):
+            if net is None:
+                continue
+            hand = player.hand
+            cards += len(hand.codes)
+            self.hands += 1
+            if hand.value > 21:
+                self.busts += 1
+            elif net == 0:
+                self.pushes += 1
+        self.cards_dealt += cards
+        if dealer_hand.value > 21:
+            self.dealer_busts += 1
+
+    def snapshot(self):
+        """Return the current totals as a JSON-ready dict."""
+        rounds = self.rounds
+        phases = {}
+        for name, total, peak in zip(
+            PHASES, self.phase_ns, self.phase_max_ns
+        ):
+            phases[name] = {
+                "total_ns": total,
+                "mean_ns": total / rounds if rounds else 0.0,
+                "max_ns": peak,
+            }
+        return {
+            "rounds": rounds,
+            "total_ns": sum(self.phase_ns),
+            "phases": phases,
+            "cards_dealt": self.cards_dealt,
+            "shoe_rebuilds": self.shoe_rebuilds,
+            "hands": self.hands,
+            "busts": self.busts,
+            "pushes": self.pushes,
+            "dealer_busts": self.dealer_busts,
+        }
+
+    def dump(self, path=None):
+        """Write a snapshot as JSON, replacing the previous file atomically."""
+        path = path or self.path
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+        self._next_dump = time.monotonic() + self.interval
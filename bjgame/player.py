@@ -117,9 +117,9 @@ class BlkJckPlayer(Player):
                 print("Invalid input. Please enter 'y' or 'n'.")
         return "y" == answer
 
-    def take_card(self, card):
-        """Add a card to the player's hand."""
-        self.hand.add_cards([card])
+    def take_card(self, code):
+        """Add a card, given by its compact code, to the player's hand."""
+        self.hand.add_code(code)
 
     def hand_value(self):
         """Return the player's hand value."""
@@ -195,7 +195,8 @@ class Dealer(BlkJckPlayer):
     @property
     def first_card_is_ten_or_ace(self):
         """Check if the dealer's first card is a ten-value card."""
-        return self.hand.cards[0].is_Ten() or self.hand.cards[0].is_Ace()
+        code = self.hand.codes[0]
+        return CODE_IS_TEN[code] or CODE_IS_ACE[code]
 
     hit_on_17 = True
 
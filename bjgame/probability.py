@@ -0,0 +1,158 @@
+"""Exact dealer outcome probabilities for a given shoe composition
+
+Compositions are 10-tuples of remaining card counts indexed by rank index
+(``CODE_RANK_INDEX``): Ace first, then 2 through 9, then all ten-valued
+cards.  Distributions follow the dealer rules in ``BlackJackEngine``: the
+dealer hits soft 17 on the first two cards and stops on any total of 17
+or more after drawing.
+
+Internally a composition is packed into one int with ``RANK_BITS`` bits
+per rank, so removing a card is a subtraction and cache keys are a few
+small ints rather than tuples.
+"""
+
+from functools import lru_cache
+
+from .card import CODE_RANK_INDEX
+
+NUM_RANKS = 10
+RANK_BITS = 9
+RANK_MASK = (1 << RANK_BITS) - 1
+RANK_UNIT = tuple(1 << (RANK_BITS * i) for i in range(NUM_RANKS))
+RANK_SHIFT = tuple(RANK_BITS * i for i in range(NUM_RANKS))
+
+# positions in a dealer distribution
+OUTCOMES = (17, 18, 19, 20, 21, "bust", "blackjack")
+BUST = 5
+BLACKJACK = 6
+
+DRAW_CACHE_SIZE = 1 << 19
+
+
+def full_composition(num_decks=8):
+    """Return the composition of a freshly built shoe."""
+    return (4 * num_decks,) * 9 + (16 * num_decks,)
+
+
+def shoe_composition(shoe):
+    """Return the composition of the cards left in a Shoe.
+
+    Shoes that track their contents some other way, like ContinuousShoe,
+    report them through their own composition method.
+    """
+    composition = getattr(shoe, "composition", None)
+    if composition is not None:
+        return composition()
+    counts = [0] * NUM_RANKS
+    cards = shoe.cards
+    for i in range(shoe.cursor, len(cards)):
+        counts[CODE_RANK_INDEX[cards[i]]] += 1
+    return tuple(counts)
+
+
+def remove_card(counts, rank_index):
+    """Return the composition with one card of the given rank removed."""
+    if not counts[rank_index]:
+        raise ValueError(f"no cards of rank index {rank_index} remain.")
+    return (
+        counts[:rank_index]
+        + (counts[rank_index] - 1,)
+        + counts[rank_index + 1 :]
+    )
+
+
+def pack_composition(counts):
+    """Pack a composition tuple into a single int key."""
+    packed = 0
+    for rank_index, count in enumerate(counts):
+        if not 0 <= count <= RANK_MASK:
+            raise ValueError(f"cannot pack {count} cards of one rank.")
+        packed |= count << RANK_SHIFT[rank_index]
+    return packed
+
+
+def hand_total(hard, has_ace):
+    """Return the best total for a hard total and whether an Ace is held."""
+    if has_ace and hard <= 11:
+        return hard + 10
+    return hard
+
+
+@lru_cache(maxsize=DRAW_CACHE_SIZE)
+def _dealer_draws(hard, has_ace, packed, remaining):
+    """Distribution of final totals once the dealer must draw a card."""
+    dist = [0.0] * 6
+    for rank_index in range(NUM_RANKS):
+        count = (packed >> RANK_SHIFT[rank_index]) & RANK_MASK
+        if not count:
+            continue
+        p = count / remaining
+        new_hard = hard + rank_index + 1
+        new_ace = has_ace or rank_index == 0
+        total = hand_total(new_hard, new_ace)
+        if total > 21:
+            dist[BUST] += p
+        elif total >= 17:
+            dist[total - 17] += p
+        else:
+            sub = _dealer_draws(
+                new_hard,
+                new_ace,
+                packed - RANK_UNIT[rank_index],
+                remaining - 1,
+            )
+            for i in range(6):
+                dist[i] += p * sub[i]
+    return tuple(dist)
+
+
+def dealer_packed(up_rank_index, packed, remaining):
+    """dealer_distribution for a packed composition of remaining cards.
+
+    Not memoized itself: the solver asks once per hand state, which its
+    own cache already covers, and the draws below share _dealer_draws.
+    """
+    dist = [0.0] * 7
+    for rank_index in range(NUM_RANKS):
+        count = (packed >> RANK_SHIFT[rank_index]) & RANK_MASK
+        if not count:
+            continue
+        p = count / remaining
+        hard = up_rank_index + rank_index + 2
+        has_ace = up_rank_index == 0 or rank_index == 0
+        total = hand_total(hard, has_ace)
+        if total == 21:
+            dist[BLACKJACK] += p
+        elif total > 17 or (total == 17 and hard == 17):
+            dist[total - 17] += p
+        else:
+            sub = _dealer_draws(
+                hard,
+                has_ace,
+                packed - RANK_UNIT[rank_index],
+                remaining - 1,
+            )
+            for i in range(6):
+                dist[i] += p * sub[i]
+    return tuple(dist)
+
+
+def dealer_distribution(up_rank_index, counts):
+    """Return the dealer's final-total distribution for an up card.
+
+    counts is the composition the hole card and any draws come from, so
+    it must not include the up card.  The result is indexed like OUTCOMES.
+    """
+    return dealer_packed(
+        up_rank_index, pack_composition(counts), sum(counts)
+    )
+
+
+def cache_info():
+    """Return hit statistics for the draw cache."""
+    return _dealer_draws.cache_info()
+
+
+def clear_cache():
+    """Empty the draw cache."""
+    _dealer_draws.cache_clear()
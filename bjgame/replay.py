@@ -0,0 +1,275 @@
+"""Deterministic replay of logged rounds through the round engine
+
+A hand history record holds every card in the order it was dealt and
+every decision a seat made, so feeding the cards back through a
+RecordedShoe and the decisions through ReplayStrategy plays the round
+again with the engine's own deal, turn and settlement code.  Anything
+the replay does differently from the log is reported as a Divergence,
+which audits disputed hands and regression tests rule changes against
+archived rounds.
+"""
+
+from array import array
+from collections import namedtuple
+
+from .engine import BUST, LOSE, PUSH, WIN, BlackJackEngine
+from .history import (
+    NO_BET,
+    OUTCOME_BUST,
+    OUTCOME_LOSE,
+    OUTCOME_PUSH,
+    OUTCOME_WIN,
+    read_history,
+)
+from .player import BlkJckPlayer
+from .shoe import Shoe
+from .strategy import Strategy
+
+OUTCOME_CODES = {
+    WIN: OUTCOME_WIN,
+    LOSE: OUTCOME_LOSE,
+    PUSH: OUTCOME_PUSH,
+    BUST: OUTCOME_BUST,
+}
+
+# records converted to Python values at a time
+CHUNK_SIZE = 1 << 14
+
+Divergence = namedtuple(
+    "Divergence", ["round", "seat", "field", "recorded", "replayed"]
+)
+
+ReplayReport = namedtuple(
+    "ReplayReport", ["rounds", "hands", "divergences", "truncated"]
+)
+
+
+class RecordedShoe(Shoe):
+    """A shoe that deals one logged round's cards in their original order
+
+    The shoe never shuffles or reaches the cut card.  Drawing past the
+    loaded cards raises ValueError, which is how a replay notices the
+    engine wanting more cards than the round used.
+    """
+
+    def __init__(self, num_decks=8):
+        """Initialize an empty shoe."""
+        super().__init__(num_decks)
+        self.cards = array("b")
+        self.cursor = 0
+        self.cut_index = 1 << 62
+        self.rebuild = False
+
+    def _build_shoe(self):
+        """Recorded shoes are never rebuilt."""
+        self.rebuild = False
+
+    def load(self, codes):
+        """Replace the shoe's contents with codes in deal order."""
+        self.cards = array("b", codes)
+        self.cursor = 0
+
+    def draw(self):
+        """Deal the next recorded card."""
+        if self.cursor >= len(self.cards):
+            raise ValueError("the recorded round has no cards left.")
+        code = self.cards[self.cursor]
+        self.cursor += 1
+        return code
+
+
+class ReplayStrategy(Strategy):
+    """Makes one seat's logged decisions for the round being replayed"""
+
+    def __init__(self):
+        """Initialize a seat that sits out until a round is loaded."""
+        self.bet = 0
+        self.hits = 0
+
+    def load(self, bet, hits):
+        """Set the bet and number of hits logged for the next round."""
+        self.bet = bet
+        self.hits = hits
+
+    def wager(self, player):
+        """Bet what the log says."""
+        return self.bet
+
+    def accept_donation(self, player):
+        """Take the bailout if the log shows the seat betting."""
+        return self.bet > 0
+
+    def hit(self, player, up_card):
+        """Hit until the hand holds as many hits as the log."""
+        return len(player.hand.codes) - 2 < self.hits
+
+
+def deal_order(record):
+    """Return a record's cards in the order the engine deals them.
+
+    record maps field names to Python values for one round.  Seats
+    without a bet are skipped, as the engine skips them.
+    """
+    dealer = record["dealer_cards"][: record["dealer_count"]]
+    seats = [
+        cards[:count]
+        for cards, count, outcome in zip(
+            record["cards"], record["card_count"], record["outcome"]
+        )
+        if outcome != NO_BET
+    ]
+    codes = [hand[0] for hand in seats]
+    codes.append(dealer[0])
+    codes.extend(hand[1] for hand in seats)
+    codes.append(dealer[1])
+    for hand in seats:
+        codes.extend(hand[2:])
+    codes.extend(dealer[2:])
+    return codes
+
+
+class ReplayEngine(BlackJackEngine):
+    """Replays logged rounds and checks them against the log
+
+    Each seat's balance is taken from the log the first time the seat
+    bets and from then on only moves as the replay settles and donates,
+    so a logged balance that does not follow from the rounds before it
+    is reported.  Subclass and override the round's methods, such as
+    dealer_turn, to see how archived rounds would have gone under
+    different rules.
+    """
+
+    def __init__(self, seats, num_decks=8):
+        """Seat players whose balances are set from the log."""
+        super().__init__(RecordedShoe(num_decks))
+        for seat in range(seats):
+            self.add_player(
+                BlkJckPlayer(f"Seat {seat + 1}", 0), ReplayStrategy()
+            )
+        self.seeded = [False] * seats
+        self.settled = None
+        self.outcomes = []
+
+    def determine_winners(self):
+        """Settle as the engine does, keeping the hands to compare."""
+        self.settled = (
+            self.dealer.hand.codes.tolist(),
+            [player.hand.codes.tolist() for player in self.players],
+        )
+        self.outcomes = []
+        return super().determine_winners()
+
+    def on_settle(self, player, outcome, dealer_value):
+        """Remember the outcome of each settled seat in order."""
+        self.outcomes.append(OUTCOME_CODES[outcome])
+
+    def replay_round(self, record, index):
+        """Replay one record and return its list of Divergences.
+
+        record maps field names to Python values for one round.
+        """
+        seats = record["seats"]
+        if seats > len(self.players):
+            raise ValueError(
+                f"round {index} has {seats} seats; the replay seats "
+                f"{len(self.players)}."
+            )
+        for seat, strategy in enumerate(self.strategies):
+            if seat < seats and record["outcome"][seat] != NO_BET:
+                if not self.seeded[seat]:
+                    # the balance the seat brought to its first round
+                    self.players[seat]._balance = (
+                        record["balance"][seat] - record["net"][seat]
+                    )
+                    self.seeded[seat] = True
+                strategy.load(record["bet"][seat], record["hits"][seat])
+            else:
+                strategy.load(0, 0)
+        shoe = self.shoe
+        shoe.load(deal_order(record))
+
+        try:
+            results = self.play_round()
+        except ValueError as error:
+            self.clear_hands()
+            for seat in range(seats):
+                if record["outcome"][seat] != NO_BET:
+                    self.players[seat]._balance = record["balance"][seat]
+            field = "shoe" if shoe.cursor >= len(shoe.cards) else "bet"
+            return [Divergence(index, None, field, None, str(error))]
+
+        divergences = []
+        if shoe.cursor < len(shoe.cards):
+            divergences.append(
+                Divergence(index, None, "shoe", len(shoe.cards), shoe.cursor)
+            )
+        dealer, hands = self.settled
+        recorded = record["dealer_cards"][: record["dealer_count"]]
+        if dealer != recorded:
+            divergences.append(
+                Divergence(index, None, "cards", recorded, dealer)
+            )
+
+        outcomes = iter(self.outcomes)
+        for seat, net in enumerate(results):
+            if net is None:
+                if seat < seats and record["outcome"][seat] != NO_BET:
+                    divergences.append(
+                        Divergence(index, seat, "bet", record["bet"][seat], 0)
+                    )
+                continue
+            player = self.players[seat]
+            checks = (
+                (
+                    "cards",
+                    record["cards"][seat][: record["card_count"][seat]],
+                    hands[seat],
+                ),
+                ("outcome", record["outcome"][seat], next(outcomes)),
+                ("net", record["net"][seat], net),
+                ("balance", record["balance"][seat], player._balance),
+            )
+            for field, expected, replayed in checks:
+                if expected != replayed:
+                    divergences.append(
+                        Divergence(index, seat, field, expected, replayed)
+                    )
+            # carry on from the logged balance so one divergence is
+            # reported once rather than in every later round
+            player._balance = record["balance"][seat]
+        return divergences
+
+
+def replay_history(records, engine=None, limit=None, max_divergences=1000):
+    """Replay logged rounds and return a ReplayReport.
+
+    records is a hand history path or the array read_history returns.
+    Without an engine a ReplayEngine is seated for the widest round
+    logged.  At most max_divergences are kept; truncated tells whether
+    more were found.
+    """
+    if isinstance(records, str):
+        records = read_history(records)
+    if limit is not None:
+        records = records[:limit]
+    if engine is None:
+        seats = int(records["seats"].max()) if len(records) else 0
+        engine = ReplayEngine(seats)
+
+    names = records.dtype.names
+    divergences = []
+    truncated = False
+    hands = 0
+    replay_round = engine.replay_round
+    for start in range(0, len(records), CHUNK_SIZE):
+        chunk = records[start : start + CHUNK_SIZE]
+        columns = [chunk[name].tolist() for name in names]
+        for offset, values in enumerate(zip(*columns)):
+            record = dict(zip(names, values))
+            found = replay_round(record, start + offset)
+            hands += sum(o != NO_BET for o in record["outcome"])
+            if found:
+                room = max_divergences - len(divergences)
+                truncated = truncated or len(found) > room
+                divergences.extend(found[:room])
+    return ReplayReport(len(records), hands, divergences, truncated)
@@ -0,0 +1,457 @@
+"""Configurable table rules compiled into specialized round functions
+
+A ``Rules`` tuple describes one rule set.  ``compile_round`` turns it into
+Python source for a single round with every rule decided up front, so the
+generated code carries no branches for rules that are off, and executes
+it once.  Player decisions come from a decider's
+``decide(total, soft, pair, up, allowed)``: ``up`` is the dealer's up card
+value with an Ace as 1, ``pair`` is the value of a splittable pair or 0,
+and ``allowed`` is a bit mask of the actions permitted right now.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from .card import CODE_RANKS
+from .shoe import Shoe
+
+STAND = 0
+HIT = 1
+DOUBLE = 2
+SPLIT = 3
+SURRENDER = 4
+
+# allowed masks hold 1 << action for every permitted action
+ALWAYS = 1 << STAND | 1 << HIT
+
+# totals a first two cards may double on, by Rules.double
+DOUBLE_TESTS = {
+    None: None,
+    "any": "True",
+    "9-11": "9 <= total <= 11",
+    "10-11": "10 <= total <= 11",
+}
+
+Rules = namedtuple(
+    "Rules",
+    [
+        "num_decks",
+        "hit_soft_17",
+        "soft_17_two_cards_only",
+        "blackjack_pays",
+        "double",
+        "double_after_split",
+        "split_hands",
+        "surrender",
+    ],
+    defaults=(8, True, False, 1.5, "any", True, 4, False),
+)
+Rules.__doc__ = """One set of table rules
+
+hit_soft_17 makes the dealer hit soft 17; with soft_17_two_cards_only
+the dealer does so only on the first two cards and stops on any 17 or
+more once drawing.  blackjack_pays is the payout of a natural, such as
+1.5 for 3:2 or 1.2 for 6:5; None means a two-card 21 is an ordinary 21
+and the dealer does not peek.  double is None, "any", "9-11" or "10-11".
+split_hands caps the hands a pair may become (1 disables splitting;
+split Aces take one card each).  surrender is late surrender.
+"""
+
+# the rules BlackJackEngine plays
+LEGACY = Rules(
+    hit_soft_17=True,
+    soft_17_two_cards_only=True,
+    blackjack_pays=None,
+    double=None,
+    double_after_split=False,
+    split_hands=1,
+    surrender=False,
+)
+
+# blackjack value of each card code, an Ace counting 1
+VALUES = CODE_RANKS
+
+
+def _dealer_source(rules):
+    """Return the dealer's drawing lines, indented for the round body."""
+    draw = [
+        "card = values[draw()]",
+        "dealer_hard += card",
+        "dealer_ace = dealer_ace or card == 1",
+        "dealer = dealer_hard + 10 if dealer_ace and dealer_hard < 12"
+        " else dealer_hard",
+    ]
+    if not rules.hit_soft_17:
+        loop = ["while dealer < 17:"] + ["    " + line for line in draw]
+    elif rules.soft_17_two_cards_only:
+        # a two-card soft 17 has a hard total of 7
+        loop = ["if dealer < 17 or dealer_hard == 7:"]
+        loop += ["    while True:"]
+        loop += ["        " + line for line in draw]
+        loop += ["        if dealer >= 17:", "            break"]
+    else:
+        loop = ["while dealer < 17 or dealer == 17 and dealer_hard == 7:"]
+        loop += ["    " + line for line in draw]
+    return ["            " + line for line in loop]
+
+
+def _hand_source(rules):
+    """Return the lines playing one player hand, indented to depth 0."""
+    split = rules.split_hands > 1
+    double_test = DOUBLE_TESTS[rules.double]
+    options = split or rules.surrender or double_test is not None
+    soft = "ace and hard < 12"
+    lines = [
+        "hard = a + b",
+        "ace = a == 1 or b == 1",
+        "stake = bet",
+    ]
+    if not options:
+        lines += [
+            "while True:",
+            "    total = hard + 10 if ace and hard < 12 else hard",
+            f"    if total >= 21 or decide(total, {soft}, 0, up, {ALWAYS})"
+            f" != {HIT}:",
+            "        break",
+            "    card = values[draw()]",
+            "    hard += card",
+            "    ace = ace or card == 1",
+        ]
+        return lines
+
+    lines += [
+        "opening = True",
+        "while True:",
+        "    total = hard + 10 if ace and hard < 12 else hard",
+    ]
+    if split:
+        # split Aces take a single card each
+        lines += ["    if total >= 21 or hands > 1 and a == 1:"]
+    else:
+        lines += ["    if total >= 21:"]
+    lines += [
+        "        break",
+        "    if opening:",
+        "        opening = False",
+        f"        allowed = {ALWAYS}",
+    ]
+    if double_test is not None:
+        test = double_test
+        if split and not rules.double_after_split:
+            test = f"hands == 1 and {test}"
+        lines += [
+            f"        if {test}:",
+            f"            allowed |= {1 << DOUBLE}",
+        ]
+    if split:
+        lines += [
+            f"        if a == b and hands < {rules.split_hands}:",
+            f"            allowed |= {1 << SPLIT}",
+        ]
+    if rules.surrender:
+        test = "hands == 1" if split else "True"
+        lines += [
+            f"        if {test}:",
+            f"            allowed |= {1 << SURRENDER}",
+        ]
+    lines += [
+        "        pair = a if a == b else 0",
+        f"        action = decide(total, {soft}, pair, up, allowed)",
+        "    else:",
+        f"        action = decide(total, {soft}, 0, up, {ALWAYS})",
+        f"    if action == {HIT}:",
+        "        card = values[draw()]",
+        "        hard += card",
+        "        ace = ace or card == 1",
+    ]
+    if double_test is not None:
+        lines += [
+            f"    elif action == {DOUBLE}:",
+            "        stake += stake",
+            "        card = values[draw()]",
+            "        hard += card",
+            "        ace = ace or card == 1",
+            "        break",
+        ]
+    if split:
+        lines += [
+            f"    elif action == {SPLIT}:",
+            "        pending.append(a)",
+            "        hands += 1",
+            "        b = values[draw()]",
+            "        hard = a + b",
+            "        ace = a == 1 or b == 1",
+            "        opening = True",
+        ]
+    if rules.surrender:
+        lines += [
+            f"    elif action == {SURRENDER}:",
+            "        results[i] -= bet / 2",
+            "        stake = 0",
+            "        break",
+        ]
+    lines += ["    else:", "        break"]
+    return lines
+
+
+def round_source(rules, discards=False):
+    """Return the source of a round function specialized for rules.
+
+    The function is play_round(shoe, bets, decide) and returns each
+    seat's net result.  With discards it hands every card dealt back to
+    shoe.discard at the end of the round, as a continuous shuffler needs.
+    """
+    if rules.double not in DOUBLE_TESTS:
+        raise ValueError(f"unknown double rule {rules.double!r}.")
+    if rules.split_hands < 1:
+        raise ValueError("split_hands must be at least 1.")
+    naturals = rules.blackjack_pays is not None
+    split = rules.split_hands > 1
+
+    lines = [
+        "def play_round(shoe, bets, decide):",
+        "    if shoe.rebuild:",
+        "        shoe._build_shoe()",
+        "    values = VALUES",
+        "    draw = shoe.draw",
+    ]
+    if discards:
+        lines += [
+            "    dealt = []",
+            "    shoe_draw = draw",
+            "",
+            "    def draw():",
+            "        code = shoe_draw()",
+            "        dealt.append(code)",
+            "        return code",
+            "",
+        ]
+    lines += [
+        "    seats = len(bets)",
+        "    first = [values[draw()] for _ in range(seats)]",
+        "    up = values[draw()]",
+        "    second = [values[draw()] for _ in range(seats)]",
+        "    hole = values[draw()]",
+        "    results = [0] * seats",
+        "    # (seat, total, stake) of every hand left for the dealer",
+        "    finals = []",
+    ]
+
+    seat = [
+        "for i in range(seats):",
+        "    bet = bets[i]",
+        "    a = first[i]",
+        "    b = second[i]",
+    ]
+    if naturals:
+        seat += [
+            "    if a + b == 11 and (a == 1 or b == 1):",
+            f"        results[i] = bet * {float(rules.blackjack_pays)!r}",
+            "        continue",
+        ]
+    hand = _hand_source(rules)
+    hand += [
+        "total = hard + 10 if ace and hard < 12 else hard",
+        "if stake:",
+        "    finals.append((i, total, stake))",
+    ]
+    if split:
+        seat += ["    pending = []", "    hands = 1", "    while True:"]
+        seat += ["        " + line for line in hand]
+        seat += [
+            "        if not pending:",
+            "            break",
+            "        a = pending.pop()",
+            "        b = values[draw()]",
+        ]
+    else:
+        seat += ["    " + line for line in hand]
+
+    if naturals:
+        # the dealer peeks, and a natural takes every bet but a natural
+        lines += [
+            "    if up + hole == 11 and (up == 1 or hole == 1):",
+            "        for i in range(seats):",
+            "            a = first[i]",
+            "            b = second[i]",
+            "            if a + b != 11 or a != 1 and b != 1:",
+            "                results[i] = -bets[i]",
+            "    else:",
+        ]
+        lines += ["        " + line for line in seat]
+    else:
+        lines += ["    " + line for line in seat]
+
+    lines += [
+        "    dealer_hard = up + hole",
+        "    dealer_ace = up == 1 or hole == 1",
+        "    dealer = dealer_hard + 10 if dealer_ace and dealer_hard < 12"
+        " else dealer_hard",
+        "    for _, total, _ in finals:",
+        "        if total <= 21:",
+    ]
+    lines += _dealer_source(rules)
+    lines += [
+        "            break",
+        "    for i, total, stake in finals:",
+        "        if total > 21:",
+        "            results[i] -= stake",
+        "        elif dealer > 21 or total > dealer:",
+        "            results[i] += stake",
+        "        elif total < dealer:",
+        "            results[i] -= stake",
+        "    if shoe.cursor > shoe.cut_index:",
+        "        shoe.rebuild = True",
+    ]
+    if discards:
+        lines += ["    shoe.discard(dealt)"]
+    lines += ["    return results"]
+    return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=None)
+def compile_round(rules, discards=False):
+    """Compile the round function for a rule set, once per rule set."""
+    source = round_source(rules, discards)
+    namespace = {"VALUES": VALUES}
+    exec(compile(source, f"<round {tuple(rules)}>", "exec"), namespace)
+    play_round = namespace["play_round"]
+    play_round.source = source
+    return play_round
+
+
+class StandOnDecider:
+    """Hits below a fixed total and never doubles, splits or surrenders"""
+
+    def __init__(self, stand_on=17):
+        """Initialize the decider with the total to stand on."""
+        self.stand_on = stand_on
+
+    def decide(self, total, soft, pair, up, allowed):
+        """Hit below stand_on, otherwise stand."""
+        return HIT if total < self.stand_on else STAND
+
+
+# multi-deck basic strategy charts with the up cards 2-9, T, A across.
+# H hit, S stand, D double or else hit, d double or else stand,
+# R surrender or else hit, r surrender or else stand
+HARD_CHART = {
+    9: "HDDDDHHHHH",
+    10: "DDDDDDDDHH",
+    11: "DDDDDDDDDD",
+    12: "HHSSSHHHHH",
+    13: "SSSSSHHHHH",
+    14: "SSSSSHHHHH",
+    15: "SSSSSHHHRR",
+    16: "SSSSSHHRRR",
+    17: "SSSSSSSSSr",
+}
+SOFT_CHART = {
+    13: "HHHDDHHHHH",
+    14: "HHHDDHHHHH",
+    15: "HHDDDHHHHH",
+    16: "HHDDDHHHHH",
+    17: "HDDDDHHHHH",
+    18: "dddddSSHHH",
+    19: "SSSSdSSSSS",
+}
+# P where a pair splits; elsewhere it plays as its total
+PAIR_CHART = {
+    1: "PPPPPPPPPP",
+    2: "PPPPPPHHHH",
+    3: "PPPPPPHHHH",
+    4: "HHHPPHHHHH",
+    6: "PPPPPHHHHH",
+    7: "PPPPPPHHHH",
+    8: "PPPPPPPPPP",
+    9: "PPPPPSPPSS",
+}
+CHART_ACTIONS = {
+    "H": (HIT, HIT),
+    "S": (STAND, STAND),
+    "D": (DOUBLE, HIT),
+    "d": (DOUBLE, STAND),
+    "R": (SURRENDER, HIT),
+    "r": (SURRENDER, STAND),
+}
+
+
+def _by_up_value(row):
+    """Reorder a chart row from 2-9, T, A to up card values 1-10."""
+    return row[-1] + row[:-1]
+
+
+class BasicStrategyDecider:
+    """Plays the multi-deck H17 basic strategy charts
+
+    Where the chart's first choice is not allowed the decider falls back
+    to its second, so the same charts serve every rule set.
+    """
+
+    def __init__(self):
+        """Expand the charts into (action, fallback) lookups."""
+        self.hard = [[(HIT, HIT)] * 11 for _ in range(22)]
+        self.soft = [[(HIT, HIT)] * 11 for _ in range(22)]
+        for total in range(17, 22):
+            self.hard[total] = [(STAND, STAND)] * 11
+        for total in range(19, 22):
+            self.soft[total] = [(STAND, STAND)] * 11
+        for table, chart in ((self.hard, HARD_CHART), (self.soft, SOFT_CHART)):
+            for total, row in chart.items():
+                table[total] = [None] + [
+                    CHART_ACTIONS[mark] for mark in _by_up_value(row)
+                ]
+        self.split = [[False] * 11 for _ in range(11)]
+        for pair, row in PAIR_CHART.items():
+            self.split[pair] = [False] + [
+                mark == "P" for mark in _by_up_value(row)
+            ]
+
+    def decide(self, total, soft, pair, up, allowed):
+        """Look up the chart action, falling back if it is not allowed."""
+        if pair and allowed & (1 << SPLIT) and self.split[pair][up]:
+            return SPLIT
+        action, fallback = (self.soft if soft else self.hard)[total][up]
+        return action if allowed & (1 << action) else fallback
+
+
+class RuleEngine:
+    """Plays flat-bet seats under a rule set with a compiled round"""
+
+    def __init__(self, rules=LEGACY, seats=1, bet=1, decider=None, shoe=None):
+        """Initialize the engine, compiling the round for the rules.
+
+        The shoe defaults to one of rules.num_decks decks, and decisions
+        to basic strategy.
+        """
+        self.rules = rules
+        self.shoe = shoe if shoe is not None else Shoe(rules.num_decks)
+        self.bets = [bet] * seats
+        self.decider = (
+            decider if decider is not None else BasicStrategyDecider()
+        )
+        discards = type(self.shoe).discard is not Shoe.discard
+        self._round = compile_round(rules, discards)
+
+    def play_round(self):
+        """Play one round and return each seat's net result."""
+        return self._round(self.shoe, self.bets, self.decider.decide)
+
+    def play_rounds(self, rounds):
+        """Play several rounds and return the total net result per seat."""
+        play_round = self._round
+        shoe = self.shoe
+        bets = self.bets
+        decide = self.decider.decide
+        totals = [0] * len(bets)
+        for _ in range(rounds):
+            for i, net in enumerate(play_round(shoe, bets, decide)):
+                totals[i] += net
+        return totals
+
+
+def house_edge(rules, rounds, decider=None, rng=None):
+    """Return the house edge per initial bet over rounds of one seat."""
+    shoe = Shoe(rules.num_decks, rng)
+    engine = RuleEngine(rules, decider=decider, shoe=shoe)
+    return -engine.play_rounds(rounds)[0] / rounds
@@ -0,0 +1,348 @@
+"""Asyncio server hosting many independent blackjack tables
+
+Clients speak a line protocol over TCP.  After connecting they send
+``JOIN <table> <name>``; the table is created on first join and removed
+when its last player leaves.  The server then prompts with ``BET?``
+(answer ``BET <amount>``, 0 to sit out), ``DONATE?`` when broke (answer
+``Y`` or ``N``) and ``ACTION?`` (answer ``HIT`` or ``STAND``).  A player
+who does not answer within the decision timeout sits out, declines or
+stands.  ``QUIT`` leaves the table.  Everything else the server sends is
+a one-line announcement of what happened at the table.
+"""
+
+import asyncio
+import logging
+
+from .card import Card
+from .engine import BlackJackEngine
+from .ledger import Ledger
+from .player import BlkJckPlayer
+from .shoe import Shoe
+
+MAX_SEATS = 4
+DECISION_TIMEOUT = 30.0
+# queued input lines per seat and unsent output bytes per connection
+INPUT_LIMIT = 8
+OUTPUT_LIMIT = 1 << 16
+# ledger entries kept before the journal is compacted
+LEDGER_LIMIT = 1 << 16
+
+log = logging.getLogger(__name__)
+
+
+class RemoteSeat:
+    """A connected player sitting at a table"""
+
+    def __init__(self, name, writer):
+        """Initialize the seat for a player and their connection."""
+        self.player = BlkJckPlayer(name, 100.00)
+        self.writer = writer
+        self.inbox = asyncio.Queue(maxsize=INPUT_LIMIT)
+        self.connected = True
+
+    def send(self, line):
+        """Queue a line for the client without waiting for the network."""
+        if not self.connected:
+            return
+        if self.writer.transport.get_write_buffer_size() > OUTPUT_LIMIT:
+            # the client stopped reading; drop it rather than buffer forever
+            self.disconnect()
+            return
+        self.writer.write(line.encode() + b"\n")
+
+    def disconnect(self):
+        """Close the connection and mark the seat as gone."""
+        if self.connected:
+            self.connected = False
+            self.writer.close()
+            # wake a pending ask so the table moves on at once
+            try:
+                self.inbox.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+
+    async def ask(self, prompt, timeout):
+        """Send a prompt and return the reply, or None on timeout."""
+        if not self.connected:
+            return None
+        while not self.inbox.empty():
+            self.inbox.get_nowait()
+        self.send(prompt)
+        try:
+            return await asyncio.wait_for(self.inbox.get(), timeout)
+        except asyncio.TimeoutError:
+            self.send("TIMEOUT")
+            return None
+
+
+class TableEngine(BlackJackEngine):
+    """Round engine that announces every event to the seats at a table"""
+
+    def __init__(self, table, num_decks=8):
+        """Initialize the engine for a table with its own shoe."""
+        super().__init__(Shoe(num_decks))
+        self.table = table
+
+    def on_card(self, player, code):
+        """Announce a face-up card."""
+        self.table.broadcast(f"CARD {player._name} {Card.from_code(code)}")
+
+    def on_hole_card(self, code):
+        """Announce the dealer's hidden card."""
+        self.table.broadcast("HOLE Dealer")
+
+    def on_hit(self, player, code):
+        """Announce a drawn card and the new total."""
+        self.table.broadcast(
+            f"HIT {player._name} {Card.from_code(code)} {player.hand.value}"
+        )
+
+    def on_blackjack(self, player):
+        """Announce a blackjack."""
+        self.table.broadcast(f"BLACKJACK {player._name}")
+
+    def on_bust(self, player):
+        """Announce a bust."""
+        self.table.broadcast(f"BUST {player._name}")
+
+    def on_stand(self, player):
+        """Announce a stand."""
+        self.table.broadcast(f"STAND {player._name} {player.hand.value}")
+
+    def on_dealer_turn(self, active):
+        """Reveal the dealer's hand."""
+        hand = self.dealer.hand
+        self.table.broadcast(
+            f"DEALER {Card.from_code(hand.codes[1])} {hand.value}"
+        )
+
+    def on_settle(self, player, outcome, dealer_value):
+        """Announce how a bet was settled."""
+        self.table.broadcast(
+            f"RESULT {player._name} {outcome} {player._balance:.2f}"
+        )
+
+
+class Table:
+    """One table with its own shoe, dealer and seats
+
+    Seats that join during a round are seated when the next round starts,
+    and seats that leave are removed when the current round ends, so the
+    engine's player list never changes mid-round.
+    """
+
+    def __init__(
+        self,
+        name,
+        decision_timeout=DECISION_TIMEOUT,
+        num_decks=8,
+        ledger=None,
+    ):
+        """Initialize an empty table settling through an optional ledger."""
+        self.name = name
+        self.decision_timeout = decision_timeout
+        self.engine = TableEngine(self, num_decks)
+        self.engine.ledger = ledger
+        self.seats = []
+        self.waiting = []
+
+    @property
+    def full(self):
+        """Check whether every seat is taken."""
+        return len(self.seats) + len(self.waiting) >= MAX_SEATS
+
+    def join(self, seat):
+        """Queue a seat to play from the next round."""
+        self.waiting.append(seat)
+        seat.send(f"WELCOME {self.name}")
+
+    def broadcast(self, line):
+        """Send a line to every connected seat."""
+        for seat in self.seats:
+            seat.send(line)
+
+    def _seat_players(self):
+        """Drop departed seats and their accounts, and seat those waiting."""
+        ledger = self.engine.ledger
+        if ledger is not None:
+            for seat in self.seats:
+                if not seat.connected:
+                    ledger.close_account(seat.player)
+        self.seats = [seat for seat in self.seats if seat.connected]
+        self.seats += [seat for seat in self.waiting if seat.connected]
+        self.waiting.clear()
+        self.engine.players = [seat.player for seat in self.seats]
+        self.engine.strategies = [None] * len(self.seats)
+
+    async def collect_bets(self):
+        """Ask every seat for a bet; return True if anyone is playing."""
+        playing = False
+        for seat in self.seats:
+            try:
+                await self.collect_bet(seat)
+            except Exception:
+                log.exception(
+                    "dropping %s at table %s", seat.player._name, self.name
+                )
+                seat.player.current_bet = 0
+                seat.disconnect()
+            playing = playing or seat.player.current_bet > 0
+        return playing
+
+    async def collect_bet(self, seat):
+        """Ask one seat for a bet until it gives a valid one or sits out."""
+        engine = self.engine
+        timeout = self.decision_timeout
+        player = seat.player
+        if player._balance <= 0:
+            answer = await seat.ask("DONATE?", timeout)
+            accepted = answer is not None and answer.upper() == "Y"
+            if not engine.donate(player, accepted):
+                return
+        while True:
+            answer = await seat.ask(f"BET? {player._balance:.2f}", timeout)
+            try:
+                gamble = float(answer.split()[-1]) if answer else 0
+                engine.place_bet(player, gamble)
+            except (ValueError, IndexError):
+                seat.send("ERROR invalid bet")
+                continue
+            return
+
+    async def player_turn(self, seat):
+        """Collect hit/stand decisions from one seat."""
+        engine = self.engine
+        player = seat.player
+        if not engine.begin_turn(player):
+            return
+        try:
+            while True:
+                answer = await seat.ask(
+                    f"ACTION? {player.hand.value}", self.decision_timeout
+                )
+                if answer is None or answer.upper() != "HIT":
+                    engine.stand(player)
+                    break
+                if not engine.hit(player):
+                    break
+        except Exception:
+            # the hand settles as it stands
+            log.exception("dropping %s at table %s", player._name, self.name)
+            seat.disconnect()
+        engine.end_turn()
+
+    async def play_round(self):
+        """Play one round with the seated players."""
+        engine = self.engine
+        if not await self.collect_bets():
+            engine.clear_hands()
+            return
+        engine.deal_initial_cards()
+        for seat in self.seats:
+            await self.player_turn(seat)
+        engine.dealer_turn()
+        engine.determine_winners()
+        engine.clear_hands()
+        ledger = engine.ledger
+        if ledger is not None and len(ledger) > LEDGER_LIMIT:
+            ledger.compact()
+
+    async def run(self):
+        """Play rounds until every seat has left.
+
+        A round that fails outside any one seat's decisions is logged and
+        voided, and the table plays on.
+        """
+        while True:
+            self._seat_players()
+            if not self.seats:
+                return
+            try:
+                await self.play_round()
+            except Exception:
+                log.exception("voiding a round at table %s", self.name)
+                self.engine.clear_hands()
+
+
+class BlackJackServer:
+    """Accepts connections and routes players to their tables"""
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=8765,
+        decision_timeout=DECISION_TIMEOUT,
+        max_tables=10000,
+    ):
+        """Initialize the server settings."""
+        self.host = host
+        self.port = port
+        self.decision_timeout = decision_timeout
+        self.max_tables = max_tables
+        self.ledger = Ledger()
+        self.tables = {}
+        self._tasks = set()
+
+    async def _run_table(self, table):
+        """Run a table and forget it once it empties."""
+        try:
+            await table.run()
+        finally:
+            self.tables.pop(table.name, None)
+
+    def _table(self, name):
+        """Return the named table, creating and starting it if needed."""
+        table = self.tables.get(name)
+        if table is None:
+            if len(self.tables) >= self.max_tables:
+                return None
+            table = Table(name, self.decision_timeout, ledger=self.ledger)
+            self.tables[name] = table
+            task = asyncio.create_task(self._run_table(table))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return table
+
+    async def handle(self, reader, writer):
+        """Serve one client connection."""
+        line = await reader.readline()
+        parts = line.decode(errors="replace").split(maxsplit=2)
+        if len(parts) != 3 or parts[0].upper() != "JOIN":
+            writer.write(b"ERROR expected JOIN <table> <name>\n")
+            writer.close()
+            return
+
+        table = self._table(parts[1])
+        if table is None or table.full:
+            writer.write(b"ERROR no seat available\n")
+            writer.close()
+            return
+
+        seat = RemoteSeat(parts[2].strip(), writer)
+        table.join(seat)
+        try:
+            while seat.connected:
+                line = await reader.readline()
+                if not line:
+                    break
+                text = line.decode(errors="replace").strip()
+                if text.upper() == "QUIT":
+                    break
+                await seat.inbox.put(text)
+        finally:
+            seat.disconnect()
+
+    async def serve_forever(self):
+        """Listen for clients until cancelled."""
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """Run the table server on the default address"""
+    asyncio.run(BlackJackServer().serve_forever())
+
+
+if __name__ == "__main__":
+    main()
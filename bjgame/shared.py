@@ -0,0 +1,189 @@
+"""Outcome tables in shared memory, written by many simulation workers
+
+The tables count every player decision by dealer up card value (an Ace
+is 1), player total, soft or hard, the decision taken and how the hand
+ended.  Each worker owns one stripe of a single shared memory block and
+is its only writer, so workers never lock or wait on each other; the
+totals are the sum over stripes, which any process can read while the
+run is still going.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .card import CODE_RANKS
+from .farm import shard_engine, shard_rounds
+
+STAND = 0
+HIT = 1
+DECISIONS = ("stand", "hit")
+
+WIN = 0
+LOSE = 1
+PUSH = 2
+BUST = 3
+RESULTS = ("win", "lose", "push", "bust")
+
+# up card value, player total, soft, decision, result
+SHAPE = (11, 22, 2, len(DECISIONS), len(RESULTS))
+STRIPE_SIZE = int(np.prod(SHAPE))
+UP_STRIDE = STRIPE_SIZE // SHAPE[0]
+ITEMSIZE = np.dtype(np.int64).itemsize
+
+
+class SharedTables:
+    """One shared block of outcome tables, striped by worker"""
+
+    def __init__(self, workers, name=None):
+        """Create a zeroed block, or attach to the named block."""
+        self.workers = workers
+        size = workers * STRIPE_SIZE * ITEMSIZE
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.shm.buf[:size] = bytes(size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.stripes = np.ndarray(
+            (workers,) + SHAPE, dtype=np.int64, buffer=self.shm.buf
+        )
+
+    def totals(self):
+        """Return the counts summed over every worker's stripe."""
+        return self.stripes.sum(axis=0)
+
+    def close(self):
+        """Detach from the block."""
+        self.stripes = None
+        self.shm.close()
+
+    def unlink(self):
+        """Free the block once every process has closed it."""
+        self.shm.unlink()
+
+
+class TableRecorder:
+    """Counts a worker's decisions straight into its stripe
+
+    Append to an engine's recorders to record every round.  Counts are
+    written through a flat memoryview, so recording costs a few integer
+    increments per decision and readers see them immediately.
+    """
+
+    def __init__(self, name, worker):
+        """Attach to the named block and select the worker's stripe."""
+        self.shm = shared_memory.SharedMemory(name=name)
+        self.counts = self.shm.buf.cast("q")
+        self.base = worker * STRIPE_SIZE
+
+    def record(self, engine, results):
+        """Count the decisions of every settled hand in the round."""
+        counts = self.counts
+        up = CODE_RANKS[engine.dealer.hand.codes[0]]
+        base = self.base + up * UP_STRIDE
+        for player, net in zip(engine.players, results):
+            if net is None:
+                continue
+            hand = player.hand
+            if hand.value > 21:
+                result = BUST
+            elif net > 0:
+                result = WIN
+            elif net < 0:
+                result = LOSE
+            else:
+                result = PUSH
+            codes = hand.codes
+            last = len(codes) - 1
+            hard = CODE_RANKS[codes[0]]
+            ace = hard == 1
+            for k in range(1, last + 1):
+                rank = CODE_RANKS[codes[k]]
+                hard += rank
+                ace = ace or rank == 1
+                soft = ace and hard < 12
+                total = hard + 10 if soft else hard
+                if total >= 21:
+                    break
+                decision = HIT if k < last else STAND
+                cell = ((total * 2 + soft) * 2 + decision) * 4
+                counts[base + cell + result] += 1
+
+    def close(self):
+        """Detach from the block."""
+        self.counts.release()
+        self.shm.close()
+
+
+def decision_ev(totals):
+    """Return the EV and hand count of every table cell.
+
+    Both arrays are indexed by up card, total, soft and decision; cells
+    never reached have an EV of NaN.
+    """
+    hands = totals.sum(axis=-1)
+    net = totals[..., WIN] - totals[..., LOSE] - totals[..., BUST]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return net / hands, hands
+
+
+def play_table_shard(
+    name, seed, worker, rounds, num_decks=8, seats=1, strategy=None
+):
+    """Play one worker's share of rounds into its stripe."""
+    engine = shard_engine(seed, worker, num_decks, seats, strategy)
+    recorder = TableRecorder(name, worker)
+    engine.recorders.append(recorder)
+    try:
+        engine.play_rounds(rounds)
+    finally:
+        recorder.close()
+    return rounds
+
+
+def _play_table_shard(args):
+    """Unpack pool arguments for play_table_shard."""
+    return play_table_shard(*args)
+
+
+def run_tables(
+    rounds,
+    workers,
+    seed=0,
+    num_decks=8,
+    seats=1,
+    strategy=None,
+    progress=None,
+    interval=1.0,
+):
+    """Play rounds across a process pool into shared outcome tables.
+
+    While the workers run, progress is called about every interval
+    seconds with the interim totals.  Returns the final totals.
+    """
+    tables = SharedTables(workers)
+    try:
+        jobs = [
+            (tables.name, seed, worker, count, num_decks, seats, strategy)
+            for worker, count in enumerate(shard_rounds(rounds, workers))
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(_play_table_shard, job) for job in jobs}
+            next_report = time.monotonic() + interval
+            while pending:
+                timeout = max(next_report - time.monotonic(), 0)
+                done, pending = wait(
+                    pending, timeout, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    future.result()
+                if progress is not None and time.monotonic() >= next_report:
+                    progress(tables.totals())
+                    next_report = time.monotonic() + interval
+        return tables.totals()
+    finally:
+        tables.close()
+        tables.unlink()
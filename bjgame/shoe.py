@@ -1,34 +1,234 @@
 """A class containing a shoe holding multiples decks and dealing from it."""
 
 from .card import *
-from random import randrange
+from array import array
+import random
 
 
 class Shoe:
-    """A card shoe used for blackjack"""
+    """A card shoe used for blackjack
 
-    def __init__(self, num_decks=8):
-        """Initialize the shoe with the specified number of decks."""
+    The shoe holds compact card codes in one preallocated ``array('b')``
+    that is reshuffled in place on every rebuild, or swapped for one a
+    ShoePool shuffled ahead.  Dealing advances a read cursor, so neither
+    dealing nor reshuffling allocates.  Use
+    ``Card.from_code`` to display a dealt card.
+    """
+
+    def __init__(self, num_decks=8, rng=None, pool=None):
+        """Initialize the shoe with the number of decks and a Random.
+
+        Without an rng the shoe shuffles with the global random module.
+        With a ShoePool of the same size, rebuilds swap in a shoe the pool
+        shuffled ahead of time and fall back to shuffling inline.
+        """
+        if pool is not None and pool.num_decks != num_decks:
+            raise ValueError(
+                f"the pool shuffles {pool.num_decks} decks but the shoe "
+                f"holds {num_decks}."
+            )
         self.num_decks = num_decks
-        self.cut_card_postion = None
+        self.rng = rng if rng is not None else random
+        self.pool = pool
+        self.cards = array("b", range(NUM_CODES)) * num_decks
+        self.cursor = len(self.cards)
+        self.cut_card_position = None
+        self.cut_index = 0
         self.rebuild = True
-        self._shoe = None
+        self.counter = None
 
     def _build_shoe(self):
-        """Build and shuffle the shoe."""
+        """Shuffle the shoe or take one from the pool, and reset the cursor."""
         assert self.rebuild
         self.rebuild = False
-        self.shoe = Deck()
-        for _ in range(self.num_decks - 1):
-            self.shoe.merge(Deck())
-        self.shoe.shuffle()
-        self.shoe.cut()
-        # place the cut card between 60% and 80% of the shoe
-        self.cut_card_position = randrange(60, 80)
+        shuffled = self.pool.take() if self.pool is not None else None
+        if shuffled is not None:
+            self.pool.recycle(self.cards)
+            self.cards, self.cut_card_position = shuffled
+        else:
+            # a cut of a uniformly shuffled shoe leaves the order uniform,
+            # so the rebuild only shuffles
+            self.rng.shuffle(self.cards)
+            # place the cut card 60 to 80 cards from the back of the shoe
+            self.cut_card_position = self.rng.randrange(60, 80)
+        self.cursor = 0
+        self.cut_index = len(self.cards) - self.cut_card_position
+        if self.counter is not None:
+            self.counter.reset(self.num_decks)
+
+    def __len__(self):
+        """Return the number of cards left in the shoe."""
+        return len(self.cards) - self.cursor
+
+    def draw(self):
+        """Advance the cursor and return the code of the card dealt."""
+        code = self.cards[self.cursor]
+        self.cursor += 1
+        return code
+
+    def _draw_counted(self):
+        """Deal the next card and add it to the running count."""
+        code = self.cards[self.cursor]
+        self.cursor += 1
+        self.counter.count(code)
+        return code
+
+    def attach_counter(self, counter):
+        """Count every card dealt from now on with the given CardCounter.
+
+        The counted draw replaces draw on this instance only, so a shoe
+        without a counter deals at full speed.
+        """
+        self.counter = counter
+        self.draw = self._draw_counted
+        counter.reset(self.num_decks)
+        if not self.rebuild:
+            for i in range(self.cursor):
+                counter.count(self.cards[i])
+
+    def detach_counter(self):
+        """Stop counting cards."""
+        self.counter = None
+        self.__dict__.pop("draw", None)
+
+    def true_count(self):
+        """Return the attached counter's true count for the cards left."""
+        if self.rebuild:
+            # the next round starts from a fresh shoe
+            initial = self.counter.initial_count(self.num_decks)
+            return initial / self.num_decks
+        return self.counter.true_count(len(self))
 
     def deal_card(self, player, ncards=1):
-        """Deal a card from the shoe."""
-        cards = self.shoe.deal(ncards)
-        player.add_cards(cards)
-        if self.cut_card_position > len(self.shoe.cards):
+        """Deal cards from the shoe into a hand, flagging the cut card."""
+        add_code = player.add_code
+        for _ in range(ncards):
+            add_code(self.draw())
+        if self.cursor > self.cut_index:
             self.rebuild = True
+
+    def discard(self, codes):
+        """Take back cards after a round; they wait for the next rebuild."""
+
+
+class ContinuousShoe(Shoe):
+    """A continuous shuffling machine
+
+    Instead of a list of cards the machine holds a count of each card
+    code in a Fenwick tree.  Every draw picks uniformly from what is left
+    and every discarded card goes straight back, both in O(log n), so the
+    shoe never reshuffles.  The cursor counts the cards out of the
+    machine, and the cut index lies beyond it so the cut card never
+    comes up.
+    """
+
+    def __init__(self, num_decks=8, rng=None):
+        """Initialize the machine with the number of decks and a Random."""
+        # no call to Shoe.__init__: the machine has no card array
+        self.num_decks = num_decks
+        self.rng = rng if rng is not None else random
+        self.pool = None
+        self.total = NUM_CODES * num_decks
+        self.cursor = self.total
+        self.cut_card_position = None
+        self.cut_index = 0
+        self.rebuild = True
+        self.counter = None
+        self.tree = [0] * (NUM_CODES + 1)
+        # highest power of two within the tree, where a descent starts
+        self._top = 1 << (NUM_CODES.bit_length() - 1)
+
+    def _build_shoe(self):
+        """Load every card into the machine."""
+        assert self.rebuild
+        self.rebuild = False
+        tree = self.tree
+        for i in range(1, NUM_CODES + 1):
+            tree[i] = self.num_decks * (i & -i)
+        self.cursor = 0
+        self.cut_index = self.total
+        if self.counter is not None:
+            self.counter.reset(self.num_decks)
+
+    def __len__(self):
+        """Return the number of cards in the machine."""
+        return self.total - self.cursor
+
+    def _add(self, code, delta):
+        """Change the count of one card code."""
+        tree = self.tree
+        i = code + 1
+        while i <= NUM_CODES:
+            tree[i] += delta
+            i += i & -i
+
+    def count_of(self, code):
+        """Return how many cards of a code are in the machine."""
+        tree = self.tree
+        total = 0
+        i = code + 1
+        while i:
+            total += tree[i]
+            i &= i - 1
+        i = code
+        while i:
+            total -= tree[i]
+            i &= i - 1
+        return total
+
+    def composition(self):
+        """Return the count of each rank left, indexed by rank index."""
+        counts = [0] * 10
+        for code in range(NUM_CODES):
+            counts[CODE_RANK_INDEX[code]] += self.count_of(code)
+        return tuple(counts)
+
+    def draw(self):
+        """Remove a uniformly chosen card and return its code."""
+        target = self.rng.randrange(self.total - self.cursor)
+        tree = self.tree
+        pos = 0
+        bit = self._top
+        while bit:
+            nxt = pos + bit
+            if nxt <= NUM_CODES and tree[nxt] <= target:
+                target -= tree[nxt]
+                pos = nxt
+            bit >>= 1
+        # tree index pos + 1 holds the picked code
+        i = pos + 1
+        while i <= NUM_CODES:
+            tree[i] -= 1
+            i += i & -i
+        self.cursor += 1
+        return pos
+
+    def _draw_counted(self):
+        """Draw a card and add it to the running count."""
+        code = ContinuousShoe.draw(self)
+        self.counter.count(code)
+        return code
+
+    def discard(self, codes):
+        """Return cards to the machine."""
+        add = self._add
+        counter = self.counter
+        for code in codes:
+            add(code, 1)
+            if counter is not None:
+                counter.running -= counter.code_tags[code]
+        self.cursor -= len(codes)
+
+    def attach_counter(self, counter):
+        """Count every card dealt from now on with the given CardCounter.
+
+        The running count covers the cards out of the machine, so it
+        falls back as discards return.
+        """
+        self.counter = counter
+        self.draw = self._draw_counted
+        counter.reset(self.num_decks)
+        if not self.rebuild:
+            for code in range(NUM_CODES):
+                out = self.num_decks - self.count_of(code)
+                counter.running += counter.code_tags[code] * out
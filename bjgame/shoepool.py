@@ -0,0 +1,86 @@
+"""Background pool of pre-shuffled shoes"""
+
+import random
+import threading
+from array import array
+from queue import Empty, Full, Queue
+
+from .card import NUM_CODES
+
+
+class ShoePool:
+    """Keeps shuffled shoes ready so a rebuild is a buffer swap
+
+    A daemon thread shuffles shoe buffers with its own Random and queues
+    them, together with a cut card position, up to size at a time.  Shoes
+    hand their spent buffers back through recycle, so the pool stops
+    allocating once it is warm.  A shoe that finds the pool empty counts
+    a miss and shuffles inline instead.
+
+    The thread shares the interpreter lock, so the pool hides reshuffle
+    latency in rounds that wait on players or the network; it does not
+    make a CPU-bound simulation faster.
+    """
+
+    def __init__(self, num_decks=8, size=2, rng=None):
+        """Start filling a pool of up to size shoes of num_decks decks."""
+        self.num_decks = num_decks
+        self.rng = rng if rng is not None else random.Random()
+        self.swaps = 0
+        self.misses = 0
+        self._ready = Queue(maxsize=size)
+        self._free = Queue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._fill, name="shoe-pool", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self):
+        """Return the pool for use in a with block."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the pool at the end of a with block."""
+        self.close()
+
+    def _fill(self):
+        """Shuffle buffers into the ready queue until stopped."""
+        while not self._stop.is_set():
+            try:
+                cards = self._free.get_nowait()
+            except Empty:
+                cards = array("b", range(NUM_CODES)) * self.num_decks
+            self.rng.shuffle(cards)
+            shuffled = (cards, self.rng.randrange(60, 80))
+            while not self._stop.is_set():
+                try:
+                    self._ready.put(shuffled, timeout=0.1)
+                    break
+                except Full:
+                    pass
+
+    def take(self):
+        """Return a ready (cards, cut_card_position) pair, or None if dry."""
+        try:
+            shuffled = self._ready.get_nowait()
+        except Empty:
+            self.misses += 1
+            return None
+        self.swaps += 1
+        return shuffled
+
+    def recycle(self, cards):
+        """Hand back a spent buffer for the thread to shuffle again."""
+        if len(cards) == NUM_CODES * self.num_decks:
+            self._free.put(cards)
+
+    @property
+    def ready(self):
+        """Return the number of shuffled shoes waiting."""
+        return self._ready.qsize()
+
+    def close(self, timeout=1.0):
+        """Stop the filling thread and wait for it to exit."""
+        self._stop.set()
+        self._thread.join(timeout)
@@ -0,0 +1,234 @@
+"""Composition-dependent expected values and basic strategy tables
+
+Expected values are exact for the rules the engine plays: hit or stand
+only, the player stops on 21, and every bet pays 1:1, so a player's 21
+pushes against a dealer blackjack.  Hands are described by their hard
+total and whether they hold an Ace; the shoe by a rank composition as in
+``bjgame.probability``.
+"""
+
+import json
+from functools import lru_cache
+
+from .card import CODE_RANK_INDEX
+from .probability import (
+    BUST,
+    NUM_RANKS,
+    RANK_MASK,
+    RANK_SHIFT,
+    RANK_UNIT,
+    dealer_packed,
+    full_composition,
+    hand_total,
+    pack_composition,
+)
+from .strategy import FlatBetStrategy
+
+SOLVER_CACHE_SIZE = 1 << 16
+
+
+def stand_ev(total, dist):
+    """Return the EV of standing on a total against a dealer distribution."""
+    if total > 21:
+        return -1.0
+    win = dist[BUST]
+    lose = 0.0
+    for i in range(5):
+        dealer_total = 17 + i
+        if dealer_total < total:
+            win += dist[i]
+        elif dealer_total > total:
+            lose += dist[i]
+    if total < 21:
+        lose += dist[-1]
+    return win - lose
+
+
+@lru_cache(maxsize=SOLVER_CACHE_SIZE)
+def _best_ev(hard, has_ace, up_rank_index, packed, remaining):
+    """EV of playing a hand optimally from here."""
+    stand, hit = _hand_ev(hard, has_ace, up_rank_index, packed, remaining)
+    return stand if stand >= hit else hit
+
+
+def _hand_ev(hard, has_ace, up_rank_index, packed, remaining):
+    """Stand and hit EVs of a hand against a packed composition."""
+    total = hand_total(hard, has_ace)
+    stand = stand_ev(total, dealer_packed(up_rank_index, packed, remaining))
+    if total >= 21:
+        return stand, -1.0
+
+    hit = 0.0
+    for rank_index in range(NUM_RANKS):
+        count = (packed >> RANK_SHIFT[rank_index]) & RANK_MASK
+        if not count:
+            continue
+        p = count / remaining
+        new_hard = hard + rank_index + 1
+        new_ace = has_ace or rank_index == 0
+        if hand_total(new_hard, new_ace) > 21:
+            hit -= p
+        else:
+            hit += p * _best_ev(
+                new_hard,
+                new_ace,
+                up_rank_index,
+                packed - RANK_UNIT[rank_index],
+                remaining - 1,
+            )
+    return stand, hit
+
+
+def hand_ev(hard, has_ace, up_rank_index, counts):
+    """Return the exact (stand, hit) EVs for a hand.
+
+    counts is the composition left after the player's cards and the
+    dealer's up card were dealt.  Hitting a total of 21 or more reports
+    an EV of -1 since the engine never allows it.
+    """
+    return _hand_ev(
+        hard, has_ace, up_rank_index, pack_composition(counts), sum(counts)
+    )
+
+
+def clear_cache():
+    """Empty the solver's memoized hand values."""
+    _best_ev.cache_clear()
+
+
+class StrategyTable:
+    """Hit/stand decisions indexed by total, softness and dealer up card
+
+    hard[total][up] and soft[total][up] are True where the player should
+    hit; up is the dealer up card's rank index.  Totals the table does not
+    cover, including 21, stand.
+    """
+
+    def __init__(self, hard, soft, num_decks=8):
+        """Initialize the table from its hard and soft decision rows."""
+        self.hard = tuple(tuple(row) for row in hard)
+        self.soft = tuple(tuple(row) for row in soft)
+        self.num_decks = num_decks
+
+    def should_hit(self, total, soft, up_rank_index):
+        """Look up whether to hit."""
+        if total > 21:
+            return False
+        if soft:
+            return self.soft[total][up_rank_index]
+        return self.hard[total][up_rank_index]
+
+    def to_dict(self):
+        """Return a JSON-serializable representation of the table."""
+        return {
+            "num_decks": self.num_decks,
+            "hard": [[int(hit) for hit in row] for row in self.hard],
+            "soft": [[int(hit) for hit in row] for row in self.soft],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a table from the output of to_dict."""
+        return cls(
+            [[bool(hit) for hit in row] for row in data["hard"]],
+            [[bool(hit) for hit in row] for row in data["soft"]],
+            data["num_decks"],
+        )
+
+    def save(self, path):
+        """Write the table to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        """Read a table written by save."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def __str__(self):
+        """Render the table as H/S grids with the up cards across."""
+        header = "     " + " ".join(f"{up:>2}" for up in "A23456789T")
+        lines = []
+        for name, rows, low in (
+            ("Hard", self.hard, 4),
+            ("Soft", self.soft, 12),
+        ):
+            lines += [name, header]
+            for total in range(low, 21):
+                marks = " ".join(" H" if hit else " S" for hit in rows[total])
+                lines.append(f"{total:>4} {marks}")
+        return "\n".join(lines)
+
+
+def solve_table(num_decks=8):
+    """Compute the basic strategy table for a fresh shoe of num_decks.
+
+    Each total's decision weighs every two-card start making that total
+    by its probability and compares the exact hit and stand EVs.  Starts
+    are enumerated as unordered pairs, and hands reached by drawing the
+    same cards in a different order share one memoized state.
+    """
+    full = full_composition(num_decks)
+    size = sum(full) - 3
+    hard = [[False] * NUM_RANKS for _ in range(22)]
+    soft = [[False] * NUM_RANKS for _ in range(22)]
+
+    for up in range(NUM_RANKS):
+        shoe = list(full)
+        shoe[up] -= 1
+        # sums of probability-weighted (stand, hit) EVs per total
+        sums = {}
+        for first in range(NUM_RANKS):
+            for second in range(first, NUM_RANKS):
+                counts = list(shoe)
+                p = counts[first] / (size + 2)
+                counts[first] -= 1
+                p *= counts[second] / (size + 1)
+                counts[second] -= 1
+                if p <= 0:
+                    continue
+                if second != first:
+                    p *= 2
+                hard_total = first + second + 2
+                has_ace = first == 0 or second == 0
+                total = hand_total(hard_total, has_ace)
+                if total == 21:
+                    continue
+                stand, hit = _hand_ev(
+                    hard_total, has_ace, up, pack_composition(counts), size
+                )
+                key = (total, total != hard_total)
+                weighted = sums.setdefault(key, [0.0, 0.0])
+                weighted[0] += p * stand
+                weighted[1] += p * hit
+
+        for (total, is_soft), (stand, hit) in sums.items():
+            (soft if is_soft else hard)[total][up] = hit > stand
+
+    return StrategyTable(hard, soft, num_decks)
+
+
+class TableStrategy(FlatBetStrategy):
+    """Flat bets and plays hit/stand straight from a StrategyTable"""
+
+    def __init__(self, table, bet=1, rebuy=True):
+        """Initialize with the decision table and bet size."""
+        super().__init__(bet, rebuy=rebuy)
+        self.table = table
+        self._lookup = None
+
+    def hit(self, player, up_card):
+        """Look the decision up in the table."""
+        hand = player.hand
+        rows = self.table.soft if hand._soft else self.table.hard
+        return rows[hand._value][CODE_RANK_INDEX[up_card]]
+
+    def hit_batch(self, values, soft, up_ranks):
+        """Look many decisions up in the table at once with NumPy."""
+        if self._lookup is None:
+            import numpy as np
+
+            self._lookup = np.array([self.table.hard, self.table.soft])
+        totals = values.clip(max=21)
+        return self._lookup[soft.astype(int), totals, up_ranks - 1]
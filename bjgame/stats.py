@@ -0,0 +1,136 @@
+"""Streaming result statistics with per-group breakdowns"""
+
+from math import sqrt
+
+from .card import CODE_RANKS
+
+# two-sided 95% normal quantile for confidence intervals
+Z_95 = 1.959963984540054
+
+
+class RunningStats:
+    """Mean and variance of a stream, updated one value at a time
+
+    Uses Welford's update, so nothing but the count, the exact sum, the
+    mean and the sum of squared deviations is kept, and merges exactly
+    with another stream's statistics.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        """Add one value to the stream."""
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Fold another RunningStats into this one and return self."""
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.total += other.total
+        return self
+
+    @property
+    def variance(self):
+        """Return the sample variance."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        """Return the sample standard deviation."""
+        return sqrt(self.variance)
+
+    def half_width(self, z=Z_95):
+        """Return the half-width of the mean's confidence interval."""
+        if self.count < 2:
+            return float("inf")
+        return z * self.stdev / sqrt(self.count)
+
+    def interval(self, z=Z_95):
+        """Return the (low, high) confidence interval of the mean."""
+        margin = self.half_width(z)
+        return self.mean - margin, self.mean + margin
+
+
+class RoundStats:
+    """Streams every seat's result, overall and by group
+
+    Results are grouped by the dealer's up card value (an Ace is 1) and by
+    the player's starting total, each in a fixed list of RunningStats, so
+    memory does not grow with the number of rounds.  Set an engine's
+    stats attribute to an instance to record every round it plays.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics for every group."""
+        self.rounds = 0
+        self.overall = RunningStats()
+        self.by_up_card = [RunningStats() for _ in range(11)]
+        self.by_start = [RunningStats() for _ in range(22)]
+
+    def record(self, engine, results):
+        """Add the results of the round the engine just settled."""
+        self.rounds += 1
+        up = CODE_RANKS[engine.dealer.hand.codes[0]]
+        for player, net in zip(engine.players, results):
+            if net is None:
+                continue
+            codes = player.hand.codes
+            first = CODE_RANKS[codes[0]]
+            second = CODE_RANKS[codes[1]]
+            start = first + second
+            if (first == 1 or second == 1) and start < 12:
+                start += 10
+            self.overall.add(net)
+            self.by_up_card[up].add(net)
+            self.by_start[start].add(net)
+
+    def merge(self, other):
+        """Fold another RoundStats into this one and return self."""
+        self.rounds += other.rounds
+        self.overall.merge(other.overall)
+        for mine, theirs in zip(self.by_up_card, other.by_up_card):
+            mine.merge(theirs)
+        for mine, theirs in zip(self.by_start, other.by_start):
+            mine.merge(theirs)
+        return self
+
+    def ci_width(self, z=Z_95):
+        """Return the full width of the EV's confidence interval."""
+        return 2 * self.overall.half_width(z)
+
+    def converged(self, width, z=Z_95):
+        """Check whether the EV's confidence interval is within width."""
+        return self.ci_width(z) <= width
+
+
+def run_until(engine, width, max_rounds, check_every=1000, z=Z_95):
+    """Play rounds until the EV interval is narrower than width.
+
+    Stops after max_rounds regardless and returns the rounds played.
+    The results accumulate in engine.stats, created if unset.
+    """
+    if engine.stats is None:
+        engine.stats = RoundStats()
+    stats = engine.stats
+    played = 0
+    while played < max_rounds:
+        count = min(check_every, max_rounds - played)
+        engine.play_rounds(count)
+        played += count
+        if stats.converged(width, z):
+            break
+    return played
@@ -0,0 +1,118 @@
+"""Persistent player store backed by an indexed SQLite table"""
+
+import os
+import pickle
+import sqlite3
+from uuid import UUID
+
+
+class PlayerStore:
+    """Stores every player's name, id and balance on disk
+
+    Lookups by id go through the primary key and lookups by name through
+    an index, so both are O(log n) and never load other players.  Balance
+    updates touch only the rows of the players given.
+    """
+
+    def __init__(self, path="player_data.db"):
+        """Open or create the store at path."""
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS players ("
+            "player_id TEXT PRIMARY KEY, "
+            "name TEXT NOT NULL, "
+            "balance REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS players_name ON players (name)"
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        """Return the store for use in a with block."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the store at the end of a with block."""
+        self.close()
+
+    def close(self):
+        """Commit and close the underlying connection."""
+        self.conn.commit()
+        self.conn.close()
+
+    def __len__(self):
+        """Return the number of stored players."""
+        count = self.conn.execute("SELECT COUNT(*) FROM players").fetchone()
+        return count[0]
+
+    @staticmethod
+    def _record(row):
+        """Turn a database row into a player record."""
+        if row is None:
+            return None
+        player_id, name, balance = row
+        return {
+            "name": name,
+            "balance": balance,
+            "player_id": UUID(player_id),
+        }
+
+    def get(self, player_id):
+        """Return the record for a player id, or None."""
+        row = self.conn.execute(
+            "SELECT player_id, name, balance FROM players "
+            "WHERE player_id = ?",
+            (str(player_id),),
+        ).fetchone()
+        return self._record(row)
+
+    def find_by_name(self, name):
+        """Return the first record saved under a name, or None."""
+        row = self.conn.execute(
+            "SELECT player_id, name, balance FROM players WHERE name = ? "
+            "ORDER BY rowid LIMIT 1",
+            (name,),
+        ).fetchone()
+        return self._record(row)
+
+    def save(self, player):
+        """Insert a player or update their stored name and balance."""
+        self.save_all([player])
+
+    def save_all(self, players):
+        """Insert or update several players in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO players (player_id, name, balance) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (player_id) DO UPDATE SET "
+                "name = excluded.name, balance = excluded.balance",
+                [
+                    (str(player.player_id), player._name, player._balance)
+                    for player in players
+                ],
+            )
+
+    def import_pickle(self, path):
+        """Copy players from an old pickled save file into the store."""
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "rb") as f:
+                player_data = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError):
+            return 0
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO players (player_id, name, balance) "
+                "VALUES (?, ?, ?)",
+                [
+                    (str(data["player_id"]), data["name"], data["balance"])
+                    for data in player_data.values()
+                ],
+            )
+        return len(player_data)
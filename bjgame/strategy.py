@@ -0,0 +1,113 @@
+"""Betting and playing strategies that drive seats in the round engine"""
+
+
+class Strategy:
+    """Base class for the decisions a seat makes during a round
+
+    Seats decide one at a time, so people and bots can share a table.
+    Strategies that can also answer many decisions at once derive from
+    BatchStrategy.
+    """
+
+    def wager(self, player):
+        """Return the amount to bet this round, or 0 to sit out."""
+        return 0
+
+    def accept_donation(self, player):
+        """Decide whether a broke player takes the donor bailout."""
+        return False
+
+    def hit(self, player, up_card):
+        """Decide whether the player takes another card.
+
+        up_card is the compact code of the dealer's face-up card.
+        """
+        return False
+
+
+class BatchStrategy(Strategy):
+    """A bot that can also answer many pending decisions at once
+
+    wager_batch and hit_batch take and return NumPy arrays, so vectorized
+    simulators can drive the bot across every table in a single call.
+    They must agree with wager and hit seat by seat.
+    """
+
+    def wager_batch(self, balances):
+        """Return the bet for every seat given an array of balances."""
+        return balances * 0
+
+    def hit_batch(self, values, soft, up_ranks):
+        """Decide for many hands at once which of them take a card.
+
+        values, soft and up_ranks are arrays of hand totals, soft flags
+        and dealer up card values with an Ace as 1; the result is a
+        boolean mask of the hands that hit.
+        """
+        return values < 0
+
+
+class FlatBetStrategy(BatchStrategy):
+    """Bets a fixed amount and hits below a fixed total, like the dealer"""
+
+    def __init__(self, bet=1, stand_on=17, rebuy=True):
+        """Initialize with the bet size and the total to stand on."""
+        self.bet = bet
+        self.stand_on = stand_on
+        self.rebuy = rebuy
+
+    def wager(self, player):
+        """Bet the flat amount, capped at the player's balance."""
+        return min(self.bet, player._balance)
+
+    def accept_donation(self, player):
+        """Take the bailout whenever rebuys are enabled."""
+        return self.rebuy
+
+    def hit(self, player, up_card):
+        """Hit while the hand is below the stand total."""
+        return player.hand.value < self.stand_on
+
+    def wager_batch(self, balances):
+        """Bet the flat amount at every seat, capped at its balance."""
+        return balances.clip(max=self.bet)
+
+    def hit_batch(self, values, soft, up_ranks):
+        """Hit every hand below the stand total."""
+        return values < self.stand_on
+
+
+class ConsoleStrategy(Strategy):
+    """Asks a human at the terminal for every decision"""
+
+    def __init__(self, output=None):
+        """Initialize the strategy with an optional event sink.
+
+        The sink is flushed before every prompt so the player sees the
+        table as it stands.
+        """
+        self.output = output
+
+    def _flush(self):
+        """Write out any narration queued before a prompt."""
+        if self.output is not None:
+            self.output.flush()
+
+    def wager(self, player):
+        """Prompt the player for a bet."""
+        self._flush()
+        player.wager()
+        return player.current_bet
+
+    def accept_donation(self, player):
+        """Ask the player whether to take the donor bailout."""
+        self._flush()
+        answer = input(
+            "Would you like $100 from an anonymous donor? (y/n): "
+        ).lower()
+        return answer == "y"
+
+    def hit(self, player, up_card):
+        """Ask the player whether to hit."""
+        self._flush()
+        return player.hit
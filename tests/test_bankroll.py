@@ -0,0 +1,102 @@
+"""Tests for vectorized bankroll paths and their outcome models"""
+
+import re
+from random import Random
+
+import numpy as np
+import pytest
+
+from bjgame.bankroll import BankrollSimulator, OutcomeModel, estimate_model
+from bjgame.counting import CardCounter
+from bjgame.engine import BlackJackEngine
+from bjgame.player import BlkJckPlayer
+from bjgame.shoe import Shoe
+from bjgame.strategy import FlatBetStrategy
+
+
+def test_sample_follows_the_weights():
+    """Independent draws come up at the tallied frequencies."""
+    model = OutcomeModel([-1, 0, 1], [0, 1], [[3, 0, 1], [0, 1, 1]])
+    rows, nets = model.sample(np.random.default_rng(4), 200000)
+    assert np.mean(rows == 0) == pytest.approx(4 / 6, abs=0.01)
+    assert np.mean(nets[rows == 0] == -1) == pytest.approx(0.75, abs=0.01)
+    # count 0 never pushes and count 1 never loses
+    assert not (nets[rows == 0] == 0).any()
+    assert not (nets[rows == 1] == -1).any()
+    assert np.mean(nets[rows == 1] == 1) == pytest.approx(0.5, abs=0.01)
+
+
+def test_sample_shoes_replays_whole_shoes_in_order():
+    """Every path plays through a recorded shoe before starting another."""
+    model = OutcomeModel(
+        [-1, 1], [0, 1], [[1, 0], [0, 1]], shoes=[[0, 0, 1], [1, 1]]
+    )
+    rng = np.random.default_rng(2)
+    positions = np.zeros(50, dtype=np.int64)
+    ends = np.zeros(50, dtype=np.int64)
+    seen = np.array(
+        [model.sample_shoes(rng, positions, ends)[0] for _ in range(30)]
+    ).T
+    for rows in seen:
+        text = "".join(map(str, rows))
+        # whole recorded shoes, then the start of one at most
+        assert re.fullmatch(r"(001|11)*(0|00|1)?", text)
+
+
+def test_losing_every_round_ruins_every_path():
+    """Ruin and drawdown are recorded on the round the money runs out."""
+    simulator = BankrollSimulator(
+        OutcomeModel.flat([-1], [1]), 10, paths=100, seed=1
+    )
+    report = simulator.run(15)
+    assert report.risk_of_ruin == 1
+    assert (simulator.ruined_at == 10).all()
+    assert report.drawdowns == (10,) * 4
+    assert report.doubled == 0 and np.isnan(report.median_rounds_to_double)
+    assert report.mean_final == 0
+
+
+def test_winning_every_round_doubles_every_path():
+    """Doubling is recorded once, on the round the balance doubles."""
+    simulator = BankrollSimulator(
+        OutcomeModel.flat([1], [1]), 10, unit=2, paths=100, seed=1
+    )
+    report = simulator.run(8)
+    assert report.doubled == 1
+    assert report.median_rounds_to_double == 5
+    assert report.risk_of_ruin == 0
+    assert report.mean_final == 26
+
+
+def test_ramp_bets_along_the_recorded_shoe():
+    """Counts follow the shoe, so the ramp's big bets land in order."""
+    # count 0 always loses and count 1 always wins
+    model = OutcomeModel(
+        [-1, 1], [0, 1], [[1, 0], [0, 1]], shoes=[[0, 0, 1, 1]]
+    )
+    simulator = BankrollSimulator(model, 100, ramp={1: 3}, paths=3, seed=5)
+    balances = []
+    for _ in range(8):
+        simulator.play_round()
+        balances.append(simulator.balances[0])
+    assert balances == [99, 98, 101, 104, 103, 102, 105, 108]
+    assert (simulator.balances == 108).all()
+    assert (simulator.drawdowns == 2).all()
+
+
+def test_estimate_model_records_every_round_by_shoe():
+    """The recorded shoes hold one count per round, in rounds played."""
+    shoe = Shoe(2, rng=Random(3))
+    shoe.attach_counter(CardCounter("hi-lo"))
+    engine = BlackJackEngine(shoe)
+    for seat in range(2):
+        engine.add_player(
+            BlkJckPlayer(f"Seat {seat + 1}", 10**6), FlatBetStrategy()
+        )
+    model = estimate_model(engine, 300)
+    lengths = model.shoe_ends - model.shoe_starts
+    assert lengths.sum() == 300
+    # a two-deck shoe holds a handful of rounds for two seats
+    assert len(lengths) > 10 and lengths.max() < 20
+    assert 0 <= model.shoe_rows.min() and model.shoe_rows.max() <= 12
+    assert model.count_cdf[-1] == pytest.approx(1)
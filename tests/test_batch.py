@@ -0,0 +1,12 @@
+"""Tests for the vectorized batch simulator"""
+
+from bjgame.batch import BatchSimulator
+
+
+def test_large_bets_settle_without_overflow():
+    """Bets beyond the int8 range settle at their full size."""
+    simulator = BatchSimulator(10, bet=200, seed=1)
+    result = simulator.run(50)
+    assert result.hands == 500
+    assert result.net % 200 == 0
+    assert result.net_sq == 200 * 200 * (result.wins + result.losses)
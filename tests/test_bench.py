@@ -0,0 +1,64 @@
+"""Tests for the benchmark suite and its baseline comparison"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from bjgame import bench
+
+SCRIPT = Path(__file__).resolve().parents[1] / "benchmark.py"
+
+
+def _report(**medians):
+    """Return a report holding only the given medians."""
+    return {
+        "benchmarks": {
+            name: {"median_ns": median} for name, median in medians.items()
+        }
+    }
+
+
+def test_compare_flags_slowdowns_beyond_the_threshold():
+    """Only benchmarks slower than the threshold count as regressions."""
+    rows, regressions = bench.compare(
+        _report(a=111.0, b=109.0, c=50.0, new=1.0),
+        _report(a=100.0, b=100.0, c=100.0),
+    )
+    assert regressions == ["a"]
+    assert [row[0] for row in rows] == ["a", "b", "c"]
+    assert rows[2][3] == pytest.approx(-0.5)
+
+
+def test_reports_round_trip_through_json(tmp_path):
+    """A saved report loads back unchanged."""
+    report = bench.run_suite(["hand_value"], repeat=2, warmup=0)
+    path = tmp_path / "bench.json"
+    bench.save_report(report, path)
+    assert bench.load_report(path) == report
+
+
+@pytest.mark.parametrize("median, code", [(1e-3, 1), (1e12, 0)])
+def test_script_exit_code_reports_regressions(tmp_path, median, code):
+    """benchmark.py exits 1 only when a benchmark regressed."""
+    baseline = tmp_path / "baseline.json"
+    bench.save_report(_report(hand_value=median), baseline)
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(SCRIPT),
+            "hand_value",
+            "-r",
+            "2",
+            "-w",
+            "0",
+            "-c",
+            str(baseline),
+        ],
+        cwd=SCRIPT.parent,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == code, result.stderr
+    assert ("regressions: hand_value" in result.stdout) == bool(code)
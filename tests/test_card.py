@@ -0,0 +1,105 @@
+"""Tests for cards and the incremental blackjack hand"""
+
+from random import Random
+
+from bjgame.card import (
+    CARD_VIEWS,
+    CODE_IS_ACE,
+    CODE_IS_TEN,
+    CODE_RANKS,
+    NUM_CODES,
+    Blackjackhand,
+    Card,
+)
+from bjgame.player import BlkJckPlayer
+
+
+def _rescan(codes):
+    """Return the best total and softness by summing the hand again."""
+    views = [CARD_VIEWS[code] for code in codes]
+    hard = sum(int(card) for card in views)
+    if any(card.is_Ace() for card in views) and hard <= 11:
+        return hard + 10, True
+    return hard, False
+
+
+def test_totals_match_a_rescan_after_every_card():
+    """The running total and softness always equal a full recount."""
+    rng = Random(2)
+    hand = Blackjackhand()
+    for _ in range(2000):
+        hand.clear()
+        codes = []
+        while hand.value <= 21:
+            code = rng.randrange(NUM_CODES)
+            hand.add_code(code)
+            codes.append(code)
+            assert (hand.value, hand.is_soft()) == _rescan(codes)
+            assert hand.has_ace() == any(code % 13 == 0 for code in codes)
+
+
+def test_soft_hand_hardens_when_an_ace_must_count_one():
+    """A soft total drops back to hard when 11 would bust."""
+    hand = Blackjackhand()
+    hand.add_code(0)  # Ace
+    hand.add_code(5)  # 6
+    assert (hand.value, hand.is_soft()) == (17, True)
+    hand.add_code(8)  # 9
+    assert (hand.value, hand.is_soft()) == (16, False)
+    hand.add_code(13)  # another Ace
+    assert (hand.value, hand.is_soft()) == (17, False)
+
+
+def test_two_aces_count_twelve():
+    """Only one Ace of several counts as eleven."""
+    hand = Blackjackhand()
+    hand.add_code(0)
+    hand.add_code(13)
+    assert (hand.value, hand.is_soft()) == (12, True)
+
+
+def test_blackjack_bust_and_clear():
+    """Two-card 21 is a natural, more than 21 busts, clear resets."""
+    hand = Blackjackhand()
+    hand.add_code(0)
+    hand.add_code(12)  # King
+    assert hand.is_natblackjack()
+    hand.add_code(9)  # 10: hard 21 over three cards
+    assert hand.value == 21 and not hand.is_natblackjack()
+    hand.add_code(1)
+    assert hand.is_bust()
+    hand.clear()
+    assert len(hand) == 0
+    assert (hand.value, hand.is_soft(), hand.has_ace()) == (0, False, False)
+
+
+def test_codes_and_views_round_trip():
+    """Every code maps to a Card view and back again."""
+    for code in range(NUM_CODES):
+        card = Card.from_code(code)
+        assert card.code == code
+        assert CODE_RANKS[code] == int(card)
+        assert CODE_IS_ACE[code] == card.is_Ace()
+        assert CODE_IS_TEN[code] == card.is_Ten()
+
+
+def test_players_take_cards_by_code():
+    """take_card adds a compact code and cards shows it as a view."""
+    player = BlkJckPlayer("Seat 1")
+    player.take_card(0)
+    player.take_card(22)
+    assert player.hand_value() == 21
+    assert player.hand.cards == (CARD_VIEWS[0], CARD_VIEWS[22])
+    assert isinstance(player.hand.cards, tuple)
+
+
+def test_card_views_add_like_their_codes():
+    """add_card and add_cards give the same hand as add_code."""
+    views = Blackjackhand()
+    views.add_card(CARD_VIEWS[3])
+    views.add_cards([CARD_VIEWS[13], CARD_VIEWS[51]])
+    codes = Blackjackhand()
+    for code in (3, 13, 51):
+        codes.add_code(code)
+    assert views.codes == codes.codes
+    assert (views.value, views.is_soft()) == (codes.value, codes.is_soft())
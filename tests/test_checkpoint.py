@@ -0,0 +1,102 @@
+"""Tests for checkpointing and resuming simulations"""
+
+from random import Random
+
+import pytest
+
+from bjgame.checkpoint import (
+    engine_state,
+    load_checkpoint,
+    run_resumable,
+    save_checkpoint,
+)
+from bjgame.counting import CardCounter
+from bjgame.engine import BlackJackEngine
+from bjgame.history import HandHistoryWriter
+from bjgame.ledger import Ledger
+from bjgame.player import BlkJckPlayer
+from bjgame.shoe import ContinuousShoe, Shoe
+from bjgame.stats import RoundStats
+from bjgame.strategy import FlatBetStrategy
+
+
+def _engine(shoe_type, seed):
+    """Return a counted engine with two seats and streaming stats."""
+    shoe = shoe_type(2, rng=Random(seed))
+    shoe.attach_counter(CardCounter())
+    engine = BlackJackEngine(shoe)
+    for seat in range(2):
+        engine.add_player(
+            BlkJckPlayer(f"Seat {seat + 1}", 1000), FlatBetStrategy(5)
+        )
+    engine.stats = RoundStats()
+    return engine
+
+
+def _state(engine, rounds=0):
+    """Return the engine's snapshot without the seats' random ids."""
+    state = engine_state(engine, rounds)
+    state["players"] = [seat[:1] + seat[2:] for seat in state["players"]]
+    return state
+
+
+@pytest.mark.parametrize("shoe_type", [Shoe, ContinuousShoe])
+def test_restored_engine_continues_identically(shoe_type, tmp_path):
+    """An engine restored mid-run plays on exactly like the original."""
+    path = str(tmp_path / "run.ckpt")
+    original = _engine(shoe_type, 1)
+    original.play_rounds(400)
+    save_checkpoint(path, original, 400)
+
+    restored = _engine(shoe_type, 2)
+    assert load_checkpoint(path, restored) == 400
+    assert _state(restored, 400) == _state(original, 400)
+    for _ in range(400):
+        assert restored.play_round() == original.play_round()
+    assert _state(restored) == _state(original)
+
+
+def test_resumable_run_matches_an_uninterrupted_one(tmp_path):
+    """A run stopped part way and resumed ends where a full run does."""
+    path = str(tmp_path / "run.ckpt")
+    first = _engine(Shoe, 3)
+    run_resumable(first, 250, path)
+    resumed = _engine(Shoe, 4)
+    stats = run_resumable(resumed, 600, path)
+
+    straight = _engine(Shoe, 3)
+    straight.play_rounds(600)
+    assert stats.rounds == 600
+    assert _state(resumed, 600) == _state(straight, 600)
+
+
+def test_ledger_follows_the_seats_into_the_restored_engine(tmp_path):
+    """The journal and each seat's account survive a checkpoint."""
+    path = str(tmp_path / "run.ckpt")
+    original = _engine(Shoe, 5)
+    original.ledger = Ledger()
+    original.play_rounds(300)
+    save_checkpoint(path, original, 300)
+
+    restored = _engine(Shoe, 6)
+    load_checkpoint(path, restored)
+    ledger = restored.ledger
+    ledger.check()
+    assert ledger.entries().tolist() == original.ledger.entries().tolist()
+    for player, twin in zip(restored.players, original.players):
+        assert ledger.account(player) == original.ledger.account(twin)
+    for _ in range(300):
+        assert restored.play_round() == original.play_round()
+    ledger.check()
+    assert ledger.balances == original.ledger.balances
+    assert len(ledger) == len(original.ledger)
+
+
+def test_engines_writing_histories_are_refused(tmp_path):
+    """A hand history cannot be rewound, so no snapshot is taken."""
+    engine = _engine(Shoe, 7)
+    with HandHistoryWriter(str(tmp_path / "hands.bjh")) as writer:
+        engine.history = writer
+        engine.play_rounds(5)
+        with pytest.raises(ValueError):
+            engine_state(engine)
@@ -0,0 +1,91 @@
+"""Tests for incremental card counting and count-based bets"""
+
+from random import Random
+
+import pytest
+
+from bjgame.card import NUM_CODES
+from bjgame.counting import SYSTEMS, CardCounter, CountBetStrategy
+from bjgame.engine import BlackJackEngine
+from bjgame.player import BlkJckPlayer
+from bjgame.shoe import ContinuousShoe, Shoe
+from bjgame.strategy import FlatBetStrategy
+
+
+def _rescan(shoe, counter):
+    """Return the running count by tagging every card out of the shoe."""
+    running = counter.initial_count(shoe.num_decks)
+    if isinstance(shoe, ContinuousShoe):
+        for code in range(NUM_CODES):
+            out = shoe.num_decks - shoe.count_of(code)
+            running += counter.code_tags[code] * out
+    else:
+        for code in shoe.cards[: shoe.cursor]:
+            running += counter.code_tags[code]
+    return running
+
+
+@pytest.mark.parametrize("shoe_type", [Shoe, ContinuousShoe])
+@pytest.mark.parametrize("system", sorted(SYSTEMS))
+def test_running_count_matches_a_rescan(shoe_type, system):
+    """The incremental count equals a recount after every round."""
+    shoe = shoe_type(2, rng=Random(6))
+    counter = CardCounter(system)
+    shoe.attach_counter(counter)
+    engine = BlackJackEngine(shoe)
+    for seat in range(3):
+        engine.add_player(
+            BlkJckPlayer(f"Seat {seat + 1}", 10**6), FlatBetStrategy()
+        )
+    for _ in range(400):
+        engine.play_round()
+        if not shoe.rebuild:
+            assert counter.running == _rescan(shoe, counter)
+
+
+def test_attaching_mid_shoe_counts_the_cards_already_dealt():
+    """A counter attached after dealing starts from a recount."""
+    shoe = Shoe(2, rng=Random(1))
+    shoe._build_shoe()
+    for _ in range(30):
+        shoe.draw()
+    counter = CardCounter("ko")
+    shoe.attach_counter(counter)
+    assert counter.running == _rescan(shoe, counter)
+
+
+def test_unbalanced_counts_start_below_the_pivot():
+    """KO starts a fresh shoe at minus four per extra deck."""
+    counter = CardCounter("ko")
+    assert not counter.is_balanced
+    assert counter.initial_count(6) == -20
+    assert CardCounter("hi-lo").initial_count(6) == 0
+
+
+class _FixedCount:
+    """Stands in for a counted shoe at a chosen true count"""
+
+    def __init__(self, true_count):
+        """Initialize with the true count to report."""
+        self.value = true_count
+
+    def true_count(self):
+        """Return the chosen true count."""
+        return self.value
+
+
+@pytest.mark.parametrize(
+    "true_count, bet",
+    [(-3.5, 10), (0.9, 10), (1.2, 10), (2.7, 20), (3, 40), (9.1, 80)],
+)
+def test_ramp_units_are_multiples_of_the_bet(true_count, bet):
+    """Ramp entries are units of bet; missing counts bet one unit."""
+    shoe = _FixedCount(true_count)
+    strategy = CountBetStrategy(shoe, {1: 1, 2: 2, 3: 4, 5: 8}, bet=10)
+    assert strategy.wager(BlkJckPlayer("Seat 1", 1000)) == bet
+
+
+def test_ramp_bets_are_capped_at_the_balance():
+    """A ramp bet never exceeds what the seat holds."""
+    strategy = CountBetStrategy(_FixedCount(4), {4: 8}, bet=10)
+    assert strategy.wager(BlkJckPlayer("Seat 1", 35)) == 35
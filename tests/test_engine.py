@@ -0,0 +1,129 @@
+"""Tests for the headless round engine"""
+
+from random import Random
+
+import pytest
+
+from bjgame.engine import BUST, DONATION, LOSE, PUSH, WIN, BlackJackEngine
+from bjgame.player import BlkJckPlayer
+from bjgame.shoe import Shoe
+from bjgame.strategy import FlatBetStrategy, Strategy
+
+
+def _engine(seats=3, balance=1000, bet=10, seed=1):
+    """Return an engine seating flat bettors over a seeded shoe."""
+    engine = BlackJackEngine(Shoe(2, rng=Random(seed)))
+    for seat in range(seats):
+        engine.add_player(
+            BlkJckPlayer(f"Seat {seat + 1}", balance), FlatBetStrategy(bet)
+        )
+    return engine
+
+
+class _Outcomes(BlackJackEngine):
+    """Engine that remembers every settled outcome"""
+
+    def __init__(self, shoe):
+        """Initialize with an empty outcome list."""
+        super().__init__(shoe)
+        self.outcomes = []
+
+    def on_settle(self, player, outcome, dealer_value):
+        """Keep the seat's outcome and the totals it was settled on."""
+        self.outcomes.append((outcome, player.hand.value, dealer_value))
+
+
+def test_rounds_run_without_console_io(monkeypatch, capsys):
+    """Bot seats play whole rounds without prompting or printing."""
+
+    def refuse(prompt=""):
+        """Fail on any prompt."""
+        raise AssertionError(f"the engine prompted: {prompt}")
+
+    monkeypatch.setattr("builtins.input", refuse)
+    engine = _engine()
+    engine.play_rounds(200)
+    assert capsys.readouterr() == ("", "")
+
+
+def test_balances_move_by_the_results():
+    """Each seat's balance changes by exactly its reported net."""
+    engine = _engine()
+    totals = engine.play_rounds(500)
+    for player, total in zip(engine.players, totals):
+        assert player._balance == 1000 + total
+    assert any(totals)
+
+
+def test_hands_and_bets_are_cleared_after_a_round():
+    """A round leaves no cards or bets behind."""
+    engine = _engine()
+    engine.play_round()
+    for player in engine.players + [engine.dealer]:
+        assert len(player.hand) == 0
+        assert player.current_bet == 0
+
+
+def test_outcomes_follow_the_totals():
+    """Every settlement agrees with the player's and dealer's totals."""
+    engine = _Outcomes(Shoe(2, rng=Random(4)))
+    engine.add_player(BlkJckPlayer("Seat 1", 10**6), FlatBetStrategy(1))
+    for _ in range(2000):
+        engine.play_round()
+    seen = set()
+    for outcome, player, dealer in engine.outcomes:
+        seen.add(outcome)
+        if player > 21:
+            assert outcome == BUST
+        elif dealer > 21 or player > dealer:
+            assert outcome == WIN
+        elif player < dealer:
+            assert outcome == LOSE
+        else:
+            assert outcome == PUSH
+    assert seen == {BUST, WIN, LOSE, PUSH}
+
+
+def test_broke_seat_takes_the_donation_or_sits_out():
+    """A broke seat bets again only if it accepts the bailout."""
+    engine = _engine(seats=2, balance=0)
+    engine.strategies[1] = FlatBetStrategy(10, rebuy=False)
+    results = engine.play_round()
+    assert results[1] is None
+    assert engine.players[1]._balance == 0
+    assert engine.players[0]._balance == DONATION + results[0]
+
+
+def test_sitting_out_deals_no_cards():
+    """A seat that bets nothing gets no cards and no result."""
+    engine = _engine(seats=2)
+    engine.strategies[0] = Strategy()
+    dealt = []
+    engine.on_card = lambda player, code: dealt.append(player)
+    results = engine.play_round()
+    assert results[0] is None
+    assert engine.players[0] not in dealt
+    assert dealt.count(engine.players[1]) == 2
+
+
+def test_oversized_bets_are_refused():
+    """A bet beyond the balance raises ValueError."""
+    engine = _engine(seats=1, balance=5)
+    with pytest.raises(ValueError):
+        engine.place_bet(engine.players[0], 10)
+
+
+def test_cut_card_flags_a_rebuild():
+    """The shoe is rebuilt after the round that passes the cut card."""
+    engine = _engine()
+    shoe = engine.shoe
+    engine.play_round()
+    rebuilt = 0
+    for _ in range(300):
+        passed = shoe.cursor > shoe.cut_index
+        assert shoe.rebuild == passed
+        engine.play_round()
+        if passed:
+            rebuilt += 1
+            assert shoe.cursor < shoe.cut_index
+    assert rebuilt > 5
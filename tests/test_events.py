@@ -0,0 +1,131 @@
+"""Tests for round events and the sinks that render them"""
+
+import io
+import json
+from random import Random
+
+from bjgame.engine import BlackJackEngine
+from bjgame.events import (
+    CARD,
+    SETTLE,
+    BufferedSink,
+    ConsoleRenderer,
+    EventBus,
+    EventEngine,
+    JsonLinesSink,
+)
+from bjgame.player import BlkJckPlayer
+from bjgame.shoe import Shoe
+from bjgame.strategy import FlatBetStrategy
+
+
+class _ListSink:
+    """Keeps every event it is given"""
+
+    def __init__(self):
+        """Initialize with no events."""
+        self.events = []
+
+    def emit(self, event):
+        """Keep an event."""
+        self.events.append(event)
+
+    def flush(self):
+        """Nothing to write."""
+
+    def close(self):
+        """Nothing to close."""
+
+
+class _CountingRenderer(BufferedSink):
+    """Renders one line per event and counts render calls"""
+
+    def __init__(self, stream, batch_size):
+        """Initialize with a zeroed render count."""
+        super().__init__(stream, batch_size)
+        self.renders = 0
+
+    def render(self, events):
+        """Return the event kinds, one per line."""
+        self.renders += 1
+        return "".join(f"{event.kind}\n" for event in events)
+
+
+def _seat(engine, seats=2):
+    """Seat flat bettors at an engine and return it."""
+    for seat in range(seats):
+        engine.add_player(
+            BlkJckPlayer(f"Seat {seat + 1}", 1000), FlatBetStrategy(10)
+        )
+    return engine
+
+
+def test_events_do_not_change_the_rounds():
+    """An event engine plays the same rounds as the plain engine."""
+    events = _seat(EventEngine(Shoe(2, rng=Random(1)), _ListSink()))
+    plain = _seat(BlackJackEngine(Shoe(2, rng=Random(1))))
+    for _ in range(200):
+        assert events.play_round() == plain.play_round()
+
+
+def test_settle_events_carry_each_result():
+    """Every settled bet emits its amount, outcome and new balance."""
+    sink = _ListSink()
+    engine = _seat(EventEngine(Shoe(2, rng=Random(3)), sink))
+    results = engine.play_round()
+    settled = [event for event in sink.events if event.kind == SETTLE]
+    assert [event.name for event in settled] == ["Seat 1", "Seat 2"]
+    for event, player, net in zip(settled, engine.players, results):
+        assert event.amount == 10
+        assert event.balance == player._balance == 1000 + net
+    cards = [event for event in sink.events if event.kind == CARD]
+    # two for each seat and the dealer's up card
+    assert len(cards) == 5
+
+
+def test_buffered_sinks_render_only_when_flushed():
+    """Events wait in the queue until a flush or a full batch."""
+    stream = io.StringIO()
+    sink = _CountingRenderer(stream, batch_size=1000)
+    engine = _seat(EventEngine(Shoe(2, rng=Random(2)), sink))
+    engine.play_rounds(5)
+    assert (sink.renders, stream.getvalue()) == (0, "")
+    queued = len(sink.pending)
+    sink.flush()
+    assert sink.renders == 1
+    assert stream.getvalue().count("\n") == queued
+
+    small = _CountingRenderer(io.StringIO(), batch_size=4)
+    engine.sink = small
+    engine.play_round()
+    assert small.renders >= 2 and len(small.pending) < 4
+
+
+def test_console_renderer_narrates_the_round():
+    """The console narration names every seat and its result."""
+    stream = io.StringIO()
+    renderer = ConsoleRenderer(stream)
+    engine = _seat(EventEngine(Shoe(2, rng=Random(4)), renderer))
+    engine.play_round()
+    engine.sink.flush()
+    text = stream.getvalue()
+    assert "PLACING BETS" in text and "RESULTS" in text
+    for player in engine.players:
+        assert f"{player._name}'s new balance: ${player._balance:.2f}" in text
+
+
+def test_bus_feeds_every_sink_and_json_lines_parse(tmp_path):
+    """A bus copies events to each sink; JSON lines hold plain values."""
+    path = tmp_path / "events.jsonl"
+    kept = _ListSink()
+    json_sink = JsonLinesSink(str(path))
+    bus = EventBus(kept, json_sink)
+    engine = _seat(EventEngine(Shoe(2, rng=Random(6)), bus))
+    engine.play_rounds(3)
+    engine.sink.close()
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["kind"] for record in records] == [
+        event.kind for event in kept.events
+    ]
+    fields = set(kept.events[0]._fields)
+    assert all(set(record) <= fields for record in records)
@@ -0,0 +1,47 @@
+"""Tests for the process-pool simulation farm"""
+
+from bjgame.farm import (
+    merge_shards,
+    play_shard,
+    run_simulation,
+    shard_rounds,
+    worker_rng,
+)
+
+
+def _totals(report):
+    """Return a report's fields without its RoundStats."""
+    return report[:-1]
+
+
+def test_shard_rounds_split_evenly():
+    """Round counts split into shares differing by at most one."""
+    assert shard_rounds(10, 3) == [4, 3, 3]
+    assert shard_rounds(2, 4) == [1, 1, 0, 0]
+    assert sum(shard_rounds(1001, 7)) == 1001
+
+
+def test_workers_get_independent_reproducible_streams():
+    """A worker's stream depends only on the seed and worker number."""
+    first = [worker_rng(3, worker).random() for worker in range(4)]
+    again = [worker_rng(3, worker).random() for worker in range(4)]
+    assert first == again
+    assert len(set(first)) == 4
+    assert worker_rng(4, 0).random() != first[0]
+
+
+def test_pool_runs_are_reproducible():
+    """The same seed and worker count give identical reports."""
+    first = run_simulation(2000, workers=2, seed=5, seats=2)
+    again = run_simulation(2000, workers=2, seed=5, seats=2)
+    assert _totals(first) == _totals(again)
+    assert first.rounds == 2000
+    assert first.hands == first.wins + first.losses + first.pushes
+    assert first.ci_low < first.ev < first.ci_high
+
+
+def test_pool_results_match_the_shards_played_in_process():
+    """A pool run merges exactly the shards each worker would play."""
+    report = run_simulation(1500, workers=3, seed=8)
+    shards = [play_shard(8, worker, 500) for worker in range(3)]
+    assert _totals(report) == _totals(merge_shards(shards))
@@ -0,0 +1,83 @@
+"""Tests for the binary hand history log"""
+
+from random import Random
+
+from bjgame.card import CODE_RANKS
+from bjgame.engine import BlackJackEngine
+from bjgame.history import (
+    MAX_CARDS,
+    NO_BET,
+    NO_CARD,
+    RECORD_DTYPE,
+    HandHistoryWriter,
+    read_history,
+)
+from bjgame.player import BlkJckPlayer
+from bjgame.replay import RecordedShoe
+from bjgame.shoe import Shoe
+from bjgame.strategy import FlatBetStrategy
+
+ACE = CODE_RANKS.index(1)
+TWO = CODE_RANKS.index(2)
+TEN = CODE_RANKS.index(10)
+SEVEN = CODE_RANKS.index(7)
+
+
+def test_longest_hand_round_trips(tmp_path):
+    """A hand of MAX_CARDS cards is logged without spilling over."""
+    # two Aces, eight more to a hard 10, a two, then Aces to 21
+    hand = [ACE, ACE] + [ACE] * 8 + [TWO] + [ACE] * 9
+    assert len(hand) == MAX_CARDS
+    shoe = RecordedShoe()
+    shoe.load([hand[0], TEN, hand[1], SEVEN] + hand[2:])
+    engine = BlackJackEngine(shoe)
+    engine.add_player(BlkJckPlayer("Seat 1", 100), FlatBetStrategy(10, 22))
+
+    path = tmp_path / "history.bin"
+    with HandHistoryWriter(str(path)) as writer:
+        engine.history = writer
+        engine.play_round()
+
+    record = read_history(str(path))[0]
+    assert record["card_count"][0] == MAX_CARDS
+    assert record["cards"][0].tolist() == hand
+    assert record["hits"][0] == MAX_CARDS - 2
+    assert record["dealer_cards"][:2].tolist() == [TEN, SEVEN]
+    assert record["card_count"][1] == 0
+
+
+def test_rounds_round_trip_and_a_torn_tail_is_dropped(tmp_path):
+    """Logged rounds read back intact; a half-written record is ignored."""
+    engine = BlackJackEngine(Shoe(2, rng=Random(3)))
+    engine.add_player(BlkJckPlayer("Seat 1", 1000), FlatBetStrategy(5))
+    engine.add_player(BlkJckPlayer("Seat 2", 1000), FlatBetStrategy(0))
+    path = str(tmp_path / "history.bin")
+    expected = []
+    with HandHistoryWriter(path) as writer:
+        engine.history = writer
+        for _ in range(50):
+            net = engine.play_round()[0]
+            expected.append((net, engine.players[0]._balance))
+
+    with open(path, "ab") as f:
+        f.write(b"\x01" * (RECORD_DTYPE.itemsize // 2))
+    records = read_history(path)
+    assert len(records) == 50
+    assert records["round"].tolist() == list(range(50))
+    assert records["outcome"][:, 1].tolist() == [NO_BET] * 50
+    assert list(zip(records["net"][:, 0], records["balance"][:, 0])) == (
+        expected
+    )
+    assert (records["bet"][:, 0] == 5).all()
+    for record in records:
+        count = record["card_count"][0]
+        assert count >= 2 and record["hits"][0] == count - 2
+        assert (record["cards"][0][count:] == NO_CARD).all()
+    del records, record
+
+    with HandHistoryWriter(path) as writer:
+        assert writer.rounds == 50
+        engine.history = writer
+        engine.play_round()
+    records = read_history(path)
+    assert len(records) == 51 and records["round"][-1] == 50
@@ -0,0 +1,91 @@
+"""Tests for the integer-cents settlement ledger"""
+
+import random
+
+import pytest
+
+from bjgame.engine import BlackJackEngine
+from bjgame.ledger import CASHIER, DONATE, HOUSE, Ledger
+from bjgame.player import BlkJckPlayer
+from bjgame.shoe import Shoe
+from bjgame.strategy import FlatBetStrategy
+
+
+def _engine(ledger, bet=0.1, bankroll=5):
+    """Return an engine with three seats settling through the ledger."""
+    engine = BlackJackEngine(Shoe(8, rng=random.Random(5)))
+    for seat in range(3):
+        engine.add_player(
+            BlkJckPlayer(f"Seat {seat + 1}", bankroll), FlatBetStrategy(bet)
+        )
+    engine.ledger = ledger
+    return engine
+
+
+def test_settled_rounds_balance_against_the_journal():
+    """Cached balances match a rebuild and every batch sums to zero."""
+    ledger = Ledger()
+    engine = _engine(ledger)
+    engine.play_rounds(3000)
+    ledger.check()
+
+    entries = ledger.entries()
+    assert entries["amount"].sum() == 0
+    for player in engine.players:
+        cents = ledger.balance(ledger.account(player))
+        assert player._balance == cents / 100
+    # the seats' opening balances came from the cashier
+    assert ledger.balance(CASHIER) == -3 * 500
+
+
+def test_broke_seats_are_topped_up_from_the_house():
+    """Donations post against the house and keep the books balanced."""
+    ledger = Ledger()
+    engine = _engine(ledger, bet=5, bankroll=5)
+    engine.play_rounds(200)
+    ledger.check()
+    assert (ledger.entries()["kind"] == DONATE).any()
+
+
+def test_check_finds_a_corrupted_cache():
+    """A cached balance that no longer matches the journal is caught."""
+    ledger = Ledger()
+    engine = _engine(ledger)
+    engine.play_rounds(10)
+    ledger.balances[HOUSE] += 1
+    with pytest.raises(ValueError):
+        ledger.check()
+
+
+def test_compact_keeps_open_balances_and_drops_closed_accounts():
+    """Compacting folds the journal without changing any open balance."""
+    ledger = Ledger()
+    engine = _engine(ledger)
+    engine.play_rounds(500)
+    leaving = engine.players.pop()
+    engine.strategies.pop()
+    ledger.close_account(leaving)
+    before = [p._balance for p in engine.players]
+    house = ledger.balance(HOUSE)
+
+    ledger.compact()
+    ledger.check()
+    assert len(ledger) <= len(engine.players) + 2
+    assert len(ledger.names) == len(engine.players) + 2
+    assert ledger.balance(HOUSE) == house
+    assert [
+        ledger.balance(ledger.account(p)) / 100 for p in engine.players
+    ] == before
+
+    engine.play_rounds(100)
+    ledger.check()
+
+
+def test_sub_cent_bets_are_refused():
+    """A ledger-backed engine will not round a bet the player made."""
+    engine = _engine(Ledger())
+    player = engine.players[0]
+    with pytest.raises(ValueError):
+        engine.place_bet(player, 1.005)
+    engine.place_bet(player, 1.05)
+    assert player.current_bet == 1.05
@@ -0,0 +1,76 @@
+"""Tests for per-phase round timings and counters"""
+
+import json
+from random import Random
+
+from bjgame.engine import BlackJackEngine
+from bjgame.metrics import PHASES, RoundMetrics
+from bjgame.player import BlkJckPlayer
+from bjgame.shoe import Shoe
+from bjgame.strategy import FlatBetStrategy
+
+
+def _engine(seed=2):
+    """Return an engine seating two flat bettors over a seeded shoe."""
+    engine = BlackJackEngine(Shoe(2, rng=Random(seed)))
+    for seat in range(2):
+        engine.add_player(
+            BlkJckPlayer(f"Seat {seat + 1}", 10**6), FlatBetStrategy()
+        )
+    return engine
+
+
+def test_timing_does_not_change_the_rounds():
+    """A timed engine plays exactly the rounds an untimed one does."""
+    timed, plain = _engine(), _engine()
+    timed.metrics = RoundMetrics()
+    for _ in range(300):
+        assert timed.play_round() == plain.play_round()
+
+
+class _Tally:
+    """Recorder counting what RoundMetrics should count"""
+
+    def __init__(self):
+        """Initialize zeroed tallies."""
+        self.hands = self.busts = self.pushes = self.cards = 0
+
+    def record(self, engine, results):
+        """Tally a settled round from its hands."""
+        self.cards += len(engine.dealer.hand)
+        for player, net in zip(engine.players, results):
+            self.hands += 1
+            self.cards += len(player.hand)
+            self.busts += player.hand.value > 21
+            self.pushes += player.hand.value <= 21 and net == 0
+
+
+def test_counters_follow_the_rounds_played():
+    """Every round adds one timing per phase and its cards and outcomes."""
+    engine = _engine()
+    metrics = engine.metrics = RoundMetrics()
+    tally = _Tally()
+    engine.recorders.append(tally)
+    engine.play_rounds(500)
+    snapshot = metrics.snapshot()
+    assert snapshot["rounds"] == 500
+    assert snapshot["hands"] == tally.hands == 1000
+    assert snapshot["busts"] == tally.busts
+    assert snapshot["pushes"] == tally.pushes
+    assert snapshot["cards_dealt"] == tally.cards
+    assert snapshot["shoe_rebuilds"] > 1
+    assert list(snapshot["phases"]) == list(PHASES)
+    for phase in snapshot["phases"].values():
+        assert 0 < phase["max_ns"] <= phase["total_ns"]
+    assert snapshot["total_ns"] == sum(metrics.phase_ns)
+
+
+def test_dump_writes_a_json_snapshot(tmp_path):
+    """dump replaces the metrics file with the current snapshot."""
+    path = tmp_path / "metrics.json"
+    engine = _engine()
+    engine.metrics = RoundMetrics(str(path), interval=3600)
+    engine.play_rounds(10)
+    engine.metrics.dump()
+    assert json.loads(path.read_text()) == engine.metrics.snapshot()
+    assert not (tmp_path / "metrics.json.tmp").exists()
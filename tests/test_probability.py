@@ -0,0 +1,68 @@
+"""Tests for exact dealer probabilities"""
+
+import pytest
+
+from bjgame.engine import BlackJackEngine
+from bjgame.player import BlkJckPlayer
+from bjgame.probability import (
+    BLACKJACK,
+    BUST,
+    dealer_distribution,
+    full_composition,
+    remove_card,
+)
+from bjgame.replay import RecordedShoe
+
+
+def _engine_distribution(up, counts):
+    """Enumerate every deal the engine's own dealer_turn can play out.
+
+    Each path loads a RecordedShoe with just the cards drawn so far; when
+    the dealer asks for one more, the path splits by rank, weighted by
+    the cards left.  Rank indices double as the codes of the first
+    suit's cards.
+    """
+    engine = BlackJackEngine(RecordedShoe(1))
+    seat = BlkJckPlayer("Seat 1", 10)
+    seat.current_bet = 1
+    seat.hand.add_code(0)
+    engine.players = [seat]
+    hand = engine.dealer.hand
+    dist = [0.0] * 7
+
+    def walk(ranks, p, counts):
+        """Play the dealer on the hole card and draws in ranks."""
+        if ranks:
+            hand.clear()
+            hand.add_code(up)
+            hand.add_code(ranks[0])
+            engine.shoe.load(ranks[1:])
+            try:
+                engine.dealer_turn()
+            except ValueError:
+                pass
+            else:
+                if hand.is_natblackjack():
+                    dist[BLACKJACK] += p
+                elif hand.value > 21:
+                    dist[BUST] += p
+                else:
+                    dist[hand.value - 17] += p
+                return
+        remaining = sum(counts)
+        for rank, count in enumerate(counts):
+            if count:
+                rest = remove_card(counts, rank)
+                walk(ranks + [rank], p * count / remaining, rest)
+
+    walk([], 1.0, counts)
+    return dist
+
+
+@pytest.mark.parametrize("up", range(10))
+def test_dealer_distribution_matches_the_engine(up):
+    """The exact distribution matches the engine's dealer, deal by deal."""
+    counts = remove_card(full_composition(1), up)
+    dist = dealer_distribution(up, counts)
+    assert sum(dist) == pytest.approx(1.0)
+    assert dist == pytest.approx(_engine_distribution(up, counts))
@@ -0,0 +1,106 @@
+"""Tests for replaying logged rounds through the engine"""
+
+import random
+
+import numpy as np
+
+from bjgame.engine import BlackJackEngine
+from bjgame.history import HandHistoryWriter, read_history
+from bjgame.player import BlkJckPlayer
+from bjgame.replay import ReplayEngine, replay_history
+from bjgame.shoe import Shoe
+from bjgame.strategy import FlatBetStrategy
+
+
+class _MixedStrategy(FlatBetStrategy):
+    """Varies bets and stand totals so the log covers many decisions."""
+
+    def __init__(self, rng):
+        """Initialize with the Random that picks each decision."""
+        super().__init__()
+        self.rng = rng
+
+    def wager(self, player):
+        """Bet a random amount, sometimes sitting out."""
+        return min(self.rng.choice([0, 5, 10, 25]), player._balance)
+
+    def hit(self, player, up_card):
+        """Hit below a randomly chosen total."""
+        return player.hand.value < self.rng.choice([12, 15, 17])
+
+
+class _Balances:
+    """Keeps each settled seat's balance after every round"""
+
+    def __init__(self):
+        """Initialize with no rounds seen."""
+        self.rounds = []
+
+    def record(self, engine, results):
+        """Keep the balances of the seats that bet this round."""
+        self.rounds.append(
+            [
+                None if net is None else player._balance
+                for player, net in zip(engine.players, results)
+            ]
+        )
+
+
+def _log_rounds(path, rounds=2000, recorder=None):
+    """Play and log rounds with three seats and return the records."""
+    rng = random.Random(11)
+    engine = BlackJackEngine(Shoe(2, rng=random.Random(4)))
+    for seat in range(3):
+        engine.add_player(BlkJckPlayer(f"P{seat}", 60), _MixedStrategy(rng))
+    if recorder is not None:
+        engine.recorders.append(recorder)
+    with HandHistoryWriter(str(path)) as writer:
+        engine.history = writer
+        engine.play_rounds(rounds)
+    return read_history(str(path))
+
+
+def test_logged_rounds_replay_without_divergence(tmp_path):
+    """Replaying an untouched log reproduces every round."""
+    records = _log_rounds(tmp_path / "history.bin")
+    report = replay_history(records)
+    assert report.rounds == len(records)
+    assert report.hands > 0
+    assert report.divergences == []
+
+
+def test_replayed_balances_follow_the_played_ones_exactly(tmp_path):
+    """Every settled balance, bailouts included, comes out the same."""
+    played = _Balances()
+    records = _log_rounds(tmp_path / "history.bin", recorder=played)
+    replayed = _Balances()
+    engine = ReplayEngine(3)
+    engine.recorders.append(replayed)
+    assert replay_history(records, engine).divergences == []
+    assert replayed.rounds == played.rounds
+    # seats of 60 betting up to 25 go broke and take the $100 bailout,
+    # the only way a balance climbs more than one bet between rounds
+    jumps = 0
+    for seat in range(3):
+        balances = [row[seat] for row in played.rounds]
+        balances = [b for b in balances if b is not None]
+        jumps += sum(b - a > 25 for a, b in zip(balances, balances[1:]))
+    assert jumps > 0
+
+
+def test_tampered_fields_are_reported(tmp_path):
+    """Changed nets, balances and hits each surface as divergences."""
+    records = np.array(_log_rounds(tmp_path / "history.bin"))
+    betting = np.flatnonzero(records["outcome"][:, 0])
+    net_round, balance_round, hit_round = betting[[10, 20, 30]]
+    records["net"][net_round, 0] += 1
+    records["balance"][balance_round, 0] += 1
+    records["hits"][hit_round, 0] += 1
+
+    found = {
+        (d.round, d.field) for d in replay_history(records).divergences
+    }
+    assert (net_round, "net") in found
+    assert (balance_round, "balance") in found
+    assert (hit_round, "shoe") in found
+    assert not any(field == "balance" for r, field in found if r > hit_round)
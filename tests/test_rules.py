@@ -0,0 +1,229 @@
+"""Tests for rule sets compiled into specialized round functions"""
+
+from random import Random
+
+import pytest
+
+from bjgame.engine import BlackJackEngine
+from bjgame.player import BlkJckPlayer
+from bjgame.replay import RecordedShoe
+from bjgame.rules import (
+    DOUBLE,
+    HIT,
+    LEGACY,
+    SPLIT,
+    STAND,
+    SURRENDER,
+    RuleEngine,
+    Rules,
+    StandOnDecider,
+    house_edge,
+)
+from bjgame.shoe import ContinuousShoe, Shoe
+from bjgame.strategy import FlatBetStrategy
+
+
+@pytest.mark.parametrize("shoe_type", [Shoe, ContinuousShoe])
+@pytest.mark.parametrize("seats", [1, 3])
+def test_legacy_rules_match_the_engine_round_for_round(shoe_type, seats):
+    """The compiled LEGACY round settles every round like the engine."""
+    engine = BlackJackEngine(shoe_type(2, rng=Random(9)))
+    for seat in range(seats):
+        engine.add_player(
+            BlkJckPlayer(f"Seat {seat + 1}", 10**9), FlatBetStrategy()
+        )
+    compiled = RuleEngine(
+        LEGACY,
+        seats=seats,
+        decider=StandOnDecider(17),
+        shoe=shoe_type(2, rng=Random(9)),
+    )
+    for _ in range(3000):
+        assert compiled.play_round() == engine.play_round()
+
+
+# rules with every option off, for tests to switch single ones on
+PLAIN = Rules(
+    hit_soft_17=False,
+    blackjack_pays=None,
+    double=None,
+    double_after_split=False,
+    split_hands=1,
+    surrender=False,
+)
+
+
+class _Script:
+    """Decides from a list of (action, fallback) pairs, then stands"""
+
+    def __init__(self, *actions):
+        """Initialize with the decisions to make in order."""
+        self.actions = list(actions)
+        self.calls = []
+
+    def decide(self, total, soft, pair, up, allowed):
+        """Take the next action, or its fallback if it is not allowed."""
+        self.calls.append((total, soft, pair, up, allowed))
+        if not self.actions:
+            return STAND
+        action, fallback = self.actions.pop(0)
+        return action if allowed & (1 << action) else fallback
+
+
+def _play(rules, values, *actions, seats=1):
+    """Play one round off a stacked shoe of card values.
+
+    Values are dealt in order, an Ace as 1, and every one of them must
+    be used.  Returns the results and the decider's calls.
+    """
+    shoe = RecordedShoe()
+    # the first suit's codes are the values less one
+    shoe.load([value - 1 for value in values])
+    decider = _Script(*actions)
+    engine = RuleEngine(rules, seats, decider=decider, shoe=shoe)
+    results = engine.play_round()
+    assert shoe.cursor == len(shoe.cards)
+    return results, decider.calls
+
+
+def _allows(call, action):
+    """Check whether a decision allowed an action."""
+    return bool(call[4] & (1 << action))
+
+
+def test_split_hands_double_after_splitting():
+    """A split pair plays two hands, and DAS lets the first double."""
+    rules = PLAIN._replace(
+        split_hands=4, double="any", double_after_split=True
+    )
+    # 8,8 against a dealer 16; 8,3 doubles onto a ten, 8,9 stands
+    results, calls = _play(
+        rules,
+        [8, 6, 8, 10, 3, 10, 9, 10],
+        (SPLIT, STAND),
+        (DOUBLE, HIT),
+    )
+    assert results == [3]
+    assert calls[0][:4] == (16, False, 8, 6)
+    assert _allows(calls[0], SPLIT) and _allows(calls[1], DOUBLE)
+
+
+def test_no_double_after_split():
+    """Without DAS only the unsplit hand may double."""
+    rules = PLAIN._replace(split_hands=4, double="any")
+    results, calls = _play(
+        rules,
+        [8, 6, 8, 10, 3, 10, 9, 10],
+        (SPLIT, STAND),
+        (DOUBLE, HIT),
+    )
+    # the 11 hits to 21 instead of doubling
+    assert results == [2]
+    assert _allows(calls[0], DOUBLE) and not _allows(calls[1], DOUBLE)
+
+
+def test_split_hands_cap_resplits():
+    """A pair cannot split into more than split_hands hands."""
+    rules = PLAIN._replace(split_hands=2)
+    results, calls = _play(
+        rules,
+        [8, 6, 8, 10, 8, 2, 5],
+        (SPLIT, STAND),
+        (SPLIT, STAND),
+    )
+    assert results == [-2]
+    assert calls[1][2] == 8 and not _allows(calls[1], SPLIT)
+
+
+def test_split_aces_take_one_card_each():
+    """Each split Ace gets one card and no decision."""
+    rules = PLAIN._replace(split_hands=4)
+    results, calls = _play(rules, [1, 9, 1, 8, 10, 5], (SPLIT, STAND))
+    # 21 beats the dealer's 17 and soft 16 loses to it
+    assert results == [0]
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    "double, allowed",
+    [
+        (None, [False] * 4),
+        ("any", [True] * 4),
+        ("9-11", [False, True, True, False]),
+        ("10-11", [False, False, True, False]),
+    ],
+)
+def test_double_rules_allow_their_totals(double, allowed):
+    """Doubling is offered only on the totals the rule names."""
+    # seats on 8, 9, 11 and 12 stand against a dealer 15 that busts
+    results, calls = _play(
+        PLAIN._replace(double=double),
+        [6, 5, 7, 10, 5, 2, 4, 4, 2, 10, 10],
+        seats=4,
+    )
+    assert results == [1] * 4
+    assert [call[0] for call in calls] == [8, 9, 11, 12]
+    assert [_allows(call, DOUBLE) for call in calls] == allowed
+
+
+def test_late_surrender_returns_half_the_bet():
+    """Surrender loses half the bet without the dealer drawing."""
+    rules = PLAIN._replace(surrender=True, blackjack_pays=1.5)
+    results, calls = _play(rules, [10, 10, 6, 7], (SURRENDER, HIT))
+    assert results == [-0.5]
+    assert _allows(calls[0], SURRENDER)
+
+
+def test_dealer_natural_takes_the_bet_before_surrender():
+    """A peeked dealer natural settles before any decision."""
+    rules = PLAIN._replace(surrender=True, blackjack_pays=1.5)
+    results, calls = _play(rules, [10, 1, 6, 10], (SURRENDER, HIT))
+    assert results == [-1]
+    assert calls == []
+
+
+@pytest.mark.parametrize("pays", [1.5, 1.2])
+def test_naturals_pay_the_rule_payout(pays):
+    """A natural pays blackjack_pays and pushes a dealer natural."""
+    rules = PLAIN._replace(blackjack_pays=pays)
+    assert _play(rules, [1, 9, 10, 7])[0] == [pays]
+    assert _play(rules, [1, 1, 10, 10])[0] == [0]
+
+
+def test_without_naturals_21_is_an_ordinary_total():
+    """With no payout a two-card 21 wins even money and pushes a 21."""
+    assert _play(PLAIN, [1, 10, 10, 7])[0] == [1]
+    # a three-card 21 pushes the dealer's two-card one
+    assert _play(PLAIN, [10, 1, 9, 10, 2], (HIT, HIT))[0] == [0]
+
+
+@pytest.mark.parametrize(
+    "rules, dealer, result",
+    [
+        # dealer A,2 draws a 4 to soft 17
+        (PLAIN, [2, 4], 1),
+        (PLAIN._replace(hit_soft_17=True), [2, 4, 2], -1),
+        (LEGACY, [2, 4], 1),
+        # dealer A,6 is a two-card soft 17
+        (PLAIN, [6], 1),
+        (PLAIN._replace(hit_soft_17=True), [6, 2], -1),
+        (LEGACY, [6, 2], -1),
+    ],
+)
+def test_dealer_soft_17_rules(rules, dealer, result):
+    """S17 stands, H17 hits every soft 17, LEGACY only the first two."""
+    # the player stands on 18 against an Ace up
+    values = [10, 1, 8] + dealer
+    assert _play(rules, values)[0] == [result]
+
+
+def test_house_edge_is_sane_and_6_to_5_costs_more():
+    """Basic strategy nears a fair game and 6:5 pays the house more."""
+    rules = Rules()
+    edge = house_edge(rules, 100000, rng=Random(1))
+    worse = house_edge(
+        rules._replace(blackjack_pays=1.2), 100000, rng=Random(1)
+    )
+    assert -0.01 < edge < 0.025
+    # the same cards fall, so only the naturals' payout differs
+    assert 0.01 < worse - edge < 0.02
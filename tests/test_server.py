@@ -0,0 +1,71 @@
+"""Tests for the multi-table server's line protocol"""
+
+import asyncio
+
+from bjgame.ledger import CASHIER, CLOSE, HOUSE
+from bjgame.server import BlackJackServer
+
+
+async def _prompt(reader, prefix):
+    """Read lines until one starts with prefix and return it."""
+    while True:
+        line = (await reader.readline()).decode()
+        assert line, f"connection closed waiting for {prefix}"
+        if line.startswith(prefix):
+            return line
+
+
+async def _play_nan_bet():
+    """Bet NaN, then a real bet, and play the hand out."""
+    server = BlackJackServer(port=0, decision_timeout=5)
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"JOIN t1 alice\n")
+        await _prompt(reader, "BET?")
+        writer.write(b"BET nan\n")
+        assert (await _prompt(reader, "ERROR")).startswith("ERROR invalid")
+        await _prompt(reader, "BET?")
+        writer.write(b"BET 10\n")
+        line = await _prompt(reader, ("ACTION?", "RESULT"))
+        if line.startswith("ACTION?"):
+            writer.write(b"STAND\n")
+            line = await _prompt(reader, "RESULT")
+        await _prompt(reader, "BET?")
+        writer.write(b"QUIT\n")
+        writer.close()
+        return line
+
+
+def test_non_finite_bet_is_refused_and_reprompted():
+    """A NaN bet gets an error and a new prompt, and the table plays on."""
+    line = asyncio.run(asyncio.wait_for(_play_nan_bet(), 10))
+    assert line.split()[1] == "alice"
+
+
+async def _drop_mid_hand():
+    """Bet, leave without a word once the cards are out, and wait."""
+    server = BlackJackServer(port=0, decision_timeout=5)
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"JOIN t1 bob\n")
+        await _prompt(reader, "BET?")
+        writer.write(b"BET 10\n")
+        await _prompt(reader, "CARD bob")
+        writer.close()
+        while server.tables:
+            await asyncio.sleep(0.01)
+    return server.ledger
+
+
+def test_dropped_client_settles_and_closes_its_account():
+    """A client gone mid-hand is settled, paid out and the books balance."""
+    ledger = asyncio.run(asyncio.wait_for(_drop_mid_hand(), 10))
+    ledger.check()
+    assert ledger.accounts == {}
+    assert ledger.balance(HOUSE) + ledger.balance(CASHIER) == 0
+    assert ledger.balance(HOUSE) in (-1000, 0, 1000)
+    assert ledger.entries()["kind"].tolist().count(CLOSE) == 2
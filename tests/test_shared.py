@@ -0,0 +1,111 @@
+"""Tests for outcome tables striped across shared memory"""
+
+import numpy as np
+import pytest
+
+from bjgame.card import CODE_RANKS, Blackjackhand
+from bjgame.farm import shard_engine
+from bjgame.shared import (
+    BUST,
+    HIT,
+    LOSE,
+    PUSH,
+    SHAPE,
+    STAND,
+    WIN,
+    SharedTables,
+    TableRecorder,
+    decision_ev,
+    play_table_shard,
+    run_tables,
+)
+
+
+class _Reference:
+    """Counts decisions into a plain array by replaying every hand"""
+
+    def __init__(self):
+        """Initialize with zeroed counts."""
+        self.counts = np.zeros(SHAPE, dtype=np.int64)
+
+    def record(self, engine, results):
+        """Count each settled hand's decisions, one card at a time."""
+        up = CODE_RANKS[engine.dealer.hand.codes[0]]
+        for player, net in zip(engine.players, results):
+            if net is None:
+                continue
+            codes = player.hand.codes
+            if player.hand.value > 21:
+                result = BUST
+            else:
+                result = WIN if net > 0 else LOSE if net < 0 else PUSH
+            hand = Blackjackhand()
+            hand.add_code(codes[0])
+            for k, code in enumerate(codes[1:], 1):
+                hand.add_code(code)
+                if hand.value >= 21:
+                    break
+                decision = HIT if k < len(codes) - 1 else STAND
+                self.counts[
+                    up, hand.value, int(hand.is_soft()), decision, result
+                ] += 1
+
+
+@pytest.fixture
+def tables():
+    """Yield a fresh two-worker block and free it afterwards."""
+    tables = SharedTables(2)
+    yield tables
+    tables.close()
+    tables.unlink()
+
+
+def test_recorder_counts_every_decision(tables):
+    """The striped counts match a hand-by-hand replay of the rounds."""
+    engine = shard_engine(1, 0, seats=3)
+    reference = _Reference()
+    recorder = TableRecorder(tables.name, 1)
+    engine.recorders += [recorder, reference]
+    engine.play_rounds(2000)
+    recorder.close()
+    assert (tables.stripes[0] == 0).all()
+    assert (tables.stripes[1] == reference.counts).all()
+    assert reference.counts[..., STAND, :].sum() > 0
+    assert reference.counts[..., HIT, :].sum() > 0
+
+
+def test_stripes_sum_into_the_totals(tables):
+    """Each worker writes only its stripe and totals add them up."""
+    for worker in range(2):
+        play_table_shard(tables.name, 4, worker, 500)
+    one = tables.stripes[0].copy()
+    two = tables.stripes[1].copy()
+    assert not (one == two).all()
+    assert (tables.totals() == one + two).all()
+
+    # a second process attaching by name sees the same counts
+    reader = SharedTables(2, tables.name)
+    assert (reader.totals() == one + two).all()
+    reader.close()
+
+
+def test_pool_run_matches_the_shards_played_in_process(tables):
+    """A pool run totals exactly the stripes each worker would write."""
+    reports = []
+    totals = run_tables(
+        1000, 2, seed=7, progress=reports.append, interval=0
+    )
+    for worker in range(2):
+        play_table_shard(tables.name, 7, worker, 500)
+    assert (totals == tables.totals()).all()
+    assert all(report.shape == SHAPE for report in reports)
+
+
+def test_decision_ev_nets_wins_against_losses_and_busts():
+    """EV counts busts as losses and leaves unseen cells NaN."""
+    totals = np.zeros(SHAPE, dtype=np.int64)
+    totals[10, 16, 0, HIT, [WIN, LOSE, PUSH, BUST]] = [3, 1, 2, 4]
+    ev, hands = decision_ev(totals)
+    assert hands[10, 16, 0, HIT] == 10
+    assert ev[10, 16, 0, HIT] == pytest.approx(-0.2)
+    assert np.isnan(ev[10, 16, 0, STAND])
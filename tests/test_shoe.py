@@ -0,0 +1,74 @@
+"""Tests for the dealing shoe and the continuous shuffling machine"""
+
+from random import Random
+
+from bjgame.card import CODE_RANK_INDEX, Blackjackhand
+from bjgame.probability import full_composition, shoe_composition
+from bjgame.shoe import ContinuousShoe, Shoe
+
+
+def _expected(num_decks, drawn):
+    """Return a full composition with the drawn codes taken out."""
+    counts = list(full_composition(num_decks))
+    for code in drawn:
+        counts[CODE_RANK_INDEX[code]] -= 1
+    return tuple(counts)
+
+
+def test_continuous_shoe_composition_tracks_draws_and_discards():
+    """The machine's composition follows what was actually drawn."""
+    shoe = ContinuousShoe(1, rng=Random(7))
+    shoe._build_shoe()
+    drawn = [shoe.draw() for _ in range(10)]
+    assert shoe_composition(shoe) == _expected(1, drawn)
+    assert len(shoe) == 42
+
+    shoe.discard(drawn[:4])
+    assert shoe_composition(shoe) == _expected(1, drawn[4:])
+    shoe.discard(drawn[4:])
+    assert shoe_composition(shoe) == full_composition(1)
+
+
+def test_continuous_shoe_deals_every_card_once():
+    """Drawing a whole machine dry deals each card exactly once."""
+    shoe = ContinuousShoe(2, rng=Random(3))
+    shoe._build_shoe()
+    drawn = sorted(shoe.draw() for _ in range(104))
+    assert drawn == sorted(list(range(52)) * 2)
+    assert shoe_composition(shoe) == (0,) * 10
+
+
+def test_shoe_composition_counts_cards_past_the_cursor():
+    """A plain shoe's composition is the cards not yet dealt."""
+    shoe = Shoe(1, rng=Random(5))
+    shoe._build_shoe()
+    drawn = [shoe.draw() for _ in range(10)]
+    assert shoe_composition(shoe) == _expected(1, drawn)
+
+
+def test_every_shoe_holds_each_code_num_decks_times():
+    """Each rebuild deals every code exactly num_decks times."""
+    shoe = Shoe(3, rng=Random(11))
+    for _ in range(4):
+        shoe.rebuild = True
+        shoe._build_shoe()
+        drawn = [shoe.draw() for _ in range(len(shoe))]
+        assert sorted(drawn) == sorted(list(range(52)) * 3)
+        assert len(shoe) == 0
+
+
+def test_dealing_past_the_cut_card_flags_a_rebuild():
+    """deal_card moves the cursor and flags the shoe at the cut card."""
+    shoe = Shoe(4, rng=Random(2))
+    shoe._build_shoe()
+    assert 60 <= shoe.cut_card_position < 80
+    assert shoe.cut_index == 208 - shoe.cut_card_position
+    hand = Blackjackhand()
+    while not shoe.rebuild:
+        shoe.deal_card(hand, 2)
+        assert len(hand) == shoe.cursor
+        assert hand.codes == shoe.cards[: shoe.cursor]
+    assert shoe.cut_index < shoe.cursor <= shoe.cut_index + 2
+
+    shoe._build_shoe()
+    assert (shoe.cursor, shoe.rebuild) == (0, False)
@@ -0,0 +1,53 @@
+"""Tests for the background pool of pre-shuffled shoes"""
+
+import time
+from random import Random
+
+import pytest
+
+from bjgame.shoe import Shoe
+from bjgame.shoepool import ShoePool
+
+
+def _wait_ready(pool, count=1):
+    """Wait until the pool holds count shuffled shoes."""
+    deadline = time.monotonic() + 5
+    while pool.ready < count:
+        assert time.monotonic() < deadline, "the pool never filled"
+        time.sleep(0.001)
+
+
+def test_pooled_shoes_hold_every_card_and_recycle_buffers():
+    """Rebuilds swap in full shoes and hand the old buffers back."""
+    with ShoePool(2, size=2, rng=Random(4)) as pool:
+        shoe = Shoe(2, pool=pool)
+        for _ in range(3):
+            _wait_ready(pool)
+            shoe.rebuild = True
+            shoe._build_shoe()
+            assert sorted(shoe.cards) == sorted(list(range(52)) * 2)
+            assert 60 <= shoe.cut_card_position < 80
+            assert shoe.cut_index == 104 - shoe.cut_card_position
+            assert shoe.cursor == 0
+        assert pool.swaps == 3
+        assert pool.misses == 0
+    assert not pool._thread.is_alive()
+
+
+def test_a_dry_pool_falls_back_to_shuffling_inline():
+    """An empty pool counts a miss and the shoe shuffles itself."""
+    pool = ShoePool(1, size=1)
+    pool.close()
+    while pool.ready:
+        pool.take()
+    shoe = Shoe(1, rng=Random(2), pool=pool)
+    shoe._build_shoe()
+    assert pool.misses == 1
+    assert sorted(shoe.cards) == list(range(52))
+
+
+def test_a_pool_of_another_size_is_refused():
+    """A shoe will not take shoes with a different deck count."""
+    with ShoePool(6) as pool:
+        with pytest.raises(ValueError):
+            Shoe(8, pool=pool)
@@ -0,0 +1,73 @@
+"""Tests for the exact hand solver and basic strategy tables"""
+
+import pytest
+
+from bjgame.probability import (
+    BLACKJACK,
+    BUST,
+    dealer_distribution,
+    full_composition,
+    remove_card,
+)
+from bjgame.solver import StrategyTable, hand_ev, solve_table, stand_ev
+
+HIT, STAND = True, False
+
+
+@pytest.fixture(scope="module")
+def table():
+    """Solve the two-deck table once for the module."""
+    return solve_table(2)
+
+
+def test_stand_ev_settles_like_the_engine():
+    """Busts lose, 21 pushes a dealer blackjack, lower totals lose to it."""
+    dist = [0.0] * 7
+    assert stand_ev(22, dist) == -1.0
+    dist[BLACKJACK] = 1.0
+    assert stand_ev(21, dist) == 0.0
+    assert stand_ev(20, dist) == -1.0
+    dist[BLACKJACK], dist[BUST] = 0.0, 1.0
+    assert stand_ev(12, dist) == 1.0
+
+
+def test_hand_ev_stands_against_the_exact_distribution():
+    """A hand's stand EV comes from the dealer distribution it faces."""
+    # a hard 16 of ten and six against a dealer ten
+    counts = full_composition(1)
+    for rank in (9, 5, 9):
+        counts = remove_card(counts, rank)
+    stand, hit = hand_ev(16, False, 9, counts)
+    assert stand == pytest.approx(stand_ev(16, dealer_distribution(9, counts)))
+    assert -1.0 < hit < 0.0
+
+
+@pytest.mark.parametrize(
+    "total, soft, up, decision",
+    [
+        (11, False, 9, HIT),
+        (12, False, 1, HIT),
+        (12, False, 4, STAND),
+        (13, False, 1, STAND),
+        (16, False, 6, HIT),
+        (16, False, 9, HIT),
+        (17, False, 0, STAND),
+        (17, True, 5, HIT),
+        (18, True, 2, STAND),
+        (18, True, 9, HIT),
+        (19, True, 9, STAND),
+    ],
+)
+def test_solved_table_matches_basic_strategy(table, total, soft, up, decision):
+    """Hit/stand decisions agree with textbook basic strategy."""
+    assert table.should_hit(total, soft, up) == decision
+
+
+def test_tables_round_trip_through_json(table, tmp_path):
+    """save and load give back the same decisions."""
+    path = tmp_path / "table.json"
+    table.save(path)
+    loaded = StrategyTable.load(path)
+    assert (loaded.hard, loaded.soft) == (table.hard, table.soft)
+    assert loaded.num_decks == 2
+    assert str(loaded) == str(table)
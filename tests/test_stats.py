@@ -0,0 +1,114 @@
+"""Tests for streaming statistics and precision-targeted stopping"""
+
+import statistics
+from random import Random
+
+import pytest
+
+from bjgame.engine import BlackJackEngine
+from bjgame.farm import run_simulation, wave_size
+from bjgame.player import BlkJckPlayer
+from bjgame.shoe import Shoe
+from bjgame.stats import RoundStats, RunningStats, run_until
+from bjgame.strategy import FlatBetStrategy
+
+
+def _stream(values):
+    """Return RunningStats over values."""
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    return stats
+
+
+def _engine(seed=1):
+    """Return an engine seating one flat bettor over a seeded shoe."""
+    engine = BlackJackEngine(Shoe(2, rng=Random(seed)))
+    engine.add_player(BlkJckPlayer("Seat 1", 10**9), FlatBetStrategy())
+    return engine
+
+
+def test_welford_matches_two_pass_statistics():
+    """The streamed mean and variance equal a two-pass computation."""
+    rng = Random(4)
+    values = [rng.choice((-2, -1, 0, 1, 1.5, 2)) for _ in range(5000)]
+    stats = _stream(values)
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.fmean(values))
+    assert stats.variance == pytest.approx(statistics.variance(values))
+
+
+def test_merged_streams_match_one_stream():
+    """Merging chunks gives the statistics of the whole stream."""
+    rng = Random(5)
+    values = [rng.randint(-3, 3) for _ in range(3001)]
+    merged = RunningStats()
+    bounds = (0, 7, 1000, 2999, 3001)
+    for start, end in zip(bounds, bounds[1:]):
+        merged.merge(_stream(values[start:end]))
+    merged.merge(RunningStats())
+    whole = _stream(values)
+    assert merged.count == whole.count
+    assert merged.mean == pytest.approx(whole.mean)
+    assert merged.m2 == pytest.approx(whole.m2)
+    assert merged.variance == pytest.approx(statistics.variance(values))
+
+
+def test_whole_number_totals_stay_exact():
+    """Integer results sum exactly, however many streams are merged."""
+    values = [-1, 1, -1, 0, 1, -1] * 1155
+    merged = RunningStats()
+    for start in range(0, len(values), 7):
+        merged.merge(_stream(values[start : start + 7]))
+    assert merged.total == sum(values) == -1155
+    assert isinstance(merged.total, int)
+
+
+def test_run_until_stops_once_the_interval_is_narrow_enough():
+    """run_until stops at the first check inside the target width."""
+    engine = _engine()
+    played = run_until(engine, 0.1, 10**6, check_every=500)
+    stats = engine.stats
+    assert stats.converged(0.1)
+    assert played % 500 == 0 and played < 10**6
+    assert stats.rounds == played
+
+    # one check earlier the interval was still too wide
+    again = _engine()
+    run_until(again, 0.1, played - 500, check_every=500)
+    assert not again.stats.converged(0.1)
+
+
+def test_run_until_gives_up_at_the_budget():
+    """An unreachable width plays exactly max_rounds."""
+    engine = _engine()
+    assert run_until(engine, 1e-6, 1200, check_every=500) == 1200
+    assert engine.stats.rounds == 1200
+
+
+def test_wave_size_projects_the_rounds_still_needed():
+    """Waves play half the projected rounds and never less than floor."""
+    stats = RoundStats()
+    # before any results a unit deviation is assumed
+    assert wave_size(stats, 0.1, 1, 10) == 769
+    engine = _engine()
+    engine.stats = stats
+    engine.play_rounds(2000)
+    assert wave_size(stats, 1.0, 1, 10) == 10
+    needed = (2 * 1.959963984540054 * stats.overall.stdev / 0.02) ** 2
+    per_round = stats.overall.count / stats.rounds
+    size = wave_size(stats, 0.02, 1, 10)
+    assert size == pytest.approx(
+        (needed - stats.overall.count) / per_round / 2, abs=1
+    )
+
+
+def test_targeted_runs_stop_near_the_target():
+    """A target width stops the farm well before its round budget."""
+    report = run_simulation(10**7, workers=1, seed=3, target_width=0.05)
+    assert report.stats.ci_width() <= 0.05
+    assert report.rounds < 10**7
+    # the final wave overshoots the target by only a few percent
+    assert report.stats.ci_width() > 0.045
+    assert report.net == report.stats.overall.total
+    assert isinstance(report.net, int)
@@ -0,0 +1,69 @@
+"""Tests for the SQLite player store"""
+
+import pickle
+
+from bjgame.player import BlkJckPlayer
+from bjgame.store import PlayerStore
+
+
+def _legacy_save(path, players):
+    """Write players the way the old game pickled them."""
+    player_data = {
+        str(player.player_id): {
+            "name": player._name,
+            "balance": player._balance,
+            "player_id": player.player_id,
+        }
+        for player in players
+    }
+    with open(path, "wb") as f:
+        pickle.dump(player_data, f)
+
+
+def test_players_round_trip_across_connections(tmp_path):
+    """Saved players are found by id and name after reopening."""
+    path = str(tmp_path / "players.db")
+    alice = BlkJckPlayer("Alice", 150.5)
+    bob = BlkJckPlayer("Bob", 80)
+    with PlayerStore(path) as store:
+        store.save_all([alice, bob])
+        bob._balance = 95.25
+        store.save(bob)
+
+    with PlayerStore(path) as store:
+        assert len(store) == 2
+        record = store.get(alice.player_id)
+        assert record == {
+            "name": "Alice",
+            "balance": 150.5,
+            "player_id": alice.player_id,
+        }
+        assert store.find_by_name("Bob")["balance"] == 95.25
+        assert store.find_by_name("Carol") is None
+
+
+def test_pickle_import_copies_old_saves_once(tmp_path):
+    """An old pickle save is imported without overwriting newer rows."""
+    legacy = str(tmp_path / "player_data.pkl")
+    alice = BlkJckPlayer("Alice", 42)
+    bob = BlkJckPlayer("Bob", 7)
+    _legacy_save(legacy, [alice, bob])
+
+    with PlayerStore(str(tmp_path / "players.db")) as store:
+        assert store.import_pickle(legacy) == 2
+        assert store.get(bob.player_id)["balance"] == 7
+        alice._balance = 60
+        store.save(alice)
+        store.import_pickle(legacy)
+        assert len(store) == 2
+        assert store.get(alice.player_id)["balance"] == 60
+
+
+def test_missing_or_damaged_pickles_import_nothing(tmp_path):
+    """A missing or truncated save file is skipped."""
+    damaged = tmp_path / "player_data.pkl"
+    damaged.write_bytes(pickle.dumps({"x": 1})[:5])
+    with PlayerStore(str(tmp_path / "players.db")) as store:
+        assert store.import_pickle(str(tmp_path / "none.pkl")) == 0
+        assert store.import_pickle(str(damaged)) == 0
+        assert len(store) == 0
@@ -0,0 +1,130 @@
+"""Tests for seat strategies and their batch decisions"""
+
+import io
+from random import Random
+
+import numpy as np
+import pytest
+
+from bjgame.batch import BatchSimulator
+from bjgame.card import CODE_RANKS, Blackjackhand
+from bjgame.counting import CountBetStrategy
+from bjgame.events import ConsoleRenderer, EventEngine
+from bjgame.player import BlkJckPlayer
+from bjgame.shoe import Shoe
+from bjgame.solver import StrategyTable, TableStrategy
+from bjgame.strategy import (
+    BatchStrategy,
+    ConsoleStrategy,
+    FlatBetStrategy,
+    Strategy,
+)
+
+
+def _hands():
+    """Return a player for every two- and three-card hand up to 21."""
+    players = []
+    for first in range(10):
+        for second in range(first, 10):
+            for third in [None] + list(range(10)):
+                player = BlkJckPlayer("Seat 1")
+                player.take_card(first)
+                player.take_card(second)
+                if third is not None:
+                    player.take_card(third)
+                if player.hand.value <= 21:
+                    players.append(player)
+    return players
+
+
+def _table():
+    """Return a decision table that varies by total, softness and card."""
+    rng = Random(3)
+    hard = [[rng.random() < 0.5 for _ in range(10)] for _ in range(22)]
+    soft = [[rng.random() < 0.5 for _ in range(10)] for _ in range(22)]
+    return StrategyTable(hard, soft)
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [FlatBetStrategy(stand_on=15), TableStrategy(_table())],
+    ids=["flat", "table"],
+)
+def test_hit_batch_agrees_with_hit(strategy):
+    """Batch decisions match seat-by-seat ones for every hand and card."""
+    players = _hands()
+    for up_card in range(10):
+        expected = [strategy.hit(player, up_card) for player in players]
+        hands = [player.hand for player in players]
+        decided = strategy.hit_batch(
+            np.array([hand.value for hand in hands]),
+            np.array([hand.is_soft() for hand in hands]),
+            np.full(len(hands), CODE_RANKS[up_card]),
+        )
+        assert decided.tolist() == expected
+
+
+@pytest.mark.parametrize("true_count", [-2, 0, 3])
+def test_wager_batch_agrees_with_wager(true_count):
+    """Batch bets match seat-by-seat bets, balance caps included."""
+    shoe = Shoe(2)
+    shoe.true_count = lambda: true_count
+    balances = np.array([0.0, 5.0, 15.0, 100.0])
+    for strategy in (
+        FlatBetStrategy(10),
+        CountBetStrategy(shoe, {1: 1, 3: 4}, bet=10),
+    ):
+        expected = [
+            strategy.wager(BlkJckPlayer("Seat 1", balance))
+            for balance in balances
+        ]
+        assert strategy.wager_batch(balances).tolist() == expected
+
+
+def test_console_seats_make_no_batch_promises():
+    """Only batch strategies offer batch decisions."""
+    assert isinstance(FlatBetStrategy(), BatchStrategy)
+    assert not isinstance(ConsoleStrategy(), BatchStrategy)
+    assert not hasattr(ConsoleStrategy(), "hit_batch")
+    assert issubclass(ConsoleStrategy, Strategy)
+
+
+def test_batch_simulator_follows_a_batch_strategy():
+    """A strategy driving the simulator sizes its bets and decisions."""
+    simulator = BatchSimulator(
+        50, strategy=FlatBetStrategy(5), seed=2, bankroll=1000
+    )
+    result = simulator.run(20)
+    assert result.hands == 1000
+    assert result.net % 5 == 0
+
+
+def test_people_and_bots_share_a_table(monkeypatch):
+    """A console seat and a bot play the same rounds."""
+    answers = {"bet": "10", "hit": "n", "donor": "y"}
+    prompts = []
+
+    def answer(prompt=""):
+        """Answer each kind of console prompt."""
+        prompts.append(prompt)
+        for key, reply in answers.items():
+            if key in prompt:
+                return reply
+        raise AssertionError(f"unexpected prompt: {prompt}")
+
+    monkeypatch.setattr("builtins.input", answer)
+    stream = io.StringIO()
+    renderer = ConsoleRenderer(stream)
+    engine = EventEngine(Shoe(2, rng=Random(8)), renderer)
+    person = BlkJckPlayer("Alice", 1000)
+    bot = BlkJckPlayer("Robot", 1000)
+    engine.add_player(person, ConsoleStrategy(renderer))
+    engine.add_player(bot, FlatBetStrategy(25))
+
+    totals = engine.play_rounds(20)
+    assert person._balance == 1000 + totals[0]
+    assert bot._balance == 1000 + totals[1]
+    assert sum(1 for prompt in prompts if "bet" in prompt) == 20
+    assert all("Robot" not in prompt for prompt in prompts)
+    text = stream.getvalue()
+    assert "Alice's new balance" in text and "Robot's new balance" in text